@@ -6,12 +6,45 @@ CALLS_FILE = "calls.json"
 BUDGET_FILE = "budget_backup.txt"
 WATCHLIST_FILE = "watchlist.json"
 BACKUP_FILE = "complete_backup.json"  # Neue umfassende Backup-Datei
+BACKUP_DIR = "backups"  # Verzeichnis für rotierte Backups mit Zeitstempel
+BACKUP_KEEP = 10  # Anzahl der aufbewahrten rotierten Backups
+BACKUP_ROTATE_INTERVAL = 600  # Sekunden zwischen zwei rotierten Backups
+SAVE_INTERVAL = 2.0  # Sekunden, in denen Änderungen gesammelt werden, bevor gespeichert wird
+SQLITE_FILE = "callbot.db"  # Datenbank für das SQLite-Backend
+EVENT_LOG_DIR = "event_log"  # Verzeichnis für Ereignisprotokoll, Snapshot und Archiv der Calls
+EVENT_LOG_COMPACT_EVENTS = 5000  # Ereignisse, nach denen ein neuer Snapshot geschrieben wird
+
+# Speicher-Backend: "json" (calls.json/watchlist.json), "sqlite" (SQLITE_FILE)
+# oder "eventlog" (Calls als Ereignisprotokoll in EVENT_LOG_DIR, Rest als JSON)
+STORAGE_BACKEND = os.environ.get("CALLBOT_STORAGE_BACKEND", "json")
 
 # Standardwerte
 DEFAULT_BUDGET = 500.0
 DEFAULT_WINDOW_SIZE = "630x1127+1913+0"
 DEFAULT_WINDOW_TITLE = "Dexscreener Bot"
+ARCHIVE_BUFFER_ROWS = 20  # Zeilen, die das Archiv über und unter dem sichtbaren Bereich als Tk-Items vorhält
 
 # API Konfiguration
 API_TIMEOUT = 10  # Sekunden
-UPDATE_INTERVAL = 20000  # Millisekunden (20 Sekunden)
\ No newline at end of file
+DEXSCREENER_API_BASE = os.environ.get("DEXSCREENER_API_BASE", "https://api.dexscreener.com")  # z.B. lokaler Stub-Server für Tests
+HTTP_MAX_CONCURRENCY = 8  # Maximale Anzahl paralleler HTTP-Anfragen
+HTTP_MAX_CONNECTIONS_PER_HOST = 4  # Maximale Anzahl offener Verbindungen pro Host
+UPDATE_INTERVAL = 20000  # Millisekunden (20 Sekunden)
+REFRESH_POLL_INTERVAL = 100  # Millisekunden zwischen zwei Abfragen der Hintergrund-Ergebnisse
+STRATEGY_POLL_INTERVAL = 1000  # Millisekunden zwischen zwei Abfragen der Strategie-Rangliste
+MAIN_BOT_UPDATE_INTERVAL = 30000  # Millisekunden zwischen zwei Aktualisierungen des Main-Bot-Links
+REFRESH_CHECK_INTERVAL = 1000  # Millisekunden zwischen zwei Prüfungen auf fällige Links
+REFRESH_ALIGN_WINDOW = 5000  # Millisekunden: Links, die so bald fällig würden, laufen im selben Abruf mit
+
+# Adaptive Aktualisierung der Calls (siehe data.refresh_policy)
+ADAPTIVE_MIN_INTERVAL = 10  # Sekunden zwischen zwei Abrufen stark bewegter Tokens
+ADAPTIVE_MAX_INTERVAL = 300  # Sekunden zwischen zwei Abrufen ruhender Tokens
+ADAPTIVE_HOT_CHANGE = 5.0  # Kursänderung in % pro 5 Minuten, ab der das kürzeste Intervall gilt
+ADAPTIVE_RECENT_AGE = 3600  # Sekunden: jüngere Calls werden mindestens alle UPDATE_INTERVAL aktualisiert
+DEXSCREENER_BATCH_SIZE = 30  # Maximale Anzahl Adressen pro Multi-Adress-Anfrage
+
+# Persistenter HTTP-Cache (übersteht Neustarts; CALLBOT_HTTP_CACHE=0 schaltet ihn ab)
+HTTP_CACHE_ENABLED = os.environ.get("CALLBOT_HTTP_CACHE", "1") != "0"
+HTTP_CACHE_FILE = "http_cache.db"  # SQLite-Datei des HTTP-Caches
+HTTP_CACHE_MAX_ENTRIES = 5000  # Maximale Anzahl gespeicherter Antworten (älteste werden gelöscht)
+DEXSCREENER_CACHE_TTL = 10  # Sekunden, die eine Dexscreener-Antwort ohne erneute Abfrage gilt
\ No newline at end of file
@@ -1,3 +1,16 @@
 # Data-Paket-Initialisierung
 from . import api
-from . import storage
\ No newline at end of file
+from . import storage
+from . import http_client
+from . import models
+from . import aggregates
+from . import backends
+from . import repository
+from . import persistence
+from . import refresh_engine
+from . import event_log
+from . import rate_limiter
+from . import cache
+from . import http_cache
+from . import scheduler
+from . import refresh_policy
\ No newline at end of file
@@ -0,0 +1,75 @@
+# Laufend gepflegte Kennzahlen für die Gewinn-Anzeige
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, Iterable
+
+from config import DEFAULT_BUDGET
+from data.models import Call
+
+class CallAggregates:
+    """
+    Hält die Summen über alle Calls, aus denen die Gewinn-Anzeige besteht.
+
+    Statt bei jeder Abfrage alle Calls zu durchlaufen, wird jede Änderung
+    (neuer, geänderter, abgeschlossener oder gelöschter Call) mit add(),
+    remove() bzw. replace() eingerechnet. Alle Kennzahlen sind danach ohne
+    Durchlauf abrufbar. rebuild() berechnet alles in einem Durchgang neu
+    (z.B. nach dem Laden).
+
+    Der Tagesgewinn wird pro Datum geführt, damit er nach Mitternacht ohne
+    Neuberechnung auf den neuen Tag wechselt.
+    """
+
+    def __init__(self):
+        self.rebuild([])
+
+    def rebuild(self, calls: Iterable[Call]) -> None:
+        """Berechnet alle Summen in einem Durchlauf neu."""
+        self.active_count = 0
+        self.active_profit = 0.0
+        self.closed_profit = 0.0
+        self._active_profit_by_date: Dict[str, float] = defaultdict(float)
+        for call in calls:
+            self.add(call)
+
+    def add(self, call: Call) -> None:
+        """Rechnet einen Call ein."""
+        self._apply(call, 1)
+
+    def remove(self, call: Call) -> None:
+        """Nimmt einen Call heraus."""
+        self._apply(call, -1)
+
+    def replace(self, old: Call, new: Call) -> None:
+        """Ersetzt den Beitrag eines geänderten Calls."""
+        self._apply(old, -1)
+        self._apply(new, 1)
+
+    def _apply(self, call: Call, sign: int) -> None:
+        pl_dollar = call.pl_dollar
+        if call.closed:
+            self.closed_profit += sign * pl_dollar
+            return
+        self.active_count += sign
+        self.active_profit += sign * pl_dollar
+        self._active_profit_by_date[call.datum] += sign * pl_dollar
+
+    def total_profit(self) -> float:
+        """Gewinn/Verlust aller aktiven Calls."""
+        return self.active_profit
+
+    def today_profit(self) -> float:
+        """Gewinn/Verlust aller aktiven Calls vom heutigen Tag."""
+        return self._active_profit_by_date.get(datetime.now().strftime("%d.%m."), 0.0)
+
+    def total_investment(self) -> float:
+        """Aktuell investierter Betrag (10$ pro aktiven Call)."""
+        return self.active_count * 10.0
+
+    def average_profit(self) -> float:
+        """Durchschnittlicher Gewinn/Verlust pro aktiven Call."""
+        return self.active_profit / self.active_count if self.active_count > 0 else 0.0
+
+    def current_balance(self) -> float:
+        """Start-Budget plus Gewinn/Verlust aller aktiven und abgeschlossenen Calls."""
+        return DEFAULT_BUDGET + self.active_profit + self.closed_profit
\ No newline at end of file
@@ -1,6 +1,12 @@
 # API-Funktionen
-import requests
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Tuple
+
+import data.http_client as http_client
+from config import DEXSCREENER_API_BASE, DEXSCREENER_BATCH_SIZE, DEXSCREENER_CACHE_TTL
+
+# Basis-URLs der Dexscreener-API
+PAIRS_API_URL = f"{DEXSCREENER_API_BASE}/latest/dex/pairs/"
+TOKENS_API_URL = f"{DEXSCREENER_API_BASE}/latest/dex/tokens/"
 
 def convert_to_api_link(url_or_address: str) -> str:
     """
@@ -14,19 +20,19 @@ def convert_to_api_link(url_or_address: str) -> str:
     url_or_address = url_or_address.strip()
     
     # Fall 1: Es ist bereits ein API-Link
-    if url_or_address.startswith("https://api.dexscreener.com/"):
+    if url_or_address.startswith(f"{DEXSCREENER_API_BASE}/"):
         return url_or_address
     
     # Fall 2: Es ist ein Dexscreener-Link
     if "https://dexscreener.com/" in url_or_address:
         parts = url_or_address.split("dexscreener.com/")
         if len(parts) > 1:
-            return "https://api.dexscreener.com/latest/dex/pairs/" + parts[1]
+            return PAIRS_API_URL + parts[1]
     
     # Fall 3: Es ist eine Contract-Adresse (ohne http oder https)
     if not url_or_address.startswith("http"):
         # Wir nehmen an, dass es eine Contract-Adresse ist
-        return f"https://api.dexscreener.com/latest/dex/tokens/{url_or_address}"
+        return f"{TOKENS_API_URL}{url_or_address}"
     
     # Fallback: Gib den Eingabestring unverändert zurück
     return url_or_address
@@ -42,11 +48,191 @@ def fetch_dexscreener_data(link: str, timeout: int = 10) -> Optional[Dict[str, A
     Returns:
         Die API-Antwortdaten als Dictionary oder None bei Fehler
     """
+    return http_client.get_json_cached(convert_to_api_link(link), DEXSCREENER_CACHE_TTL, timeout)
+
+def peek_dexscreener_data(link: str) -> Optional[Tuple[Dict[str, Any], float]]:
+    """
+    Gibt die zuletzt gespeicherte Dexscreener-Antwort für den Link ohne Netzwerkzugriff
+    zurück (auch wenn sie veraltet ist), sonst None.
+
+    Returns:
+        Tupel (API-Antwort, Unix-Zeitstempel des Abrufs) oder None
+    """
+    entry = http_client.peek_entry(convert_to_api_link(link))
+    return (entry.data, entry.stored_at) if entry is not None else None
+
+def fetch_many(links: List[str], timeout: int = 10) -> Dict[str, Optional[Dict[str, Any]]]:
+    """
+    Ruft mehrere Links parallel über die gemeinsame Session ab.
+    
+    Args:
+        links: Dexscreener-Links oder Token-Adressen
+        timeout: Timeout in Sekunden pro Anfrage
+    
+    Returns:
+        Dictionary Link -> API-Antwort oder None bei Fehler
+    """
+    api_links = {link: convert_to_api_link(link) for link in links if link}
+    responses = http_client.fetch_many(list(api_links.values()), timeout, DEXSCREENER_CACHE_TTL)
+    return {link: responses.get(api_link) for link, api_link in api_links.items()}
+
+def parse_dexscreener_link(link: str) -> Optional[Tuple[str, str, str]]:
+    """
+    Zerlegt einen Link oder eine Adresse in (Typ, Chain, Adresse).
+    
+    Typ ist "pair" für Dexscreener-Links auf ein Pair (Chain + Pair-Adresse)
+    und "token" für reine Contract-Adressen bzw. Token-API-Links.
+    Gibt None zurück, wenn der Link nicht zugeordnet werden kann.
+    """
     api_link = convert_to_api_link(link)
-    try:
-        resp = requests.get(api_link, timeout=timeout)
-        resp.raise_for_status()
-        return resp.json()
-    except Exception as e:
-        print(f"API-Fehler: {e}")
-        return None
\ No newline at end of file
+    
+    if api_link.startswith(PAIRS_API_URL):
+        parts = api_link[len(PAIRS_API_URL):].split("?")[0].strip("/").split("/")
+        if len(parts) == 2 and all(parts):
+            return ("pair", parts[0].lower(), parts[1])
+        return None
+    
+    if api_link.startswith(TOKENS_API_URL):
+        address = api_link[len(TOKENS_API_URL):].split("?")[0].strip("/")
+        if address and "," not in address and "/" not in address:
+            return ("token", "", address)
+    
+    return None
+
+def _chunks(items: List[str], size: int) -> List[List[str]]:
+    """Teilt eine Liste in Blöcke der angegebenen Größe."""
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+def _pairs_by_token(pairs: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Ordnet Pairs ihren Tokens zu (Adresse klein geschrieben), als Basis- oder Quote-Token.
+    Pairs, in denen der Token Basis-Token ist, stehen vorn - deren Marktkapitalisierung
+    gehört zum Token; sonst bleibt die Reihenfolge der API erhalten.
+    """
+    base: Dict[str, List[Dict[str, Any]]] = {}
+    quote: Dict[str, List[Dict[str, Any]]] = {}
+    for pair in pairs:
+        base_address = str((pair.get("baseToken") or {}).get("address", "")).lower()
+        quote_address = str((pair.get("quoteToken") or {}).get("address", "")).lower()
+        base.setdefault(base_address, []).append(pair)
+        if quote_address != base_address:
+            quote.setdefault(quote_address, []).append(pair)
+    return {address: base.get(address, []) + quote.get(address, []) for address in {**base, **quote}}
+
+def fetch_dexscreener_batch(links: List[str], timeout: int = 10) -> Dict[str, Optional[Dict[str, Any]]]:
+    """
+    Ruft Daten für viele Links gebündelt über die Multi-Adress-Endpunkte ab.
+    
+    Pair-Links werden nach Chain gruppiert und über
+    /latest/dex/pairs/{chain}/{a,b,...} abgefragt, Contract-Adressen über
+    /latest/dex/tokens/{a,b,...} - jeweils bis zu DEXSCREENER_BATCH_SIZE
+    Adressen pro Anfrage. Die Blockanfragen laufen parallel über die gemeinsame
+    Session. Links, die sich nicht zuordnen lassen, werden einzeln abgerufen.
+    Token-Adressen werden über Basis- und Quote-Token der Pairs zugeordnet; fehlt
+    ein Token in einer erfolgreichen Sammelantwort (sie enthält nur eine begrenzte
+    Zahl Pairs), wird er einzeln nachgefragt. Was danach fehlt, wird protokolliert.
+    
+    Gecacht wird je Link statt je Blockanfrage: Links mit frischer Antwort im
+    persistenten Cache werden nicht abgefragt, und die Sammelantworten werden
+    aufgeteilt unter dem API-Link jedes einzelnen Links gespeichert (dieselben
+    Einträge, die fetch_dexscreener_data und peek_dexscreener_data lesen).
+    
+    Args:
+        links: Dexscreener-Links oder Token-Adressen
+        timeout: Timeout in Sekunden pro Anfrage
+    
+    Returns:
+        Dictionary Link -> API-Antwort im Format von fetch_dexscreener_data
+        ({"pairs": [...]}) oder None, wenn für den Link nichts gefunden wurde
+    """
+    results: Dict[str, Optional[Dict[str, Any]]] = {}
+    pair_groups: Dict[str, Dict[str, List[str]]] = {}  # chain -> Adresse -> Links
+    token_group: Dict[str, List[str]] = {}              # Adresse -> Links
+    original_case: Dict[str, str] = {}                  # Adresse (klein) -> Originalschreibweise
+    
+    unresolved: List[str] = []
+    
+    for link in dict.fromkeys(links):
+        if not link:
+            continue
+        parsed = parse_dexscreener_link(link)
+        if parsed is None:
+            # Unbekanntes Format - Einzelabruf als Fallback
+            unresolved.append(link)
+            continue
+        entry = http_client.peek_entry(convert_to_api_link(link))
+        if entry is not None and entry.fresh:
+            results[link] = entry.data
+            continue
+        kind, chain, address = parsed
+        original_case.setdefault(address.lower(), address)
+        if kind == "pair":
+            pair_groups.setdefault(chain, {}).setdefault(address.lower(), []).append(link)
+        else:
+            token_group.setdefault(address.lower(), []).append(link)
+        results[link] = None
+    
+    # Alle Blockanfragen zusammenstellen und parallel abrufen
+    pair_chunks = [
+        (chain, chunk, f"{PAIRS_API_URL}{chain}/{','.join(original_case[a] for a in chunk)}")
+        for chain, by_address in pair_groups.items()
+        for chunk in _chunks(list(by_address), DEXSCREENER_BATCH_SIZE)
+    ]
+    token_chunks = [
+        (chunk, f"{TOKENS_API_URL}{','.join(original_case[a] for a in chunk)}")
+        for chunk in _chunks(list(token_group), DEXSCREENER_BATCH_SIZE)
+    ]
+    # Blockanfragen ohne Cache (ihre URLs wiederholen sich kaum), Einzelabrufe mit
+    urls = [url for _, _, url in pair_chunks] + [url for _, url in token_chunks]
+    responses = http_client.fetch_many(urls, timeout)
+    single = http_client.fetch_many([convert_to_api_link(link) for link in unresolved], timeout, DEXSCREENER_CACHE_TTL)
+    
+    for link in unresolved:
+        results[link] = single.get(convert_to_api_link(link))
+    
+    # Pairs: über die Pair-Adresse zuordnen
+    for chain, chunk, url in pair_chunks:
+        by_address = pair_groups[chain]
+        response = responses.get(url)
+        for pair in (response or {}).get("pairs") or []:
+            address = str(pair.get("pairAddress", "")).lower()
+            for link in by_address.get(address, []):
+                if results[link] is None:
+                    results[link] = {"pairs": [pair]}
+        if response is not None:
+            for address in chunk:
+                for link in by_address[address]:
+                    if results[link] is None:
+                        print(f"Dexscreener: keine Daten für {link}")
+    
+    # Tokens: alle Pairs eines Tokens sammeln, Reihenfolge der API beibehalten
+    missing: List[str] = []
+    for chunk, url in token_chunks:
+        response = responses.get(url)
+        pairs_by_token = _pairs_by_token((response or {}).get("pairs") or [])
+        for address in chunk:
+            if address in pairs_by_token:
+                for link in token_group[address]:
+                    results[link] = {"pairs": pairs_by_token[address]}
+            elif response is not None:
+                missing.append(address)
+    
+    # Die Sammelantwort enthält nur eine begrenzte Zahl Pairs - fehlende Tokens einzeln nachfragen
+    single_urls = {address: f"{TOKENS_API_URL}{original_case[address]}" for address in missing}
+    single = http_client.fetch_many(list(single_urls.values()), timeout)
+    for address, url in single_urls.items():
+        pairs = _pairs_by_token((single.get(url) or {}).get("pairs") or []).get(address)
+        for link in token_group[address]:
+            if pairs:
+                results[link] = {"pairs": pairs}
+            else:
+                print(f"Dexscreener: keine Daten für {link}")
+    
+    # Gefundene Antworten je Link speichern
+    fetched = [link for by_address in pair_groups.values() for links in by_address.values() for link in links]
+    fetched += [link for links in token_group.values() for link in links]
+    for link in fetched:
+        if results[link] is not None:
+            http_client.store_json(convert_to_api_link(link), results[link], DEXSCREENER_CACHE_TTL)
+    
+    return results
@@ -0,0 +1,166 @@
+# Austauschbare Speicher-Backends für Calls, Watchlist und Kontostand
+import json
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+from config import (CALLS_FILE, WATCHLIST_FILE, BUDGET_FILE, BACKUP_FILE, DEFAULT_BUDGET,
+                    STORAGE_BACKEND, SQLITE_FILE)
+from data.persistence import atomic_write_text, list_backup_files, write_json
+
+def row_keys(rows: List[Dict[str, Any]]) -> List[str]:
+    """
+    Bildet für jede Zeile einen Schlüssel, über den ein Backend einzelne Zeilen
+    gezielt aktualisieren kann: die ID des Eintrags, bei alten Zeilen ohne ID
+    Datum, Symbol und Link. Doppelte Schlüssel werden durchnummeriert.
+    """
+    keys = []
+    seen: Dict[str, int] = {}
+    for row in rows:
+        if row.get("ID"):
+            base = str(row["ID"])
+        else:
+            base = "|".join(str(row.get(field, "")) for field in ("Datum", "Symbol", "Link"))
+        count = seen.get(base, 0)
+        seen[base] = count + 1
+        keys.append(base if count == 0 and row.get("ID") else f"{base}#{count}")
+    return keys
+
+class StorageBackend:
+    """
+    Schnittstelle der Speicher-Backends.
+
+    Das Repository lädt beim Start einmalig über load_*(), der
+    PersistenceScheduler schreibt Änderungen über save_*(). Bereiche, die beim
+    Laden aus einem Backup wiederhergestellt wurden, stehen in `recovered`.
+    """
+
+    def __init__(self):
+        self.recovered = set()
+
+    def load_calls(self) -> List[Dict[str, Any]]:
+        raise NotImplementedError
+
+    def load_watchlist(self) -> List[Dict[str, Any]]:
+        raise NotImplementedError
+
+    def load_budget(self) -> float:
+        raise NotImplementedError
+
+    def save_calls(self, calls: List[Dict[str, Any]]) -> None:
+        raise NotImplementedError
+
+    def save_watchlist(self, watchlist: List[Dict[str, Any]]) -> None:
+        raise NotImplementedError
+
+    def save_budget(self, budget: float) -> None:
+        raise NotImplementedError
+
+    def backup_due(self) -> bool:
+        """
+        True, wenn nach diesem Speichern das vollständige Backup (BACKUP_FILE)
+        geschrieben werden soll. Backends, die nur geänderte Zeilen schreiben,
+        liefern False - ihr Backup entsteht dann nur in den Abständen der
+        rotierten Backups, statt jedes Speichern wieder O(N) zu machen.
+        """
+        return True
+
+    def close(self) -> None:
+        """Gibt belegte Ressourcen frei."""
+        pass
+
+def _read_from_backups(backup_key: str) -> List[Dict[str, Any]]:
+    """Liest einen Bereich ("calls"/"watchlist") aus dem neuesten lesbaren Backup."""
+    for path in list_backup_files():
+        try:
+            with open(path, "r") as f:
+                data = json.load(f).get(backup_key)
+            if isinstance(data, list):
+                print(f"Stelle '{backup_key}' aus Backup {path} wieder her")
+                return data
+        except Exception:
+            continue
+    return []
+
+def _read_json_list(path: str, backup_key: str) -> Tuple[List[Dict[str, Any]], bool]:
+    """
+    Liest eine JSON-Liste aus einer Datei (leere Liste, falls nicht vorhanden).
+    Ist die Datei beschädigt, wird auf das neueste lesbare Backup zurückgegriffen,
+    statt stillschweigend mit einer leeren Liste weiterzuarbeiten.
+
+    Returns:
+        Tuple mit (Daten, True falls aus einem Backup wiederhergestellt)
+    """
+    if os.path.exists(path):
+        with open(path, "r") as f:
+            try:
+                data = json.load(f)
+                if isinstance(data, list):
+                    return data, False
+            except json.JSONDecodeError:
+                pass
+        print(f"{path} ist beschädigt")
+        return _read_from_backups(backup_key), True
+    return [], False
+
+class JsonBackend(StorageBackend):
+    """Speichert alles in den bisherigen JSON-/Textdateien (komplettes Neuschreiben)."""
+
+    def __init__(self, calls_file: str = CALLS_FILE, watchlist_file: str = WATCHLIST_FILE,
+                 budget_file: str = BUDGET_FILE):
+        super().__init__()
+        self.calls_file = calls_file
+        self.watchlist_file = watchlist_file
+        self.budget_file = budget_file
+
+    def load_calls(self) -> List[Dict[str, Any]]:
+        calls, from_backup = _read_json_list(self.calls_file, "calls")
+        if from_backup:
+            self.recovered.add("calls")
+        return calls
+
+    def load_watchlist(self) -> List[Dict[str, Any]]:
+        watchlist, from_backup = _read_json_list(self.watchlist_file, "watchlist")
+        if from_backup:
+            self.recovered.add("watchlist")
+        return watchlist
+
+    def load_budget(self) -> float:
+        try:
+            if os.path.exists(self.budget_file):
+                with open(self.budget_file, "r") as f:
+                    return float(f.read().strip())
+        except Exception:
+            pass
+        return DEFAULT_BUDGET
+
+    def save_calls(self, calls: List[Dict[str, Any]]) -> None:
+        write_json(self.calls_file, calls)
+
+    def save_watchlist(self, watchlist: List[Dict[str, Any]]) -> None:
+        write_json(self.watchlist_file, watchlist)
+
+    def save_budget(self, budget: float) -> None:
+        atomic_write_text(self.budget_file, str(budget))
+
+def create_backend(name: Optional[str] = None) -> StorageBackend:
+    """
+    Erstellt das konfigurierte Backend.
+
+    Args:
+        name: "json", "sqlite" oder "eventlog" (Standard: STORAGE_BACKEND aus der Konfiguration)
+    """
+    name = (name or STORAGE_BACKEND).lower()
+    if name == "sqlite":
+        from data.sqlite_backend import SqliteBackend, migrate_from_json
+        
+        # Beim ersten Start mit SQLite die vorhandenen JSON-Daten übernehmen
+        if not os.path.exists(SQLITE_FILE) and (os.path.exists(CALLS_FILE) or os.path.exists(BACKUP_FILE)):
+            counts = migrate_from_json(SQLITE_FILE)
+            print(f"{counts['calls']} Calls und {counts['watchlist']} Watchlist-Einträge nach {SQLITE_FILE} übernommen")
+        return SqliteBackend(SQLITE_FILE)
+    if name == "eventlog":
+        from data.event_log import EventLogBackend
+        return EventLogBackend(JsonBackend())
+    if name != "json":
+        print(f"Unbekanntes Speicher-Backend '{name}', verwende JSON")
+    return JsonBackend()
\ No newline at end of file
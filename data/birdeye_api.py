@@ -1,20 +1,64 @@
 # Birdeye API Integration mit Strategie-Analyse (Schritt 2)
 import requests
 import json
+import threading
 import time
 import os
-from typing import Dict, Any, List, Optional, Tuple
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Dict, Any, Callable, Iterator, List, Optional, Tuple
 import utils.formatters as formatters
+import data.http_client as http_client
+from data.http_cache import get_cache, request_key
+from data.rate_limiter import RateLimiter
+from data.cache import TTLCache
 
-# Standard-Wartezeit zwischen API-Aufrufen (in Sekunden)
-DEFAULT_WAIT_TIME = 1.2  # Etwas mehr als 1 Sekunde wegen des Rate-Limits
+# Rate-Limit pro API-Key (Token-Bucket): Anfragen pro Sekunde und Burst-Kapazität
+# (Standard wie bisher: eine Anfrage alle 1,2 Sekunden)
+RATE_LIMIT_PER_SECOND = float(os.environ.get("BIRDEYE_RATE_LIMIT", 1 / 1.2))
+RATE_LIMIT_BURST = int(os.environ.get("BIRDEYE_RATE_BURST", "1"))
+
+# Zusätzliche Budgets einzelner Endpunkte für alle Keys zusammen: Endpunkt -> (Anfragen
+# pro Sekunde, Burst). Die seitenweise Durchsuchung der Token-Liste darf die Kerzen-Abrufe
+# des Scanners nicht verdrängen; ohne Eintrag gilt nur das Limit pro Key
+ENDPOINT_RATE_LIMITS: Dict[str, Tuple[float, int]] = {
+    "/defi/tokenlist": (float(os.environ.get("BIRDEYE_TOKENLIST_RATE_LIMIT", "0.5")),
+                        int(os.environ.get("BIRDEYE_TOKENLIST_RATE_BURST", "2"))),
+    "/defi/price_history": (float(os.environ.get("BIRDEYE_PRICE_HISTORY_RATE_LIMIT", 1 / 1.2)),
+                            int(os.environ.get("BIRDEYE_PRICE_HISTORY_RATE_BURST", "1"))),
+}
+
+# Sperrzeit eines Keys nach HTTP 429 ohne Retry-After-Header (in Sekunden)
+RATE_LIMIT_PENALTY = 2.0
+# Versuche pro Anfrage, falls die API mit 429 antwortet (jeweils mit dem nächsten freien Key)
+MAX_RETRIES = 3
 
 # Cache-Ablaufzeit (in Sekunden)
 CACHE_EXPIRY = 60  # 1 Minute
+# Ablaufzeit je Endpunkt (in Sekunden), sonst CACHE_EXPIRY
+CACHE_TTLS = {
+    "token_list": 60,       # Rangliste ändert sich laufend
+    "token_info": 120,
+    "price_history": 300    # Kerzen werden auf die Auflösung gerundet abgefragt
+}
+# Maximale Anzahl gecachter Antworten (am längsten ungenutzte werden verdrängt)
+CACHE_MAX_ENTRIES = 512
+
+# Token-Liste: Tokens je Seite (Maximum der API), parallel abgerufene Seiten und
+# maximale Seitenzahl je Durchsuchung des MCAP-Bereichs (jede Seite ist eine Anfrage)
+TOKEN_LIST_PAGE_SIZE = 50
+CRAWL_MAX_WORKERS = 4
+CRAWL_MAX_PAGES = 5
+# Obergrenze der Seiten, bis zu der der Beginn des MCAP-Bereichs gesucht wird
+CRAWL_MAX_SKIP_PAGES = 4096
+
+# Strategie-Scan: parallele Worker (das Rate-Limit gilt für alle gemeinsam) und Kerzen-Auflösung
+SCAN_MAX_WORKERS = 8
+SCAN_HISTORY_RESOLUTION = "5m"
 
 # API-Konfiguration
 API_BASE_URL = "https://public-api.birdeye.so"
-# Korrekter Pfad zur API-Key-Datei
+# Korrekter Pfad zur API-Key-Datei (ein Key pro Zeile, mehrere Keys werden abwechselnd genutzt)
 API_KEY_FILE = r"C:\Users\Gerome PC\Desktop\callbot_real\api_key.txt" 
 
 # Standard-Header für alle Anfragen
@@ -23,112 +67,151 @@ DEFAULT_HEADERS = {
     "X-Chain": "solana"  # Standardmäßig Solana-Chain verwenden
 }
 
-# Cache für API-Antworten
-api_cache = {}
-# Zeitpunkt des letzten API-Aufrufs
-last_api_call = 0
+# Cache für API-Antworten (begrenzt, mit Ablaufzeit pro Eintrag)
+api_cache = TTLCache(maxsize=CACHE_MAX_ENTRIES, ttl=CACHE_EXPIRY)
+# Rate-Limiter über alle API-Keys (wird beim ersten Request angelegt)
+_rate_limiter = None
+_rate_limiter_lock = threading.Lock()
+# Zuletzt gefundene erste Seite je MCAP-Bereich: (mcap_max, min_liquidity) -> Seite
+_first_page_hints: Dict[Tuple[float, float], int] = {}
 
-def get_api_key() -> str:
+def get_api_keys() -> List[str]:
     """
-    Liest den API-Key aus der Datei.
+    Liest die API-Keys aus der Datei (ein Key pro Zeile) und aus der
+    Umgebungsvariable BIRDEYE_API_KEYS (kommagetrennt).
     """
+    keys = [key.strip() for key in os.environ.get("BIRDEYE_API_KEYS", "").split(",") if key.strip()]
     try:
         # Prüfe den angegebenen Pfad
         if os.path.exists(API_KEY_FILE):
             with open(API_KEY_FILE, "r") as f:
-                api_key = f.read().strip()
-                return api_key
-                
-        # Kein API-Key gefunden
-        print(f"Birdeye API-Key nicht gefunden unter: {API_KEY_FILE}")
-        return ""
+                keys.extend(line.strip() for line in f if line.strip())
     except Exception as e:
         print(f"Fehler beim Lesen des API-Keys: {e}")
-        return ""
+        
+    if not keys:
+        # Kein API-Key gefunden
+        print(f"Birdeye API-Key nicht gefunden unter: {API_KEY_FILE}")
+    return keys
 
-def rate_limit_wait():
+def get_api_key() -> str:
     """
-    Wartet, um das Rate-Limit einzuhalten (1 Request pro Sekunde).
+    Liest den (ersten) API-Key.
     """
-    global last_api_call
-    current_time = time.time()
-    time_since_last_call = current_time - last_api_call
-    
-    if time_since_last_call < DEFAULT_WAIT_TIME and last_api_call > 0:
-        wait_time = DEFAULT_WAIT_TIME - time_since_last_call
-        time.sleep(wait_time)
-    
-    last_api_call = time.time()
+    keys = get_api_keys()
+    return keys[0] if keys else ""
+
+def get_rate_limiter() -> RateLimiter:
+    """Gibt den gemeinsamen Rate-Limiter zurück und legt ihn beim ersten Aufruf an."""
+    global _rate_limiter
+    with _rate_limiter_lock:
+        if _rate_limiter is None or not _rate_limiter.keys:
+            _rate_limiter = RateLimiter(get_api_keys(), RATE_LIMIT_PER_SECOND, RATE_LIMIT_BURST, ENDPOINT_RATE_LIMITS)
+        return _rate_limiter
 
-def get_cached_or_fetch(cache_key: str, fetch_func, cache_expiry: int = CACHE_EXPIRY) -> Any:
+def _retry_after(response) -> float:
+    """Liest die Wartezeit aus dem Retry-After-Header einer 429-Antwort."""
+    try:
+        return max(0.0, float(response.headers.get("Retry-After", RATE_LIMIT_PENALTY)))
+    except (TypeError, ValueError):
+        return RATE_LIMIT_PENALTY
+
+def get_cached_or_fetch(cache_key: Tuple, fetch_func, cache_expiry: int = CACHE_EXPIRY) -> Any:
     """
     Versucht, Daten aus dem Cache zu holen. Falls nicht vorhanden oder abgelaufen,
     ruft die fetch_func auf und speichert das Ergebnis im Cache.
+    Fehlerantworten ({"success": False, ...}) werden nicht gecacht.
     """
-    global api_cache
-    
-    current_time = time.time()
-    
-    # Prüfe, ob der Schlüssel im Cache existiert und aktuell ist
-    if cache_key in api_cache:
-        cache_entry = api_cache[cache_key]
-        if current_time - cache_entry["timestamp"] < cache_expiry:
-            return cache_entry["data"]
-    
-    # Daten von der API holen
     try:
-        data = fetch_func()
-        
-        # Speichere im Cache
-        api_cache[cache_key] = {
-            "data": data,
-            "timestamp": current_time
-        }
-        
-        return data
+        return api_cache.get_or_fetch(cache_key, fetch_func, cache_expiry, cache_if=_is_cacheable)
     except Exception as e:
         print(f"Fehler beim Abrufen der Daten für {cache_key}: {e}")
         return None
 
-def make_api_request(endpoint: str, params: Dict = None) -> Dict[str, Any]:
+def _is_cacheable(data: Any) -> bool:
+    """True für erfolgreiche Antworten."""
+    return data is not None and not (isinstance(data, dict) and data.get("success") is False)
+
+def _resolution_seconds(resolution: str) -> int:
+    """Wandelt eine Auflösung ('5m', '1H', '1d') in Sekunden um (Standard: 5 Minuten)."""
+    units = {"m": 60, "h": 3600, "d": 86400, "w": 604800}
+    try:
+        return int(resolution[:-1]) * units[resolution[-1].lower()]
+    except (KeyError, ValueError, IndexError):
+        return 300
+
+def make_api_request(endpoint: str, params: Dict = None, ttl: float = CACHE_EXPIRY) -> Dict[str, Any]:
     """
     Führt eine API-Anfrage durch mit korrektem Header und Rate-Limiting.
+    
+    Der Rate-Limiter wählt den API-Key und wartet nur, wenn weder Key noch
+    Endpunkt ein freies Token haben. Antwortet die API trotzdem mit 429, wird
+    der Key gesperrt und die Anfrage mit dem nächsten freien Key wiederholt.
+    
+    Erfolgreiche Antworten landen für `ttl` Sekunden im persistenten
+    HTTP-Cache (siehe data.http_cache). Eine frische Antwort kostet damit
+    weder Anfrage noch Rate-Limit, eine abgelaufene wird mit ETag bzw.
+    Last-Modified bedingt nachgefragt.
     """
-    api_key = get_api_key()
-    if not api_key:
+    limiter = get_rate_limiter()
+    if not limiter.keys:
         print("API-Anfrage fehlgeschlagen: Kein API-Key gefunden")
         return {"success": False, "error": "API-Key nicht gefunden"}
     
-    # Warte gemäß Rate-Limit
-    rate_limit_wait()
-    
     # Vollständige URL
     url = f"{API_BASE_URL}{endpoint}"
     
-    # Header mit API-Key
-    headers = DEFAULT_HEADERS.copy()
-    headers["X-API-KEY"] = api_key
+    # Gespeicherte Antwort (auch nach Neustart)
+    http_cache = get_cache()
+    cache_key = request_key(url, params)
+    cached = http_cache.get(cache_key) if http_cache else None
+    if cached is not None and cached.fresh:
+        return cached.data
     
-    try:
-        print(f"API-Anfrage an: {url}")
-        print(f"Parameter: {params}")
-        
-        response = requests.get(url, headers=headers, params=params)
-        
-        print(f"Status-Code: {response.status_code}")
-        if response.status_code != 200:
-            print(f"Antwort-Inhalt: {response.text[:200]}")  # Ausgabe der ersten 200 Zeichen
+    for attempt in range(MAX_RETRIES):
+        # Warte gemäß Rate-Limit
+        api_key = limiter.acquire(endpoint)
         
-        response.raise_for_status()  # Wirft Exception bei HTTP-Fehlern
+        # Header mit API-Key (und Validatoren der gespeicherten Antwort)
+        headers = DEFAULT_HEADERS.copy()
+        headers["X-API-KEY"] = api_key
+        if cached is not None:
+            headers.update(cached.validators())
         
-        return response.json()
-    except requests.exceptions.RequestException as e:
-        print(f"API-Anfragefehler: {e}")
-        return {"success": False, "error": str(e)}
-    except json.JSONDecodeError:
-        print("Fehler beim Decodieren der JSON-Antwort")
-        print(f"Antwort-Text: {response.text[:200]}")  # Zeige den Anfang des Antworttexts
-        return {"success": False, "error": "Ungültige JSON-Antwort"}
+        try:
+            print(f"API-Anfrage an: {url}")
+            print(f"Parameter: {params}")
+            
+            response = http_client.get(url, params=params, headers=headers)
+            
+            print(f"Status-Code: {response.status_code}")
+            if response.status_code == 429:
+                # Key vorübergehend sperren und mit dem nächsten freien Key erneut versuchen
+                limiter.penalize(api_key, _retry_after(response))
+                continue
+            if response.status_code == 304 and cached is not None:
+                # Unverändert: gespeicherte Antwort weiterverwenden
+                http_cache.touch(cache_key, ttl)
+                return cached.data
+            if response.status_code != 200:
+                print(f"Antwort-Inhalt: {response.text[:200]}")  # Ausgabe der ersten 200 Zeichen
+            
+            response.raise_for_status()  # Wirft Exception bei HTTP-Fehlern
+            
+            data = response.json()
+            if http_cache and _is_cacheable(data):
+                http_cache.put(cache_key, data, ttl, response.headers.get("ETag"), response.headers.get("Last-Modified"))
+            return data
+        except requests.exceptions.RequestException as e:
+            print(f"API-Anfragefehler: {e}")
+            return {"success": False, "error": str(e)}
+        except json.JSONDecodeError:
+            print("Fehler beim Decodieren der JSON-Antwort")
+            print(f"Antwort-Text: {response.text[:200]}")  # Zeige den Anfang des Antworttexts
+            return {"success": False, "error": "Ungültige JSON-Antwort"}
+    
+    print(f"API-Anfrage an {url} nach {MAX_RETRIES} Versuchen wegen Rate-Limit abgebrochen")
+    return {"success": False, "error": "Rate-Limit überschritten (HTTP 429)"}
 
 def get_token_list(sort_by="v24hUSD", sort_type="desc", limit=50, offset=0, min_liquidity=0) -> Optional[Dict[str, Any]]:
     """
@@ -144,7 +227,7 @@ def get_token_list(sort_by="v24hUSD", sort_type="desc", limit=50, offset=0, min_
     Returns:
         Ein Dictionary mit Token-Liste oder None bei Fehler
     """
-    cache_key = f"token_list_{sort_by}_{sort_type}_{limit}_{offset}_{min_liquidity}"
+    cache_key = ("token_list", sort_by, sort_type, limit, offset, min_liquidity)
     
     def fetch_token_list():
         endpoint = "/defi/tokenlist"
@@ -156,9 +239,9 @@ def get_token_list(sort_by="v24hUSD", sort_type="desc", limit=50, offset=0, min_
             "min_liquidity": min_liquidity
         }
         
-        return make_api_request(endpoint, params)
+        return make_api_request(endpoint, params, CACHE_TTLS["token_list"])
     
-    return get_cached_or_fetch(cache_key, fetch_token_list)
+    return get_cached_or_fetch(cache_key, fetch_token_list, CACHE_TTLS["token_list"])
 
 def get_token_price_history(token_address: str, resolution: str = "5m", from_ts: int = None, to_ts: int = None) -> Optional[Dict[str, Any]]:
     """
@@ -173,13 +256,16 @@ def get_token_price_history(token_address: str, resolution: str = "5m", from_ts:
     Returns:
         Ein Dictionary mit der Preishistorie oder None bei Fehler
     """
-    # Wenn keine Zeitstempel angegeben sind, verwende die letzten 24 Stunden
-    if not from_ts:
-        from_ts = int(time.time()) - 86400  # 24 Stunden zurück
+    # Wenn keine Zeitstempel angegeben sind, verwende die letzten 24 Stunden.
+    # Das Ende wird auf den Beginn der aktuellen Kerze gerundet, damit Abfragen
+    # innerhalb derselben Kerze denselben Cache-Eintrag treffen.
+    step = _resolution_seconds(resolution)
     if not to_ts:
-        to_ts = int(time.time())
+        to_ts = int(time.time()) // step * step
+    if not from_ts:
+        from_ts = to_ts - 86400  # 24 Stunden zurück
         
-    cache_key = f"price_history_{token_address}_{resolution}_{from_ts}_{to_ts}"
+    cache_key = ("price_history", token_address, resolution, from_ts, to_ts)
     
     def fetch_price_history():
         endpoint = "/defi/price_history"
@@ -190,9 +276,9 @@ def get_token_price_history(token_address: str, resolution: str = "5m", from_ts:
             "to_ts": to_ts
         }
         
-        return make_api_request(endpoint, params)
+        return make_api_request(endpoint, params, min(CACHE_TTLS["price_history"], step))
     
-    return get_cached_or_fetch(cache_key, fetch_price_history)
+    return get_cached_or_fetch(cache_key, fetch_price_history, min(CACHE_TTLS["price_history"], step))
 
 def get_token_info(token_address: str) -> Optional[Dict[str, Any]]:
     """
@@ -204,7 +290,7 @@ def get_token_info(token_address: str) -> Optional[Dict[str, Any]]:
     Returns:
         Ein Dictionary mit Token-Informationen oder None bei Fehler
     """
-    cache_key = f"token_info_{token_address}"
+    cache_key = ("token_info", token_address)
     
     def fetch_token_info():
         endpoint = "/defi/token_overview" # Korrigierter Endpunkt
@@ -212,52 +298,192 @@ def get_token_info(token_address: str) -> Optional[Dict[str, Any]]:
             "address": token_address
         }
         
-        return make_api_request(endpoint, params)
+        return make_api_request(endpoint, params, CACHE_TTLS["token_info"])
+    
+    return get_cached_or_fetch(cache_key, fetch_token_info, CACHE_TTLS["token_info"])
+
+def _token_mcap(token: Dict[str, Any]) -> float:
+    return token.get("mc") or 0
+
+def _token_list_page(page: int, min_liquidity: float) -> Optional[List[Dict[str, Any]]]:
+    """Tokens einer Seite der nach MCAP absteigend sortierten Liste (None bei Fehler)."""
+    token_list = get_token_list(sort_by="mc", sort_type="desc", limit=TOKEN_LIST_PAGE_SIZE,
+                                offset=page * TOKEN_LIST_PAGE_SIZE, min_liquidity=min_liquidity)
+    if not token_list or not token_list.get("success", False):
+        return None
+    return token_list.get("data", {}).get("tokens", []) or []
+
+def _find_first_page(mcap_max: float, min_liquidity: float) -> Optional[int]:
+    """
+    Sucht die erste Seite mit Tokens bis mcap_max.
+    
+    Die Suche beginnt bei der zuletzt gefundenen Seite (bzw. bei Seite 0): Der
+    Abstand zu ihr wird verdoppelt, bis die Grenze überschritten ist, und dann
+    per Binärsuche eingegrenzt - die Seiten oberhalb des Bereichs werden so nur
+    stichprobenartig abgerufen. Hat sich der Bereich nicht verschoben, genügen
+    zwei Abrufe.
+    
+    Returns:
+        Seitenzahl oder None, wenn eine der abgerufenen Seiten fehlschlägt
+    """
+    def above(page):
+        """True, wenn die Seite vollständig über mcap_max liegt (None bei Fehler)."""
+        tokens = _token_list_page(page, min_liquidity)
+        if tokens is None:
+            # Ein Fehler ist nicht "unterhalb" - sonst begänne die Suche zu früh
+            print(f"Fehler beim Abrufen der Token-Liste (Seite {page}), Suche nach dem MCAP-Bereich abgebrochen")
+            return None
+        return bool(tokens) and _token_mcap(tokens[-1]) > mcap_max
+    
+    hint_key = (mcap_max, min_liquidity)
+    start = min(_first_page_hints.get(hint_key, 0), CRAWL_MAX_SKIP_PAGES)
+    start_above = above(start)
+    if start_above is None:
+        return None
+    # Gesucht ist die Grenze zwischen low (liegt vollständig über dem Bereich) und high
+    step = 1
+    if start_above:
+        low, high = start, start + step
+        while high < CRAWL_MAX_SKIP_PAGES:
+            result = above(high)
+            if result is None:
+                return None
+            if not result:
+                break
+            low, step = high, step * 2
+            high = start + step
+        high = min(high, CRAWL_MAX_SKIP_PAGES)
+    else:
+        low, high = None, start
+        while high > 0:
+            candidate = max(0, start - step)
+            result = above(candidate)
+            if result is None:
+                return None
+            if result:
+                low = candidate
+                break
+            high, step = candidate, step * 2
+        if low is None:
+            return 0  # bereits Seite 0 gehört zum Bereich
+    while high - low > 1:
+        middle = (low + high) // 2
+        result = above(middle)
+        if result is None:
+            return None
+        if result:
+            low = middle
+        else:
+            high = middle
+    _first_page_hints[hint_key] = high
+    return high
+
+def crawl_token_list(
+    mcap_min: float,
+    mcap_max: float,
+    min_liquidity: float = 0,
+    max_pages: int = CRAWL_MAX_PAGES,
+    max_workers: int = CRAWL_MAX_WORKERS
+) -> Optional[List[Dict[str, Any]]]:
+    """
+    Durchsucht die Token-Liste seitenweise nach Tokens im MCAP-Bereich.
+    
+    Die Liste wird vom Server nach MCAP absteigend sortiert. Ab der ersten
+    Seite des Bereichs (siehe _find_first_page) sind bis zu max_workers
+    Seiten gleichzeitig angefordert (das Rate-Limit gilt für alle gemeinsam),
+    bis eine Seite unter mcap_min reicht, die Liste endet oder max_pages
+    Seiten gelesen sind. Seiten werden wie jede Token-Liste gecacht (get_token_list).
     
-    return get_cached_or_fetch(cache_key, fetch_token_info)
+    Args:
+        mcap_min: Minimale Marktkapitalisierung
+        mcap_max: Maximale Marktkapitalisierung
+        min_liquidity: Minimale Liquidität (wird an die API übergeben)
+        max_pages: Maximale Anzahl Seiten im Bereich
+        max_workers: Anzahl parallel abgerufener Seiten
+        
+    Returns:
+        Tokens im MCAP-Bereich in der Reihenfolge der Liste (jede Adresse einmal)
+        oder None, wenn der Beginn des Bereichs nicht bestimmt werden konnte
+    """
+    first_page = _find_first_page(mcap_max, min_liquidity)
+    if first_page is None:
+        return None
+    last_page = first_page + max_pages
+    tokens = []
+    seen = set()
+    # Seiten werden der Reihe nach ausgewertet; eine neue Seite wird erst angefordert,
+    # wenn eine Seite fertig ist, damit nach dem Ende des Bereichs keine weiteren anfallen
+    executor = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="TokenListCrawl")
+    pending = deque()
+    next_page = first_page
+    try:
+        while next_page < last_page and len(pending) < max(1, max_workers):
+            pending.append(executor.submit(_token_list_page, next_page, min_liquidity))
+            next_page += 1
+        while pending:
+            result = pending.popleft().result()
+            if not result:
+                break  # Fehler oder Ende der Liste
+            for token in result:
+                # Während des Abrufs können Tokens zwischen Seiten wandern
+                address = token.get("address")
+                if mcap_min <= _token_mcap(token) <= mcap_max and address not in seen:
+                    seen.add(address)
+                    tokens.append(token)
+            if _token_mcap(result[-1]) < mcap_min or len(result) < TOKEN_LIST_PAGE_SIZE:
+                break  # Bereich ausgeschöpft
+            if next_page < last_page:
+                pending.append(executor.submit(_token_list_page, next_page, min_liquidity))
+                next_page += 1
+    finally:
+        # Noch nicht gestartete Seiten werden verworfen
+        executor.shutdown(wait=False, cancel_futures=True)
+    return tokens
 
 def get_filtered_tokens(
     mcap_min: float = 100000,
     mcap_max: float = 3000000,
     liquidity_min: float = 30000,
-    limit: int = 20 # Dieses Limit bezieht sich auf die Anzahl der *zurückgegebenen*, gefilterten Tokens
+    limit: int = 20, # Dieses Limit bezieht sich auf die Anzahl der *zurückgegebenen*, gefilterten Tokens
+    deep: bool = False,
+    max_pages: int = CRAWL_MAX_PAGES
 ) -> List[Dict[str, Any]]:
     """
-    Holt eine Liste von Tokens von der API, filtert sie nach MCAP und gibt eine begrenzte Anzahl zurück.
+    Holt Tokens im MCAP-Bereich von der API und gibt eine begrenzte Anzahl zurück.
+    
+    Standardmäßig wird nur eine Seite (die 50 umsatzstärksten Tokens) abgerufen
+    und nach MCAP gefiltert. Mit deep=True wird der MCAP-Bereich seitenweise
+    durchsucht (siehe crawl_token_list) - das kostet bis zu max_pages
+    Anfragen plus die Suche nach der ersten Seite.
     
     Args:
         mcap_min: Minimale Marktkapitalisierung
         mcap_max: Maximale Marktkapitalisierung
         liquidity_min: Minimale Liquidität (wird an API übergeben)
         limit: Maximale Anzahl der *zurückzugebenden* Tokens nach Filterung
+        deep: Den MCAP-Bereich seitenweise durchsuchen statt nur eine Seite zu lesen
+        max_pages: Maximale Anzahl Seiten im Bereich (nur mit deep)
         
     Returns:
-        Eine Liste mit gefilterten Token-Daten, maximal 'limit' Elemente.
+        Eine Liste mit gefilterten Token-Daten (nach 24h-Volumen sortiert), maximal 'limit' Elemente.
     """
-    # Hole die maximal erlaubte Menge Tokens von der API (Limit ist 50)
-    fetch_limit = 50 
-    print(f"Rufe Top {fetch_limit} Tokens von Birdeye ab (min. Liquidität: {liquidity_min})...")
-    token_list = get_token_list(limit=fetch_limit, min_liquidity=liquidity_min)
-    filtered_tokens = []
-
-    if token_list and token_list.get("success", False):
-        print(f"API-Antwort erhalten, verarbeite Tokens...")
-        tokens = token_list.get("data", {}).get("tokens", [])
-        
-        for token in tokens:
-            # MCAP-Filter
-            mcap = token.get("mc", 0)
-            if mcap_min <= mcap <= mcap_max:
-                # Liquiditäts-Filter (bereits durch API-Parameter gesetzt, aber zur Sicherheit)
-                liquidity = token.get("liquidity", 0)
-                if liquidity >= liquidity_min:
-                    filtered_tokens.append(token)
-                    
-                    # Begrenze die Anzahl der Tokens
-                    if len(filtered_tokens) >= limit:
-                        break
-    
-    return filtered_tokens
+    if deep:
+        print(f"Durchsuche Birdeye-Tokenliste nach MCAP {mcap_min}-{mcap_max} (min. Liquidität: {liquidity_min})...")
+        tokens = crawl_token_list(mcap_min, mcap_max, min_liquidity=liquidity_min, max_pages=max_pages) or []
+        print(f"{len(tokens)} Tokens im MCAP-Bereich gefunden, verarbeite Tokens...")
+    else:
+        print(f"Rufe Top {TOKEN_LIST_PAGE_SIZE} Tokens von Birdeye ab (min. Liquidität: {liquidity_min})...")
+        token_list = get_token_list(limit=TOKEN_LIST_PAGE_SIZE, min_liquidity=liquidity_min)
+        tokens = []
+        if token_list and token_list.get("success", False):
+            tokens = [token for token in token_list.get("data", {}).get("tokens", []) or []
+                      if mcap_min <= _token_mcap(token) <= mcap_max]
+    
+    # Liquiditäts-Filter (bereits durch API-Parameter gesetzt, aber zur Sicherheit)
+    filtered_tokens = [token for token in tokens if (token.get("liquidity") or 0) >= liquidity_min]
+    # Wie bisher die umsatzstärksten Tokens zuerst
+    filtered_tokens.sort(key=lambda token: token.get("v24hUSD") or 0, reverse=True)
+    return filtered_tokens[:limit]
 
 def extract_token_info(token_data: Dict[str, Any]) -> Dict[str, Any]:
     """
@@ -386,7 +612,8 @@ def analyze_token_for_strategy(
     pattern_weight: int = 40,
     volume_weight: int = 35,
     timeframe_weight: int = 15,
-    rugpull_weight: int = 10
+    rugpull_weight: int = 10,
+    price_history_analysis: Optional[Dict[str, Any]] = None
 ):
     """
     Analysiert Token-Daten nach den Kriterien der "Second Bounce Strategy".
@@ -399,6 +626,8 @@ def analyze_token_for_strategy(
         volume_weight: Gewichtung für Volumenbestätigung
         timeframe_weight: Gewichtung für Zeitrahmenübereinstimmung
         rugpull_weight: Gewichtung für Rugpull-Sicherheit
+        price_history_analysis: Bereits berechnete Analyse der Kerzen (siehe
+                                analyze_price_history), ersetzt price_history
         
     Returns:
         Ein Dictionary mit der Analyse und dem Score
@@ -433,26 +662,23 @@ def analyze_token_for_strategy(
     }
     
     # Wenn historische Preisdaten vorhanden sind, analysiere sie
-    # if price_history and isinstance(price_history, dict) and "data" in price_history and "candles" in price_history["data"]:
-    #     candles = price_history["data"]["candles"]
-    #     # Analysiere Preishistorie für Pattern-Erkennung
-    #     result["price_history_analysis"] = analyze_price_history(candles)
+    candles = extract_candles(price_history) if price_history_analysis is None else None
+    if candles or price_history_analysis:
+        # Analysiere Preishistorie für Pattern-Erkennung
+        result["price_history_analysis"] = price_history_analysis or analyze_price_history(candles)
         
-    #     # 1. Muster-Analyse (Gewichtet) - Verbessert mit historischen Daten
-    #     pattern_score, pattern_reasons = analyze_price_pattern(result["price_history_analysis"], max_score=pattern_weight)
-    #     result["score"]["pattern"] = pattern_score
-    #     result["reasons"].extend(pattern_reasons)
+        # 1. Muster-Analyse (Gewichtet) - Verbessert mit historischen Daten
+        pattern_score, pattern_reasons = analyze_price_pattern(result["price_history_analysis"], max_score=pattern_weight)
+        result["score"]["pattern"] = pattern_score
+        result["reasons"].extend(pattern_reasons)
         
-    #     # Setze dip_detected und bounce_detected basierend auf der Analyse
-    #     result["dip_detected"] = result["price_history_analysis"].get("dip_detected", False)
-    #     result["bounce_detected"] = result["price_history_analysis"].get("bounce_detected", False)
-    # else:
-    #     # Wenn keine historischen Daten verfügbar sind oder die Analyse fehlgeschlagen ist
-    #     result["reasons"].append("Keine ausreichenden historischen Preisdaten für Musteranalyse verfügbar.")
-    #     # Fallback auf einfache 24h-Analyse (optional, könnte man auch weglassen und 0 Punkte geben)
-    #     # simple_pattern_analysis(token_info, result) # Entfernt, da wir historische Daten priorisieren
-    result["score"]["pattern"] = 0 # Keine Punkte ohne historische Daten
-    result["reasons"].append("Preismuster-Analyse deaktiviert (API-Limit)")
+        # Setze dip_detected und bounce_detected basierend auf der Analyse
+        result["dip_detected"] = result["price_history_analysis"].get("dip_detected", False)
+        result["bounce_detected"] = result["price_history_analysis"].get("bounce_detected", False)
+    else:
+        # Wenn keine historischen Daten verfügbar sind oder der Abruf fehlgeschlagen ist
+        result["score"]["pattern"] = 0 # Keine Punkte ohne historische Daten
+        result["reasons"].append("Keine ausreichenden historischen Preisdaten für Musteranalyse verfügbar.")
     
     # 2. Volumen-Analyse (Gewichtet)
     volume_score, volume_reasons, volume_trend = analyze_volume_quality(token_info, result.get("price_history_analysis", {}), max_score=volume_weight)
@@ -489,6 +715,31 @@ def analyze_token_for_strategy(
     
     return result
 
+def extract_candles(price_history: Optional[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Liest die Kerzen aus einer Preishistorie-Antwort im Format von analyze_price_history
+    (Dictionaries mit "time", "close" und "volume").
+    
+    Unterstützt data.candles sowie data.items von /defi/price_history
+    (unixTime, value) und /defi/ohlcv (unixTime, c, v).
+    
+    Returns:
+        Liste der Kerzen (leer bei Fehlerantwort oder fehlenden Daten)
+    """
+    if not isinstance(price_history, dict) or price_history.get("success") is False:
+        return []
+    data = price_history.get("data") or {}
+    if data.get("candles"):
+        return data["candles"]
+    
+    candles = []
+    for item in data.get("items") or []:
+        close = item.get("c", item.get("value"))
+        if close is None:
+            continue
+        candles.append({"time": item.get("unixTime", 0), "close": close, "volume": item.get("v", 0)})
+    return candles
+
 def analyze_price_history(candles):
     """
     Analysiert historische Preisdaten, um wichtige Muster zu erkennen.
@@ -944,6 +1195,69 @@ def determine_main_reason(result):
             return "Unzureichende Gesamtwerte" # Fallback
 
 
+def iter_strategy_scan(
+    tokens: List[Dict[str, Any]],
+    with_price_history: bool = True,
+    max_workers: int = SCAN_MAX_WORKERS,
+    **weights
+) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """
+    Analysiert Tokens parallel und liefert die Analysen, sobald sie fertig sind.
+    
+    Die Worker holen die Kerzen der Tokens (und warten dabei auf den
+    gemeinsamen Rate-Limiter, siehe make_api_request). Alle bis dahin
+    eingetroffenen Antworten werden gemeinsam analysiert (siehe
+    data.price_analysis.analyze_price_responses), während die übrigen
+    Tokens weiter abgerufen werden.
+    
+    Args:
+        tokens: Token-Objekte aus /defi/tokenlist
+        with_price_history: Kerzen abrufen und das Preismuster bewerten
+        max_workers: Anzahl paralleler Worker
+        **weights: Gewichtungen für analyze_token_for_strategy (pattern_weight, ...)
+        
+    Returns:
+        Iterator über (Index in tokens, Analyse) in der Reihenfolge der Fertigstellung
+    """
+    def analyze(index, price_history_analysis=None):
+        try:
+            return analyze_token_for_strategy(tokens[index], price_history_analysis=price_history_analysis, **weights)
+        except Exception as e:
+            print(f"Fehler bei der Analyse von {tokens[index].get('address')}: {e}")
+            return None
+    
+    if not with_price_history:
+        for index in range(len(tokens)):
+            analysis = analyze(index)
+            if analysis is not None:
+                yield index, analysis
+        return
+    if not tokens:
+        return
+    from data.price_analysis import analyze_price_responses
+    executor = ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(tokens))),
+                                  thread_name_prefix="StrategyScan")
+    try:
+        pending = {executor.submit(get_token_price_history, token["address"], resolution=SCAN_HISTORY_RESOLUTION): index
+                   for index, token in enumerate(tokens)}
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            indices, histories = [], []
+            for future in done:
+                index = pending.pop(future)
+                try:
+                    histories.append(future.result())
+                    indices.append(index)
+                except Exception as e:
+                    print(f"Fehler beim Abruf der Kerzen von {tokens[index].get('address')}: {e}")
+            for index, price_history_analysis in zip(indices, analyze_price_responses(histories)):
+                analysis = analyze(index, price_history_analysis)
+                if analysis is not None:
+                    yield index, analysis
+    finally:
+        # Bricht der Aufrufer ab, werden noch nicht gestartete Abrufe verworfen
+        executor.shutdown(wait=False, cancel_futures=True)
+
 def scan_tokens_for_strategy(
     mcap_min: float = 100000,
     mcap_max: float = 3000000,
@@ -955,11 +1269,16 @@ def scan_tokens_for_strategy(
     pattern_weight: int = 40,
     volume_weight: int = 35,
     timeframe_weight: int = 15,
-    rugpull_weight: int = 10
+    rugpull_weight: int = 10,
+    with_price_history: bool = True,
+    on_result: Optional[Callable[[Dict[str, Any], List[Dict[str, Any]]], None]] = None,
+    deep: bool = True
 ) -> List[Dict[str, Any]]:
     """
     Scannt Tokens nach den Strategie-Kriterien.
     
+    Die Tokens werden parallel abgerufen und analysiert (siehe iter_strategy_scan).
+    
     Args:
         mcap_min: Minimale Marktkapitalisierung
         mcap_max: Maximale Marktkapitalisierung
@@ -972,6 +1291,11 @@ def scan_tokens_for_strategy(
         volume_weight: Gewichtung für Volumenbestätigung
         timeframe_weight: Gewichtung für Zeitrahmenübereinstimmung
         rugpull_weight: Gewichtung für Rugpull-Sicherheit
+        with_price_history: Kerzen abrufen und das Preismuster bewerten
+        on_result: Optional. Wird nach jeder fertigen Analyse mit (Analyse, bisherige
+                   Rangliste) aufgerufen (im Thread des Aufrufers)
+        deep: Den MCAP-Bereich seitenweise durchsuchen (siehe get_filtered_tokens),
+              sonst nur die 50 umsatzstärksten Tokens filtern
         
     Returns:
         Eine Liste mit analysierten Token-Daten, sortiert nach Score
@@ -981,77 +1305,30 @@ def scan_tokens_for_strategy(
         mcap_min=mcap_min,
         mcap_max=mcap_max,
         liquidity_min=liquidity_min,
-        limit=limit * 2 # Hole mehr Tokens, da wir noch nach Alter/TX filtern
+        limit=limit * 2, # Hole mehr Tokens, da wir noch nach Alter/TX filtern
+        deep=deep
     )
     
-    # Analyse jedes Tokens
-    results = []
-    analyzed_count = 0
-    for token in filtered_tokens:
-        if analyzed_count >= limit:
-            break
-
-        token_address = token.get("address")
-        if not token_address:
-            continue
-
-        # Überspringe den Aufruf von get_token_info und die Filter für Alter und TX,
-        # da /defi/token_overview nicht im Standard-Plan verfügbar ist.
-        # und wir die 401-Fehler vermeiden wollen.
-        
-        # # Hole zusätzliche Token-Infos für Alter und TX (nicht im Standard-Tokenlist-Endpunkt)
-        # # Nutze Cache, um API-Aufrufe zu minimieren
-        # token_stat = get_token_info(token_address)
-        # if not token_stat or not token_stat.get("success", False):
-        # #   print(f"Konnte Token-Stat für {token_address} nicht abrufen.")
-        #     continue
-        
-        # # token_stat_data = token_stat.get("data", {})
-
-        # # Filter nach Alter (AUSKOMMENTIERT, da 'created_at' in /token_overview fehlt)
-        # # created_at = token_stat_data.get("created_at", 0) 
-        # # if created_at:
-        # #     from datetime import datetime, timezone
-        # #     created_dt = datetime.fromtimestamp(created_at, tz=timezone.utc)
-        # #     now = datetime.now(tz=timezone.utc)
-        # #     age_days = (now - created_dt).days
-        # #     if not (age_min <= age_days <= age_max):
-        # #       # print(f"Token {token_address} nach Alter gefiltert ({age_days} Tage)") # Debugging
-        # #         continue
-        # # else:
-        # #   print(f"Kein Erstellungsdatum für {token_address} gefunden (Altersfilter übersprungen).")
-        #     # continue # Ohne Alter können wir nicht filtern - Vorerst überspringen statt filtern
-
-        # # Filter nach Transaktionen (verwende 'trade24h' aus /token_overview)
-        # # tx_24h = token_stat_data.get("trade24h", 0) # Geändert von tx24h zu trade24h
-        # # if tx_24h < min_tx:
-        # #   # print(f"Token {token_address} nach TX gefiltert ({tx_24h} TX)") # Debugging
-        # #     continue
-
-        # Hole Preis-Historie (z.B. 5m Kerzen für die letzten 24 Stunden)
-        # to_ts = int(time.time())
-        # from_ts = to_ts - 86400 # 24 * 60 * 60
-        
-        # price_history = get_token_price_history(token_address, resolution="5m", from_ts=from_ts, to_ts=to_ts)
-        price_history = None # Deaktiviere Price History
-
-        # Führe die Analyse mit historischen Daten und Gewichtungen durch
-        # Verwende token_stat_data, da es mehr Infos enthält als das token-Objekt aus der Liste
-        analysis = analyze_token_for_strategy(
-            token, 
-            price_history=price_history,
-            pattern_weight=pattern_weight,
-            volume_weight=volume_weight,
-            timeframe_weight=timeframe_weight,
-            rugpull_weight=rugpull_weight
-        )
-        results.append(analysis)
-        analyzed_count += 1
-    
-    # Sortiere nach Gesamt-Score (absteigend)
-    results.sort(key=lambda x: x["score"]["total"], reverse=True)
-    
-    return results
+    # Alter und TX werden nicht gefiltert, da /defi/token_overview nicht im
+    # Standard-Plan verfügbar ist (401-Fehler) - analysiert werden die ersten `limit` Tokens
+    candidates = [token for token in filtered_tokens if token.get("address")][:limit]
+    
+    # Analyse aller Tokens, Rangliste wird mit jedem Ergebnis fortgeschrieben
+    ranked = []  # (Index, Analyse), sortiert nach Score, bei Gleichstand nach Listenposition
+    for index, analysis in iter_strategy_scan(
+        candidates,
+        with_price_history=with_price_history,
+        pattern_weight=pattern_weight,
+        volume_weight=volume_weight,
+        timeframe_weight=timeframe_weight,
+        rugpull_weight=rugpull_weight
+    ):
+        ranked.append((index, analysis))
+        ranked.sort(key=lambda item: (-item[1]["score"]["total"], item[0]))
+        if on_result:
+            on_result(analysis, [entry for _, entry in ranked])
+    
+    return [analysis for _, analysis in ranked]
 
 def extract_token_data_for_ui(analysis: Dict[str, Any]) -> tuple:
     """
@@ -0,0 +1,95 @@
+# Begrenzter In-Memory-Cache mit Ablaufzeit und LRU-Verdrängung
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+# Markiert einen Cache-Fehltreffer (None ist ein gültiger Wert)
+MISSING = object()
+
+class TTLCache:
+    """
+    Thread-sicherer Cache mit Ablaufzeit pro Eintrag und fester Maximalgröße.
+
+    Jeder Eintrag läuft nach seiner TTL ab. Ist der Cache voll, wird der am
+    längsten nicht mehr genutzte Eintrag verdrängt (LRU). Treffer, Fehltreffer
+    und Verdrängungen werden gezählt (siehe stats()).
+    """
+
+    def __init__(self, maxsize: int = 512, ttl: float = 60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def get(self, key: Hashable, default: Any = MISSING) -> Any:
+        """Gibt den Wert zurück oder `default`, falls nicht vorhanden bzw. abgelaufen."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires, value = entry
+                if expires > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+            self.misses += 1
+            return default
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Speichert einen Wert; ohne ttl gilt die Standard-Ablaufzeit des Caches."""
+        expires = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._entries[key] = (expires, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                # Am längsten ungenutzter Eintrag steht vorne
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_fetch(self, key: Hashable, fetch: Callable[[], Any], ttl: Optional[float] = None,
+                     cache_if: Callable[[Any], bool] = lambda value: value is not None) -> Any:
+        """
+        Gibt den gecachten Wert zurück oder ruft fetch() auf und speichert das Ergebnis.
+
+        Args:
+            cache_if: Nur Ergebnisse, für die das True liefert, werden gespeichert
+                      (Standard: alles außer None)
+        """
+        value = self.get(key)
+        if value is not MISSING:
+            return value
+        value = fetch()
+        if cache_if(value):
+            self.set(key, value, ttl)
+        return value
+
+    def invalidate(self, key: Hashable) -> None:
+        """Entfernt einen Eintrag."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Leert den Cache (Zähler bleiben erhalten)."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Gibt Größe, Treffer, Fehltreffer, Trefferquote und Verdrängungen zurück."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "evictions": self.evictions
+            }
\ No newline at end of file
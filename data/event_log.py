@@ -0,0 +1,271 @@
+# Append-only Ereignisprotokoll für den Lebenszyklus der Calls
+import glob
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from config import EVENT_LOG_DIR, EVENT_LOG_COMPACT_EVENTS
+from data.backends import StorageBackend, JsonBackend, row_keys
+from data.persistence import write_json
+
+# Felder, die sich bei einer Aktualisierung aus der Dexscreener-Abfrage ändern
+# (X_Factor, PL_* und Invest nur im alten Speicherformat mit Anzeige-Strings)
+MCAP_FIELDS = {"Aktuelles_MCAP", "X_Factor", "PL_Percent", "PL_Dollar", "Invest"}
+
+def diff_calls(previous: Dict[str, Dict[str, Any]], calls: List[Dict[str, Any]],
+               keys: List[str]) -> List[Dict[str, Any]]:
+    """
+    Ermittelt die Ereignisse, die vom vorherigen zum neuen Stand führen.
+
+    Args:
+        previous: Bisheriger Stand (Schlüssel -> Call)
+        calls: Neuer Stand
+        keys: Schlüssel der neuen Calls (siehe row_keys)
+
+    Returns:
+        Liste der Ereignisse ohne Sequenznummer und Zeitstempel
+    """
+    events = []
+    current_keys = set(keys)
+    for key in previous:
+        if key not in current_keys:
+            events.append({"type": "deleted", "key": key})
+
+    for key, call in zip(keys, calls):
+        old = previous.get(key)
+        if old is None:
+            events.append({"type": "created", "key": key, "call": call})
+            continue
+        if old == call:
+            continue
+
+        changed = {field: value for field, value in call.items() if old.get(field) != value}
+        removed = [field for field in old if field not in call]
+        if call.get("abgeschlossen", False) and not old.get("abgeschlossen", False):
+            event_type = "closed"
+        elif not removed and set(changed) <= MCAP_FIELDS:
+            event_type = "mcap"
+        else:
+            event_type = "updated"
+
+        event = {"type": event_type, "key": key, "fields": changed}
+        if removed:
+            event["removed"] = removed
+        events.append(event)
+    return events
+
+def apply_event(state: Dict[str, Dict[str, Any]], event: Dict[str, Any]) -> None:
+    """Wendet ein Ereignis auf den Stand (Schlüssel -> Call, in Listenreihenfolge) an."""
+    key = event.get("key")
+    if event["type"] == "created":
+        state.pop(key, None)
+        state[key] = dict(event["call"])
+    elif event["type"] == "deleted":
+        state.pop(key, None)
+    elif key in state:
+        call = state[key]
+        call.update(event.get("fields", {}))
+        for field in event.get("removed", []):
+            call.pop(field, None)
+
+def _read_events(path: str) -> List[Dict[str, Any]]:
+    """Liest alle vollständigen Ereignisse aus einer JSONL-Datei (eine abgebrochene letzte Zeile wird übersprungen)."""
+    events = []
+    if not os.path.exists(path):
+        return events
+    with open(path, "r") as f:
+        for line in f:
+            try:
+                events.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+    return events
+
+def _truncate_partial_line(path: str) -> None:
+    """
+    Schneidet eine unvollständige letzte Zeile (Absturz während des Schreibens) ab.
+
+    Sonst würde das nächste angehängte Ereignis an die abgebrochene Zeile
+    geklebt und beim Laden mit ihr verworfen.
+    """
+    if not os.path.exists(path):
+        return
+    with open(path, "rb+") as f:
+        size = f.seek(0, os.SEEK_END)
+        if size == 0:
+            return
+        f.seek(size - 1)
+        if f.read(1) == b"\n":
+            return
+        f.seek(0)
+        content = f.read()
+        f.truncate(content.rfind(b"\n") + 1)
+        f.flush()
+        os.fsync(f.fileno())
+
+class EventLogBackend(StorageBackend):
+    """
+    Speichert Calls als append-only Ereignisprotokoll (JSONL).
+
+    Jede Änderung wird als Ereignis angehängt (created, mcap, updated, closed,
+    deleted) - eine Aktualisierung der Marktkapitalisierung kostet damit nur
+    eine Zeile pro geändertem Call statt eines Neuschreibens aller Calls, und
+    der Kursverlauf jedes Calls bleibt erhalten.
+
+    Nach EVENT_LOG_COMPACT_EVENTS Ereignissen wird der aktuelle Stand als
+    Snapshot geschrieben und das bisherige Protokoll ins Archiv verschoben.
+    Beim Laden wird der Snapshot gelesen und das Protokoll ab dessen
+    Sequenznummer nachgespielt. Watchlist und Kontostand liegen weiter im
+    übergebenen Backend (Standard: JSON-Dateien).
+    """
+
+    def __init__(self, inner: Optional[StorageBackend] = None, directory: str = EVENT_LOG_DIR,
+                 compact_after: int = EVENT_LOG_COMPACT_EVENTS):
+        super().__init__()
+        self.inner = inner or JsonBackend()
+        self.log_file = os.path.join(directory, "calls.jsonl")
+        self.snapshot_file = os.path.join(directory, "calls_snapshot.json")
+        self.archive_dir = os.path.join(directory, "archive")
+        self.compact_after = compact_after
+        self._state: Dict[str, Dict[str, Any]] = {}
+        self._seq = 0
+        self._log_events = 0
+        self._compacted = False  # Snapshot seit der letzten Abfrage von backup_due geschrieben
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def load_calls(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            if not os.path.exists(self.snapshot_file) and not os.path.exists(self.log_file):
+                # Erster Start: vorhandene Calls aus dem bisherigen Backend übernehmen
+                calls = self.inner.load_calls()
+                self.recovered.update(self.inner.recovered)
+                self.inner.recovered.clear()
+                self._state = dict(zip(row_keys(calls), (dict(call) for call in calls)))
+                self._compact()
+                return [dict(call) for call in self._state.values()]
+
+            state: Dict[str, Dict[str, Any]] = {}
+            seq = 0
+            if os.path.exists(self.snapshot_file):
+                try:
+                    with open(self.snapshot_file, "r") as f:
+                        snapshot = json.load(f)
+                    state = {key: call for key, call in snapshot.get("calls", [])}
+                    seq = snapshot.get("seq", 0)
+                except (OSError, json.JSONDecodeError, ValueError) as e:
+                    print(f"Snapshot des Ereignisprotokolls nicht lesbar: {e}")
+
+            _truncate_partial_line(self.log_file)
+            events = _read_events(self.log_file)
+            for event in events:
+                # Bereits im Snapshot enthaltene Ereignisse überspringen (Abbruch während der Kompaktierung)
+                if event.get("seq", 0) <= seq:
+                    continue
+                apply_event(state, event)
+                seq = event["seq"]
+
+            self._state = state
+            self._seq = seq
+            self._log_events = len(events)
+            return [dict(call) for call in state.values()]
+
+    def save_calls(self, calls: List[Dict[str, Any]]) -> None:
+        keys = row_keys(calls)
+        with self._lock:
+            events = diff_calls(self._state, calls, keys)
+            if not events:
+                return
+
+            timestamp = time.time()
+            lines = []
+            for event in events:
+                self._seq += 1
+                event["seq"] = self._seq
+                event["ts"] = timestamp
+                lines.append(json.dumps(event))
+                apply_event(self._state, event)
+
+            with open(self.log_file, "a") as f:
+                f.write("\n".join(lines) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            self._log_events += len(lines)
+
+            # Weicht die Reihenfolge ab (z.B. umsortierte Liste), hilft nur ein neuer Snapshot
+            if list(self._state) != keys:
+                self._state = dict(zip(keys, (dict(call) for call in calls)))
+                self._compact()
+            elif self._log_events >= self.compact_after:
+                self._compact()
+
+    def _compact(self) -> None:
+        """Schreibt den aktuellen Stand als Snapshot und archiviert das bisherige Protokoll."""
+        write_json(self.snapshot_file, {
+            "seq": self._seq,
+            "timestamp": datetime.now().isoformat(),
+            "calls": [[key, call] for key, call in self._state.items()]
+        })
+        if os.path.exists(self.log_file):
+            os.makedirs(self.archive_dir, exist_ok=True)
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            os.replace(self.log_file, os.path.join(self.archive_dir, f"calls_{timestamp}_{self._seq:010d}.jsonl"))
+        self._log_events = 0
+        self._compacted = True
+
+    def backup_due(self) -> bool:
+        """Das vollständige Backup nur nach einem Snapshot, nicht nach jedem angehängten Ereignis."""
+        with self._lock:
+            compacted, self._compacted = self._compacted, False
+            return compacted
+
+    def load_watchlist(self) -> List[Dict[str, Any]]:
+        watchlist = self.inner.load_watchlist()
+        self.recovered.update(self.inner.recovered)
+        self.inner.recovered.clear()
+        return watchlist
+
+    def load_budget(self) -> float:
+        return self.inner.load_budget()
+
+    def save_watchlist(self, watchlist: List[Dict[str, Any]]) -> None:
+        self.inner.save_watchlist(watchlist)
+
+    def save_budget(self, budget: float) -> None:
+        self.inner.save_budget(budget)
+
+    def close(self) -> None:
+        self.inner.close()
+
+def iter_events(directory: str = EVENT_LOG_DIR) -> List[Dict[str, Any]]:
+    """Gibt alle Ereignisse aus Archiv und aktuellem Protokoll in Sequenzreihenfolge zurück."""
+    paths = sorted(glob.glob(os.path.join(directory, "archive", "calls_*.jsonl")))
+    paths.append(os.path.join(directory, "calls.jsonl"))
+    events = {}
+    for path in paths:
+        for event in _read_events(path):
+            events[event.get("seq", 0)] = event
+    return [events[seq] for seq in sorted(events)]
+
+def read_price_trail(key: str, directory: str = EVENT_LOG_DIR) -> List[Tuple[float, str]]:
+    """
+    Liest den Verlauf der Marktkapitalisierung eines Calls.
+
+    Args:
+        key: Schlüssel des Calls, d.h. seine ID (siehe data.backends.row_keys)
+
+    Returns:
+        Liste von (Unix-Zeitstempel, Aktuelles_MCAP) in zeitlicher Reihenfolge
+    """
+    trail = []
+    for event in iter_events(directory):
+        if event.get("key") != key:
+            continue
+        if event["type"] == "created":
+            trail.append((event["ts"], event["call"].get("Aktuelles_MCAP", "")))
+        elif "Aktuelles_MCAP" in event.get("fields", {}):
+            trail.append((event["ts"], event["fields"]["Aktuelles_MCAP"]))
+    return trail
\ No newline at end of file
@@ -0,0 +1,161 @@
+# Persistenter HTTP-Antwort-Cache (SQLite) mit Revalidierung über ETag/Last-Modified
+import json
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from config import HTTP_CACHE_ENABLED, HTTP_CACHE_FILE, HTTP_CACHE_MAX_ENTRIES
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    body TEXT NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    stored_at REAL NOT NULL,
+    expires_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_responses_stored_at ON responses(stored_at);
+"""
+
+# Nach so vielen Schreibvorgängen wird auf HTTP_CACHE_MAX_ENTRIES gekürzt
+_PRUNE_EVERY = 200
+
+def request_key(url: str, params: Optional[Dict[str, Any]] = None) -> str:
+    """
+    Normalisiert eine GET-Anfrage zu einem Cache-Schlüssel.
+
+    Schema und Host werden klein geschrieben, Query-Parameter aus URL und
+    `params` zusammengeführt und sortiert. Header (z.B. API-Keys) gehören
+    nicht zum Schlüssel.
+    """
+    parts = urlsplit(url)
+    query = parse_qsl(parts.query, keep_blank_values=True)
+    query.extend((str(name), str(value)) for name, value in (params or {}).items() if value is not None)
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path, urlencode(sorted(query)), ""))
+
+@dataclass
+class CacheEntry:
+    """Eine gespeicherte Antwort mit den Angaben für die Revalidierung."""
+    data: Any
+    etag: Optional[str]
+    last_modified: Optional[str]
+    stored_at: float
+    expires_at: float
+
+    @property
+    def fresh(self) -> bool:
+        """True, solange die Antwort ohne Rückfrage verwendet werden darf."""
+        return time.time() < self.expires_at
+
+    @property
+    def age(self) -> float:
+        """Alter der Antwort in Sekunden."""
+        return time.time() - self.stored_at
+
+    def validators(self) -> Dict[str, str]:
+        """Header für eine bedingte Anfrage (leer, wenn der Server keine Validatoren geliefert hat)."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+class HttpCache:
+    """
+    Speichert JSON-Antworten mit Ablaufzeit in einer SQLite-Datenbank.
+
+    Abgelaufene Einträge bleiben erhalten: Sie können mit ihren Validatoren
+    (ETag/Last-Modified) bedingt abgefragt werden - bei 304 wird nur die
+    Ablaufzeit verlängert - und dienen als Rückfall, wenn die API nicht
+    erreichbar ist. Die ältesten Einträge werden oberhalb von `max_entries`
+    gelöscht.
+    """
+
+    def __init__(self, path: str = HTTP_CACHE_FILE, max_entries: int = HTTP_CACHE_MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._writes = 0
+        # Verbindung wird aus mehreren Threads (HTTP-Pool, RefreshEngine, Tk) genutzt
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        """Gibt den Eintrag zurück (auch abgelaufen) oder None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT body, etag, last_modified, stored_at, expires_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        try:
+            data = json.loads(row[0])
+        except ValueError:
+            return None
+        return CacheEntry(data, row[1], row[2], row[3], row[4])
+
+    def put(self, key: str, data: Any, ttl: float, etag: Optional[str] = None,
+            last_modified: Optional[str] = None) -> None:
+        """Speichert eine Antwort mit Ablaufzeit und Validatoren."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, body, etag, last_modified, stored_at, expires_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, json.dumps(data), etag, last_modified, now, now + ttl)
+            )
+            self._writes += 1
+            if self._writes % _PRUNE_EVERY == 0:
+                self._prune()
+            self._conn.commit()
+
+    def touch(self, key: str, ttl: float) -> None:
+        """Verlängert einen Eintrag nach erfolgreicher Revalidierung (HTTP 304)."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute("UPDATE responses SET stored_at = ?, expires_at = ? WHERE key = ?",
+                               (now, now + ttl, key))
+            self._conn.commit()
+
+    def _prune(self) -> None:
+        """Löscht die ältesten Einträge oberhalb von max_entries (Lock wird vom Aufrufer gehalten)."""
+        self._conn.execute(
+            "DELETE FROM responses WHERE key IN "
+            "(SELECT key FROM responses ORDER BY stored_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,)
+        )
+
+    def clear(self) -> None:
+        """Löscht alle Einträge."""
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+# Prozessweite Instanz (wird beim ersten Zugriff angelegt)
+_cache = None
+_cache_lock = threading.Lock()
+
+def get_cache() -> Optional[HttpCache]:
+    """Gibt den prozessweiten Cache zurück oder None, wenn er abgeschaltet bzw. nicht nutzbar ist."""
+    global _cache
+    if not HTTP_CACHE_ENABLED:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            try:
+                _cache = HttpCache()
+            except sqlite3.Error as e:
+                print(f"HTTP-Cache nicht verfügbar: {e}")
+                return None
+        return _cache
\ No newline at end of file
@@ -0,0 +1,155 @@
+# HTTP-Client mit Connection-Pooling und begrenzter Parallelität
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from config import API_TIMEOUT, HTTP_MAX_CONCURRENCY, HTTP_MAX_CONNECTIONS_PER_HOST
+from data.http_cache import CacheEntry, get_cache, request_key
+
+# Gemeinsame Session (Keep-Alive) und Thread-Pool für parallele Abrufe
+_session = None
+_executor = None
+_lock = threading.Lock()
+
+def get_session() -> requests.Session:
+    """
+    Gibt die prozessweite Session zurück und legt sie beim ersten Aufruf an.
+
+    Verbindungen werden pro Host in einem Pool gehalten und wiederverwendet.
+    Mehr als HTTP_MAX_CONNECTIONS_PER_HOST gleichzeitige Verbindungen zu einem
+    Host werden nicht geöffnet - weitere Anfragen warten auf eine freie Verbindung.
+    """
+    global _session
+    with _lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=10,
+                pool_maxsize=HTTP_MAX_CONNECTIONS_PER_HOST,
+                pool_block=True
+            )
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _session = session
+        return _session
+
+def _get_executor() -> ThreadPoolExecutor:
+    """Gibt den gemeinsamen Thread-Pool für fetch_many() zurück."""
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=HTTP_MAX_CONCURRENCY, thread_name_prefix="http")
+        return _executor
+
+def get(url: str, timeout: int = API_TIMEOUT, params: Dict = None, headers: Dict = None) -> requests.Response:
+    """
+    Führt einen GET-Request über die gemeinsame Session aus und gibt die Antwort
+    unverändert zurück (Statuscode und Header prüft der Aufrufer).
+
+    Raises:
+        requests.exceptions.RequestException bei Verbindungsfehlern
+    """
+    return get_session().get(url, params=params, headers=headers, timeout=timeout)
+
+def get_json(url: str, timeout: int = API_TIMEOUT, params: Dict = None, headers: Dict = None) -> Optional[Dict[str, Any]]:
+    """
+    Führt einen GET-Request über die gemeinsame Session aus.
+
+    Returns:
+        Die JSON-Antwort als Dictionary oder None bei Fehler
+    """
+    try:
+        resp = get(url, timeout, params, headers)
+        resp.raise_for_status()
+        return resp.json()
+    except Exception as e:
+        print(f"API-Fehler: {e}")
+        return None
+
+def get_json_cached(url: str, ttl: float, timeout: int = API_TIMEOUT, params: Dict = None,
+                    headers: Dict = None) -> Optional[Dict[str, Any]]:
+    """
+    Wie get_json, aber über den persistenten HTTP-Cache (siehe data.http_cache).
+
+    Eine frische Antwort wird ohne Anfrage zurückgegeben. Ist sie abgelaufen,
+    wird mit ETag/Last-Modified bedingt nachgefragt; bei 304 gilt die
+    gespeicherte Antwort für weitere `ttl` Sekunden. Schlägt die Anfrage fehl,
+    wird None zurückgegeben - eine veraltete Antwort darf nicht als aktueller
+    Wert gelten (wer sie anzeigen will, liest sie mit peek_entry samt Alter).
+
+    Args:
+        ttl: Sekunden, die eine Antwort ohne erneute Anfrage gilt
+    """
+    cache = get_cache()
+    if cache is None:
+        return get_json(url, timeout, params, headers)
+
+    key = request_key(url, params)
+    entry = cache.get(key)
+    if entry is not None and entry.fresh:
+        return entry.data
+
+    request_headers = dict(headers or {})
+    if entry is not None:
+        request_headers.update(entry.validators())
+    try:
+        resp = get(url, timeout, params, request_headers)
+        if resp.status_code == 304 and entry is not None:
+            cache.touch(key, ttl)
+            return entry.data
+        resp.raise_for_status()
+        data = resp.json()
+        cache.put(key, data, ttl, resp.headers.get("ETag"), resp.headers.get("Last-Modified"))
+        return data
+    except Exception as e:
+        print(f"API-Fehler: {e}")
+        return None
+
+def peek_entry(url: str, params: Dict = None) -> Optional[CacheEntry]:
+    """Gibt den gespeicherten Cache-Eintrag ohne Anfrage zurück (auch abgelaufen), sonst None."""
+    cache = get_cache()
+    if cache is None:
+        return None
+    return cache.get(request_key(url, params))
+
+def store_json(url: str, data: Any, ttl: float, params: Dict = None) -> None:
+    """Legt eine Antwort für `ttl` Sekunden im persistenten Cache ab (z.B. Teile einer Sammelantwort)."""
+    cache = get_cache()
+    if cache is not None:
+        cache.put(request_key(url, params), data, ttl)
+
+def peek_json(url: str, params: Dict = None) -> Optional[Dict[str, Any]]:
+    """Gibt die zuletzt gespeicherte Antwort ohne Anfrage zurück (auch abgelaufen), sonst None."""
+    entry = peek_entry(url, params)
+    return entry.data if entry is not None else None
+
+def fetch_many(urls: List[str], timeout: int = API_TIMEOUT, ttl: Optional[float] = None) -> Dict[str, Optional[Dict[str, Any]]]:
+    """
+    Ruft mehrere URLs parallel ab (höchstens HTTP_MAX_CONCURRENCY gleichzeitig).
+
+    Args:
+        urls: Liste der URLs, Duplikate werden nur einmal abgerufen
+        timeout: Timeout in Sekunden pro Anfrage
+        ttl: Falls angegeben, läuft jeder Abruf über den persistenten Cache (siehe get_json_cached)
+
+    Returns:
+        Dictionary URL -> JSON-Antwort oder None bei Fehler
+    """
+    unique_urls = list(dict.fromkeys(url for url in urls if url))
+    if not unique_urls:
+        return {}
+
+    def fetch(url: str) -> Optional[Dict[str, Any]]:
+        if ttl is None:
+            return get_json(url, timeout)
+        return get_json_cached(url, ttl, timeout)
+
+    if len(unique_urls) == 1:
+        return {unique_urls[0]: fetch(unique_urls[0])}
+
+    executor = _get_executor()
+    futures = {url: executor.submit(fetch, url) for url in unique_urls}
+    return {url: future.result() for url, future in futures.items()}
\ No newline at end of file
@@ -0,0 +1,151 @@
+# Typisiertes Datenmodell für Calls und Watchlist-Einträge
+import time
+import uuid
+from dataclasses import dataclass, field, replace
+from datetime import datetime
+from typing import Any, Dict
+
+def parse_number(value: Any) -> float:
+    """
+    Wandelt Zahlen und Anzeige-Strings ('281K', '1.2M', '-6.19$', '0.4X', '10')
+    in einen float um. Ungültige Werte ('N/A', None) ergeben 0.0.
+    """
+    if isinstance(value, bool):
+        return 0.0
+    if isinstance(value, (int, float)):
+        return float(value)
+    if not value:
+        return 0.0
+    text = str(value).strip().upper().rstrip("X$%").replace(",", ".")
+    try:
+        if text.endswith("K"):
+            return float(text[:-1]) * 1_000
+        elif text.endswith("M"):
+            return float(text[:-1]) * 1_000_000
+        return float(text)
+    except ValueError:
+        return 0.0
+
+def pair_market_cap(pair_info: Dict[str, Any]) -> float:
+    """Liest die Marktkapitalisierung (roh, ungerundet) aus einem Dexscreener-Pair."""
+    return parse_number(pair_info.get("marketCap", pair_info.get("mcap", pair_info.get("fdv"))))
+
+def new_id() -> str:
+    """Erzeugt eine neue, eindeutige ID für einen Call bzw. Watchlist-Eintrag."""
+    return uuid.uuid4().hex
+
+def _parse_datum(datum: str) -> float:
+    """
+    Wandelt das alte Datumsfeld ('27.03.') in einen Zeitstempel um.
+    Das Jahr fehlt im alten Format - liegt der Tag in der Zukunft, war es das Vorjahr.
+    """
+    now = datetime.now()
+    try:
+        day, month = (int(part) for part in datum.strip(".").split(".")[:2])
+        created = datetime(now.year, month, day)
+        if created > now:
+            created = created.replace(year=now.year - 1)
+        return created.timestamp()
+    except (AttributeError, ValueError):
+        return time.time()
+
+@dataclass(slots=True)
+class Call:
+    """
+    Ein Call bzw. Watchlist-Eintrag mit Rohwerten.
+
+    Marktkapitalisierungen und Invest sind ungerundete floats, das Datum ein
+    Unix-Zeitstempel. X-Faktor und P/L werden daraus berechnet und erst bei
+    der Anzeige formatiert (siehe utils.formatters.call_row_values).
+
+    `id` ist eindeutig und bleibt über Speichern und Laden erhalten; darüber
+    werden Einträge im Repository, in den Backends und als Zeilen-ID in den
+    Tabellen identifiziert.
+    """
+    symbol: str
+    link: str
+    mcap_at_call: float
+    current_mcap: float
+    invest: float = 10.0
+    created_at: float = field(default_factory=time.time)
+    closed: bool = False
+    id: str = field(default_factory=new_id)
+
+    @property
+    def datum(self) -> str:
+        """Datum des Calls im Anzeigeformat 'TT.MM.'."""
+        return datetime.fromtimestamp(self.created_at).strftime("%d.%m.")
+
+    @property
+    def x_factor(self) -> float:
+        """Aktuelles MCAP / MCAP beim Call (0.0 bei ungültigen Werten)."""
+        if self.mcap_at_call > 0 and self.current_mcap > 0:
+            return self.current_mcap / self.mcap_at_call
+        return 0.0
+
+    @property
+    def pl_percent(self) -> float:
+        """Gewinn/Verlust in Prozent."""
+        x_factor = self.x_factor
+        return (x_factor - 1) * 100 if x_factor > 0 else 0.0
+
+    @property
+    def pl_dollar(self) -> float:
+        """Gewinn/Verlust in Dollar bezogen auf den Invest."""
+        x_factor = self.x_factor
+        return self.invest * x_factor - self.invest if x_factor > 0 else 0.0
+
+    def copy(self) -> "Call":
+        """Gibt eine unabhängige Kopie zurück."""
+        return replace(self)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Wandelt den Call in das Speicherformat um."""
+        return {
+            "ID": self.id,
+            "Datum": self.datum,
+            "Symbol": self.symbol,
+            "Link": self.link,
+            "MCAP_at_Call": self.mcap_at_call,
+            "Aktuelles_MCAP": self.current_mcap,
+            "Invest": self.invest,
+            "Erstellt": self.created_at,
+            "abgeschlossen": self.closed
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Call":
+        """
+        Erstellt einen Call aus dem Speicherformat.
+
+        Alte Einträge mit Anzeige-Strings ('281K', '10') und ohne Zeitstempel
+        werden weiterhin gelesen; abgeleitete Felder wie X_Factor oder
+        PL_Dollar werden ignoriert und neu berechnet. Einträge ohne ID
+        erhalten eine neue.
+        """
+        created_at = data.get("Erstellt")
+        if not isinstance(created_at, (int, float)):
+            created_at = _parse_datum(data.get("Datum", ""))
+        invest = parse_number(data.get("Invest", 10.0))
+        return cls(
+            symbol=data.get("Symbol", ""),
+            link=data.get("Link", ""),
+            mcap_at_call=parse_number(data.get("MCAP_at_Call")),
+            current_mcap=parse_number(data.get("Aktuelles_MCAP")),
+            invest=invest if invest > 0 else 10.0,
+            created_at=float(created_at),
+            closed=bool(data.get("abgeschlossen", False)),
+            id=str(data.get("ID") or new_id())
+        )
+
+# Sortierschlüssel je Tabellenspalte (Spaltennamen wie in den Call-/Watchlist-Tabellen)
+SORT_KEYS = {
+    "Datum": lambda call: call.created_at,
+    "Symbol": lambda call: call.symbol,
+    "MCAP_at_Call": lambda call: call.mcap_at_call,
+    "Aktuelles_MCAP": lambda call: call.current_mcap,
+    "X_Factor": lambda call: call.x_factor,
+    "PL_Percent": lambda call: call.pl_percent,
+    "PL_Dollar": lambda call: call.pl_dollar,
+    "Invest": lambda call: call.invest,
+}
\ No newline at end of file
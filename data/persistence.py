@@ -0,0 +1,156 @@
+# Verzögertes, zusammengefasstes Speichern (Write-Behind)
+import atexit
+import glob
+import json
+import os
+import tempfile
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, List
+
+from config import (BACKUP_FILE, SAVE_INTERVAL, BACKUP_DIR,
+                    BACKUP_KEEP, BACKUP_ROTATE_INTERVAL)
+
+def atomic_write_text(path: str, text: str) -> None:
+    """
+    Schreibt Text absturzsicher in eine Datei.
+
+    Der Inhalt wird zuerst in eine temporäre Datei im selben Verzeichnis
+    geschrieben, per fsync auf die Platte gebracht und dann mit os.replace
+    über die Zieldatei gelegt. Die Zieldatei ist damit immer entweder alt
+    oder neu, aber nie abgeschnitten.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{os.path.basename(path)}.", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, "w") as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+def write_json(path: str, data: Any) -> None:
+    """Schreibt Daten als JSON absturzsicher in eine Datei."""
+    atomic_write_text(path, json.dumps(data, indent=4))
+
+def list_backup_files() -> List[str]:
+    """Gibt alle Backup-Dateien zurück, das aktuelle Backup zuerst, dann die rotierten (neueste zuerst)."""
+    name, ext = os.path.splitext(os.path.basename(BACKUP_FILE))
+    rotated = sorted(glob.glob(os.path.join(BACKUP_DIR, f"{name}_*{ext}")), reverse=True)
+    return [BACKUP_FILE] + rotated
+
+def rotate_backup(backup_data: Dict[str, Any]) -> None:
+    """
+    Legt ein Backup mit Zeitstempel in BACKUP_DIR ab und löscht die ältesten,
+    sodass höchstens BACKUP_KEEP rotierte Backups erhalten bleiben.
+    """
+    os.makedirs(BACKUP_DIR, exist_ok=True)
+    name, ext = os.path.splitext(os.path.basename(BACKUP_FILE))
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    write_json(os.path.join(BACKUP_DIR, f"{name}_{timestamp}{ext}"), backup_data)
+
+    rotated = list_backup_files()[1:]
+    for old_path in rotated[BACKUP_KEEP:]:
+        try:
+            os.remove(old_path)
+        except OSError as e:
+            print(f"Altes Backup konnte nicht gelöscht werden: {e}")
+
+def build_backup(budget: float, calls: List[Dict[str, Any]], watchlist: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Erstellt die Backup-Struktur aus den übergebenen Daten."""
+    return {
+        "timestamp": datetime.now().isoformat(),
+        "budget": budget,
+        "calls": calls,
+        "watchlist": watchlist
+    }
+
+class PersistenceScheduler:
+    """
+    Fasst Änderungen am Repository zusammen und schreibt sie verzögert.
+
+    Jede Änderung markiert den betroffenen Bereich als "dirty". Spätestens
+    SAVE_INTERVAL Sekunden nach der ersten Änderung werden alle geänderten
+    Bereiche in einem Durchgang über das Backend des Repositorys geschrieben und danach genau ein Backup aus dem
+    Speicherstand erstellt - bei Backends, die nur Änderungen schreiben, nur alle BACKUP_ROTATE_INTERVAL
+    Sekunden. Beim Beenden wird ausstehendes sofort geschrieben.
+    """
+
+    def __init__(self, repository, interval: float = SAVE_INTERVAL):
+        self.repository = repository
+        self.interval = interval
+        self._dirty = set()
+        self._timer = None
+        self._last_rotation = 0.0
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+
+        for topic in ("calls", "watchlist", "budget"):
+            repository.events.subscribe(topic, lambda topic=topic: self.mark_dirty(topic))
+        atexit.register(self.flush)
+
+    def mark_dirty(self, topic: str) -> None:
+        """Merkt einen Bereich zum Speichern vor und plant den nächsten Flush."""
+        with self._lock:
+            self._dirty.add(topic)
+            if self._timer is None:
+                self._timer = threading.Timer(self.interval, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def has_pending(self) -> bool:
+        """True, wenn noch ungespeicherte Änderungen vorliegen."""
+        with self._lock:
+            return bool(self._dirty)
+
+    def flush(self) -> None:
+        """Schreibt alle ausstehenden Änderungen sofort."""
+        with self._flush_lock:
+            with self._lock:
+                dirty = self._dirty
+                self._dirty = set()
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+            if not dirty:
+                return
+
+            calls = [call.to_dict() for call in self.repository.get_calls()]
+            watchlist = [item.to_dict() for item in self.repository.get_watchlist()]
+            budget = self.repository.get_budget()
+
+            backend = self.repository.backend
+            try:
+                if "calls" in dirty:
+                    backend.save_calls(calls)
+                if "watchlist" in dirty:
+                    backend.save_watchlist(watchlist)
+                if "budget" in dirty:
+                    backend.save_budget(budget)
+            except Exception as e:
+                print(f"Speichern fehlgeschlagen: {e}")
+                # Beim nächsten Flush erneut versuchen
+                for topic in dirty:
+                    self.mark_dirty(topic)
+                return
+
+            # Backup direkt aus dem Speicherstand: je Flush, sofern das Backend es verlangt
+            # (siehe StorageBackend.backup_due), sonst nur zusammen mit dem rotierten Backup
+            rotate = time.time() - self._last_rotation >= BACKUP_ROTATE_INTERVAL
+            if not (backend.backup_due() or rotate):
+                return
+            try:
+                backup_data = build_backup(budget, calls, watchlist)
+                write_json(BACKUP_FILE, backup_data)
+                
+                # Zusätzlich in größeren Abständen ein rotiertes Backup mit Zeitstempel
+                if rotate:
+                    rotate_backup(backup_data)
+                    self._last_rotation = time.time()
+            except Exception as e:
+                print(f"Vollständiges Backup fehlgeschlagen: {e}")
\ No newline at end of file
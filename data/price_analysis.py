@@ -0,0 +1,320 @@
+# Vektorisierte Preishistorie-Analyse ("Second Bounce") für viele Tokens
+from itertools import chain
+from operator import itemgetter
+from typing import Any, Dict, List, Optional, Sequence
+
+try:
+    import numpy as np
+except ImportError:  # NumPy ist optional, ohne wird die Python-Version verwendet
+    np = None
+
+HAS_NUMPY = np is not None
+
+# Kriterien wie in data.birdeye_api.analyze_price_history
+MIN_CANDLES = 10
+DIP_MIN = 15
+DIP_MAX = 40
+RECOVERY_MIN = 10
+STABILIZATION_CANDLES = 5
+STABILIZATION_THRESHOLD = 0.05
+STABILIZATION_MIN = 3
+VOLUME_FACTOR = 1.2
+
+INSUFFICIENT_DATA = {
+    "dip_detected": False,
+    "bounce_detected": False,
+    "price_pattern": "insufficient_data",
+    "highest_price": 0,
+    "lowest_price": 0,
+    "current_price": 0,
+    "dip_percentage": 0,
+    "recovery_percentage": 0,
+    "stabilization_count": 0
+}
+
+def _row_sums(values, mask):
+    """Zeilensummen der maskierten Werte, von links aufsummiert (gleiche Rundung wie sum())."""
+    return np.cumsum(np.where(mask, values, 0.0), axis=1)[:, -1]
+
+def _volume_patterns(volumes, valid, highest_idx, lowest_idx) -> List[str]:
+    """Volumen vor dem Höchststand, während und nach dem Dip vergleichen (nur Zeilen mit Dip)."""
+    columns = np.arange(volumes.shape[1])[None, :]
+    after_high = valid & (columns >= highest_idx[:, None])
+    after_low = valid & (columns >= lowest_idx[:, None])
+    dip_mask = after_high & (columns <= lowest_idx[:, None])
+    volume_before = _row_sums(volumes, valid & (columns < highest_idx[:, None])) / np.maximum(1, highest_idx)
+    volume_dip = _row_sums(volumes, dip_mask) / np.maximum(1, dip_mask.sum(axis=1))
+    volume_after = _row_sums(volumes, after_low) / np.maximum(1, after_low.sum(axis=1))
+    return np.where(volume_dip > volume_before * VOLUME_FACTOR, "high_dip_volume",
+                    np.where(volume_after > volume_dip * VOLUME_FACTOR, "increasing_after_dip", "normal")).tolist()
+
+def _analyze_matrix(prices, volumes, lengths) -> List[Dict[str, Any]]:
+    """
+    Analysiert Kerzen zeilenweise (eine Zeile je Token, nach lengths beliebig aufgefüllt).
+
+    Args:
+        prices: float-Matrix (Tokens x Kerzen) der Schlusskurse
+        volumes: float-Matrix (Tokens x Kerzen) der Volumen
+        lengths: Anzahl gültiger Kerzen je Zeile (jeweils mindestens MIN_CANDLES)
+    """
+    rows, width = prices.shape
+    row_idx = np.arange(rows)
+    columns = np.arange(width)
+    valid = columns[None, :] < lengths[:, None]
+
+    # Höchststand (erstes Vorkommen) und aktueller Preis
+    highest_idx = np.argmax(np.where(valid, prices, -np.inf), axis=1)
+    highest_price = prices[row_idx, highest_idx]
+    current_price = prices[row_idx, lengths - 1]
+    has_dip_window = highest_idx < lengths - 3
+
+    # Tiefpunkt nach dem Höchststand
+    after_high = valid & (columns[None, :] >= highest_idx[:, None])
+    lowest_idx = np.argmin(np.where(after_high, prices, np.inf), axis=1)
+    lowest_after_high = prices[row_idx, lowest_idx]
+    lowest_overall = np.min(np.where(valid, prices, np.inf), axis=1)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        dip_percentage = np.where(highest_price > 0,
+                                  (highest_price - lowest_after_high) / highest_price * 100, 0.0)
+    dip_percentage = np.where(has_dip_window, dip_percentage, 0.0)
+    dip_detected = has_dip_window & (dip_percentage >= DIP_MIN) & (dip_percentage <= DIP_MAX)
+
+    # Erholung nach dem Tiefpunkt (mindestens 3 Kerzen danach)
+    has_recovery_window = has_dip_window & (lengths - lowest_idx >= 3)
+    after_low = valid & (columns[None, :] >= lowest_idx[:, None])
+    highest_after_dip = np.max(np.where(after_low, prices, -np.inf), axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        recovery_percentage = np.where(lowest_after_high > 0,
+                                       (highest_after_dip - lowest_after_high) / lowest_after_high * 100, 0.0)
+    recovery_percentage = np.where(has_recovery_window, recovery_percentage, 0.0)
+
+    # Stabilisierung: aufeinanderfolgende Kerzen nach dem Tiefpunkt mit < 5 % Änderung
+    # (nur das Fenster der STABILIZATION_CANDLES Kerzen nach dem Tiefpunkt wird betrachtet)
+    window = lowest_idx[:, None] + np.arange(STABILIZATION_CANDLES + 1)[None, :]
+    window_prices = prices[row_idx[:, None], np.minimum(window, width - 1)]
+    previous = window_prices[:, :-1]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        change = np.abs(window_prices[:, 1:] - previous) / previous
+    window_end = np.minimum(lowest_idx + STABILIZATION_CANDLES, lengths - 1)
+    window_stable = (previous > 0) & (change < STABILIZATION_THRESHOLD) & (window[:, 1:] <= window_end[:, None])
+    stabilization_count = np.cumprod(window_stable, axis=1).sum(axis=1)
+    stabilization_count = np.where(has_recovery_window, stabilization_count, 0)
+
+    bounce_detected = (has_recovery_window & (recovery_percentage >= RECOVERY_MIN)
+                       & (stabilization_count >= STABILIZATION_MIN))
+
+    # Volumenmuster nur für Zeilen mit Dip berechnen
+    volume_pattern = ["unknown"] * rows
+    dip_rows = np.flatnonzero(dip_detected)
+    if len(dip_rows):
+        patterns = _volume_patterns(volumes[dip_rows], valid[dip_rows], highest_idx[dip_rows], lowest_idx[dip_rows])
+        for row, pattern in zip(dip_rows.tolist(), patterns):
+            volume_pattern[row] = pattern
+
+    results = []
+    for dip, bounce, dip_window, recovery_window, highest, lowest, lowest_all, current, dip_pct, recovery, stabilization, pattern in zip(
+            dip_detected.tolist(), bounce_detected.tolist(), has_dip_window.tolist(), has_recovery_window.tolist(),
+            highest_price.tolist(), lowest_after_high.tolist(), lowest_overall.tolist(), current_price.tolist(),
+            dip_percentage.tolist(), recovery_percentage.tolist(), stabilization_count.tolist(), volume_pattern):
+        results.append({
+            "dip_detected": dip,
+            "bounce_detected": bounce,
+            "price_pattern": "second_bounce" if bounce else "dip" if dip else "other",
+            "highest_price": highest,
+            "lowest_price": lowest if dip_window else lowest_all,
+            "current_price": current,
+            "dip_percentage": dip_pct if dip_window else 0,
+            "recovery_percentage": recovery if recovery_window else 0,
+            "stabilization_count": int(stabilization),
+            "volume_pattern": pattern
+        })
+    return results
+
+def analyze_price_arrays(prices, volumes, lengths=None) -> List[Dict[str, Any]]:
+    """
+    Analysiert bereits als Arrays vorliegende Kerzen vieler Tokens (nach Zeit sortiert).
+
+    Args:
+        prices: 2D-Array (Tokens x Kerzen) der Schlusskurse
+        volumes: 2D-Array gleicher Form mit den Volumen
+        lengths: Anzahl gültiger Kerzen je Token (Standard: alle Spalten),
+                 der Rest der Zeile wird ignoriert
+
+    Returns:
+        Je Token das Ergebnis im Format von data.birdeye_api.analyze_price_history
+    """
+    prices = np.asarray(prices, dtype=float)
+    volumes = np.asarray(volumes, dtype=float)
+    rows, width = prices.shape
+    lengths = np.full(rows, width) if lengths is None else np.asarray(lengths)
+
+    results: List[Dict[str, Any]] = [None] * rows
+    enough = lengths >= MIN_CANDLES
+    for row in np.flatnonzero(~enough).tolist():
+        results[row] = dict(INSUFFICIENT_DATA)
+    rows_with_data = np.flatnonzero(enough)
+    if len(rows_with_data) == rows:
+        analyses = _analyze_matrix(prices, volumes, lengths)
+    elif len(rows_with_data):
+        analyses = _analyze_matrix(prices[rows_with_data], volumes[rows_with_data], lengths[rows_with_data])
+    else:
+        analyses = []
+    for row, analysis in zip(rows_with_data.tolist(), analyses):
+        results[row] = analysis
+    return results
+
+def _read_columns(rows: List[Dict[str, Any]], count: int, keys):
+    """Liest die Felder keys aller Zeilen in einem Durchgang als float-Arrays (KeyError bei fehlenden Feldern)."""
+    values = np.fromiter(chain.from_iterable(map(itemgetter(*keys), rows)), float, count=count * len(keys))
+    return tuple(values.reshape(count, len(keys)).T)
+
+def _candle_columns(candles: List[Dict[str, Any]], count: int, keys=("time", "close", "volume")):
+    """Liest Zeit, Schlusskurs und Volumen aller Kerzen als float-Arrays."""
+    try:
+        return _read_columns(candles, count, keys)
+    except (KeyError, TypeError, ValueError):
+        # Fehlende Felder oder Strings: langsamer Weg wie in der Python-Version
+        time_key, close_key, volume_key = keys
+        values = np.array([(candle.get(time_key, 0), float(candle.get(close_key, 0)), float(candle.get(volume_key, 0)))
+                           for candle in candles], dtype=float).reshape(-1, 3)
+        return values[:, 0], values[:, 1], values[:, 2]
+
+def _token_time_order(times, token, tokens: int):
+    """Stabile Sortierreihenfolge nach Token und Zeit."""
+    offset = times - times.min()
+    span = float(offset.max()) + 1
+    if span * tokens < 2 ** 53 and np.array_equal(offset, np.floor(offset)):
+        # Ganzzahlige Zeitstempel: ein kombinierter Schlüssel ist exakt und schneller als lexsort
+        return np.argsort(token * span + offset, kind="stable")
+    return np.lexsort((times, token))
+
+def _analyze_columns(times, closes, volumes, lengths) -> List[Dict[str, Any]]:
+    """Analysiert die aneinandergehängten Kerzen vieler Tokens (lengths: Kerzen je Token)."""
+    token = np.repeat(np.arange(len(lengths)), lengths)
+    starts = np.cumsum(lengths) - lengths
+
+    # Je Token nach Zeit sortieren (stabil), falls nicht schon sortiert
+    if len(times) > 1 and np.any((np.diff(times) < 0) & (token[1:] == token[:-1])):
+        order = _token_time_order(times, token, len(lengths))
+        closes, volumes = closes[order], volumes[order]
+    column = np.arange(len(closes)) - np.repeat(starts, lengths)
+
+    width = max(1, int(lengths.max()))
+    price_matrix = np.zeros((len(lengths), width))
+    volume_matrix = np.zeros_like(price_matrix)
+    price_matrix[token, column] = closes
+    volume_matrix[token, column] = volumes
+    return analyze_price_arrays(price_matrix, volume_matrix, lengths)
+
+def analyze_price_histories(candle_lists: Sequence[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    """
+    Analysiert die Preishistorien vieler Tokens auf einmal.
+
+    Liefert dieselben Ergebnisse wie data.birdeye_api.analyze_price_history
+    je Token. Mit NumPy werden alle Tokens gemeinsam als Matrix (Tokens x
+    Kerzen) ausgewertet, ohne NumPy einzeln mit der Python-Version.
+
+    Bei Kerzen als Dicts überwiegt das Auslesen der Felder, die Laufzeit
+    entspricht dann etwa der Python-Version. Deutlich schneller ist nur
+    analyze_price_arrays mit bereits als Arrays vorliegenden Kerzen.
+
+    Args:
+        candle_lists: Je Token die Liste der Kerzen ("time", "close", "volume")
+
+    Returns:
+        Liste der Analyseergebnisse in derselben Reihenfolge
+    """
+    if not HAS_NUMPY:
+        from data.birdeye_api import analyze_price_history
+        return [analyze_price_history(candles) for candles in candle_lists]
+    if not candle_lists:
+        return []
+
+    # Alle Kerzen in einem Durchgang auslesen
+    lengths = np.array([len(candles) for candles in candle_lists])
+    columns = _candle_columns(list(chain.from_iterable(candle_lists)), int(lengths.sum()))
+    return _analyze_columns(*columns, lengths)
+
+def _response_columns(price_history: Optional[Dict[str, Any]]):
+    """Zeit, Schlusskurs und Volumen einer Preishistorie-Antwort als Arrays (None ohne Kerzen)."""
+    if not isinstance(price_history, dict) or price_history.get("success") is False:
+        return None
+    data = price_history.get("data") or {}
+    if data.get("candles"):
+        candles = data["candles"]
+        return _candle_columns(candles, len(candles))
+    items = data.get("items") or []
+    if not items:
+        return None
+    try:
+        # /defi/ohlcv: Felder direkt lesen, ohne Kerzen-Dicts aufzubauen
+        return _read_columns(items, len(items), ("unixTime", "c", "v"))
+    except (KeyError, TypeError, ValueError):
+        from data.birdeye_api import extract_candles
+        candles = extract_candles(price_history)
+        return _candle_columns(candles, len(candles)) if candles else None
+
+def analyze_price_responses(price_histories: Sequence[Optional[Dict[str, Any]]]) -> List[Optional[Dict[str, Any]]]:
+    """
+    Analysiert die Antworten von get_token_price_history vieler Tokens auf einmal.
+
+    Entspricht analyze_price_history(extract_candles(antwort)) je Token, liest
+    die Kerzen aber direkt als Arrays.
+
+    Returns:
+        Je Token das Analyseergebnis oder None, wenn die Antwort keine Kerzen enthält
+    """
+    if not HAS_NUMPY:
+        from data.birdeye_api import analyze_price_history, extract_candles
+        candle_lists = [extract_candles(price_history) for price_history in price_histories]
+        return [analyze_price_history(candles) if candles else None for candles in candle_lists]
+
+    results: List[Optional[Dict[str, Any]]] = [None] * len(price_histories)
+    columns = [_response_columns(price_history) for price_history in price_histories]
+    with_candles = [index for index, column in enumerate(columns) if column is not None]
+    if not with_candles:
+        return results
+    times, closes, volumes = (np.concatenate([columns[index][field] for index in with_candles]) for field in range(3))
+    lengths = np.array([len(columns[index][0]) for index in with_candles])
+    for index, analysis in zip(with_candles, _analyze_columns(times, closes, volumes, lengths)):
+        results[index] = analysis
+    return results
+
+def analyze_price_history(candles: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Analysiert die Preishistorie eines Tokens (siehe analyze_price_histories)."""
+    return analyze_price_histories([candles])[0]
+
+# Laufzeitvergleich mit der Python-Version, wenn direkt ausgeführt (Abgleich: tests/test_price_analysis.py)
+if __name__ == "__main__":
+    import random
+    import time
+    from data.birdeye_api import analyze_price_history as reference
+
+    print(f"=== Preishistorie-Analyse (NumPy: {HAS_NUMPY}) ===")
+    rng = random.Random(42)
+
+    def random_candles(count):
+        price = rng.uniform(0.5, 2)
+        candles = []
+        for i in range(count):
+            price *= 1 + rng.choice([rng.uniform(-0.25, 0.3), rng.uniform(-0.04, 0.04), 0.0])
+            candles.append({"time": 1000 + i * 300, "close": price, "volume": rng.choice([0, rng.uniform(0, 1e5)])})
+        return candles
+
+    samples = [random_candles(rng.randint(0, 300)) for _ in range(3000)]
+    start = time.perf_counter()
+    [reference(candles) for candles in samples]
+    python_time = time.perf_counter() - start
+    start = time.perf_counter()
+    analyze_price_histories(samples)
+    batch_time = time.perf_counter() - start
+    print(f"Dicts: Python {python_time:.3f}s, Batch {batch_time:.3f}s")
+
+    if HAS_NUMPY:
+        # Liegen die Kerzen schon als Arrays vor, entfällt das Auslesen der Dicts
+        prices = np.array([[1 + (i * 7919 + t * 104729) % 997 / 997 for t in range(300)] for i in range(3000)])
+        volumes = np.ones_like(prices)
+        start = time.perf_counter()
+        analyze_price_arrays(prices, volumes)
+        print(f"Arrays ({prices.shape[0]} x {prices.shape[1]}): {time.perf_counter() - start:.3f}s")
\ No newline at end of file
@@ -0,0 +1,137 @@
+# Token-Bucket-Rate-Limiter für API-Anfragen
+import asyncio
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+class TokenBucket:
+    """
+    Token-Bucket: füllt sich mit `rate` Tokens pro Sekunde bis `capacity` auf.
+
+    Jede Anfrage verbraucht ein Token. Ist der Bucket voll, sind bis zu
+    `capacity` Anfragen direkt hintereinander möglich (Burst), danach im
+    Mittel `rate` pro Sekunde. Nicht thread-sicher - wird vom RateLimiter
+    unter dessen Lock verwendet.
+    """
+
+    def __init__(self, rate: float, capacity: int = 1):
+        self.rate = rate
+        self.capacity = max(1, capacity)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+
+    def _refill(self, now: float) -> None:
+        if now <= self.updated:
+            return  # gesperrt (siehe block)
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, now: float) -> float:
+        """Sekunden, bis ein Token verfügbar ist (0.0 = sofort)."""
+        self._refill(now)
+        wait = max(0.0, self.blocked_until - now)
+        if self.tokens < 1:
+            wait = max(wait, (1 - self.tokens) / self.rate)
+        return wait
+
+    def take(self, now: float) -> None:
+        """Verbraucht ein Token (vorher mit wait_time() prüfen)."""
+        self._refill(now)
+        self.tokens -= 1
+
+    def block(self, seconds: float, now: float) -> None:
+        """
+        Sperrt den Bucket (z.B. nach HTTP 429). Während der Sperre füllt er sich
+        nicht auf: danach ist eine Anfrage frei, weitere folgen mit `rate`.
+        """
+        self.blocked_until = max(self.blocked_until, now + seconds)
+        self.tokens = 1.0
+        self.updated = self.blocked_until
+
+class RateLimiter:
+    """
+    Verteilt Anfragen auf mehrere API-Keys und Endpunkte mit eigenen Budgets.
+
+    Jeder API-Key hat einen eigenen Token-Bucket (Rate und Burst des Tarifs),
+    zusätzlich kann jeder Endpunkt ein eigenes Budget haben. Eine Anfrage
+    bekommt den Key, der am schnellsten (bei Gleichstand mit den meisten
+    übrigen Tokens) wieder frei ist; mit mehreren Keys steigt der Durchsatz
+    entsprechend.
+
+    try_acquire() wartet nie, sondern gibt die Wartezeit zurück. acquire()
+    bzw. acquire_async() warten nur so lange wie nötig und halten dabei
+    keinen Lock, sodass andere Threads bzw. Tasks weiterlaufen.
+    """
+
+    def __init__(self, keys: List[str], rate: float, burst: int = 1,
+                 endpoint_limits: Optional[Dict[str, Tuple[float, int]]] = None):
+        self.keys = list(dict.fromkeys(key for key in keys if key))
+        self._key_buckets = {key: TokenBucket(rate, burst) for key in self.keys}
+        self._endpoint_buckets = {endpoint: TokenBucket(endpoint_rate, endpoint_burst)
+                                  for endpoint, (endpoint_rate, endpoint_burst) in (endpoint_limits or {}).items()}
+        self._lock = threading.Lock()
+
+    def try_acquire(self, endpoint: str = "") -> Tuple[Optional[str], float]:
+        """
+        Versucht, sofort ein Token für den Endpunkt zu bekommen.
+
+        Returns:
+            (API-Key, 0.0) bei Erfolg, sonst (None, Wartezeit in Sekunden)
+        """
+        if not self.keys:
+            return None, 0.0
+        with self._lock:
+            now = time.monotonic()
+            endpoint_bucket = self._endpoint_buckets.get(endpoint)
+            endpoint_wait = endpoint_bucket.wait_time(now) if endpoint_bucket else 0.0
+
+            key = min(self.keys, key=lambda k: (self._key_buckets[k].wait_time(now), -self._key_buckets[k].tokens))
+            wait = max(endpoint_wait, self._key_buckets[key].wait_time(now))
+            if wait > 0:
+                return None, wait
+
+            if endpoint_bucket:
+                endpoint_bucket.take(now)
+            self._key_buckets[key].take(now)
+            return key, 0.0
+
+    def acquire(self, endpoint: str = "", timeout: Optional[float] = None) -> Optional[str]:
+        """
+        Wartet, bis ein Token frei ist, und gibt den zu verwendenden API-Key zurück.
+
+        Returns:
+            API-Key oder None (keine Keys vorhanden bzw. Timeout)
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            key, wait = self.try_acquire(endpoint)
+            if key or not self.keys:
+                return key
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None
+                wait = min(wait, remaining)
+            time.sleep(wait)
+
+    async def acquire_async(self, endpoint: str = "", timeout: Optional[float] = None) -> Optional[str]:
+        """Wie acquire(), wartet aber mit asyncio.sleep statt den Thread zu blockieren."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            key, wait = self.try_acquire(endpoint)
+            if key or not self.keys:
+                return key
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None
+                wait = min(wait, remaining)
+            await asyncio.sleep(wait)
+
+    def penalize(self, key: str, seconds: float) -> None:
+        """Sperrt einen API-Key für einige Sekunden (z.B. nach HTTP 429 mit Retry-After)."""
+        with self._lock:
+            bucket = self._key_buckets.get(key)
+            if bucket:
+                bucket.block(seconds, time.monotonic())
\ No newline at end of file
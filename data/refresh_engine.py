@@ -0,0 +1,258 @@
+# Hintergrund-Aktualisierung für Calls und Watchlist
+import queue
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import data.api as api
+from config import API_TIMEOUT
+from data.models import Call, pair_market_cap
+
+def compute_updates(rows: List[Call], results: Dict[str, Optional[Dict[str, Any]]]) -> Dict[str, Tuple[str, float]]:
+    """
+    Ermittelt die neue Marktkapitalisierung aller Zeilen, für die Daten vorliegen.
+    X-Faktor und P/L ergeben sich daraus im Modell (siehe data.models.Call).
+
+    Returns:
+        Dictionary ID der Zeile -> (abgefragter Link, aktuelle Marktkapitalisierung ungerundet).
+        Der Link erlaubt beim Übernehmen zu prüfen, ob die Zeile zwischenzeitlich
+        auf einen anderen Token umgestellt wurde.
+    """
+    updates = {}
+    for row in rows:
+        data = results.get(row.link)
+        if data and data.get("pairs"):
+            market_cap = pair_market_cap(data["pairs"][0])
+            # Fehlt die Marktkapitalisierung in der Antwort, bleibt der letzte Wert stehen
+            if market_cap > 0:
+                updates[row.id] = (row.link, market_cap)
+    return updates
+
+def updated_market_cap(row: Call, updates: Dict[str, Tuple[str, float]]) -> Optional[float]:
+    """
+    Gibt die neue Marktkapitalisierung einer Zeile aus compute_updates zurück.
+    Wurde der Link der Zeile inzwischen geändert, gehört das Update nicht mehr zu ihr (None).
+    """
+    update = updates.get(row.id)
+    if update is None or update[0] != row.link:
+        return None
+    return update[1]
+
+def response_times(results: Dict[str, Optional[Dict[str, Any]]], now: float) -> Dict[str, float]:
+    """
+    Ermittelt je Link, von wann die Antwort stammt. Frische Treffer aus dem
+    HTTP-Cache sind bis zu DEXSCREENER_CACHE_TTL alt - dann zählt deren stored_at,
+    sonst `now`.
+
+    Returns:
+        Dictionary Link -> Unix-Zeitstempel der Antwort (nur Links mit Antwort)
+    """
+    times = {}
+    for link, data in results.items():
+        if data is None:
+            continue
+        cached = api.peek_dexscreener_data(link)
+        times[link] = cached[1] if cached is not None else now
+    return times
+
+def compute_observations(results: Dict[str, Optional[Dict[str, Any]]],
+                         times: Dict[str, float]) -> Dict[str, Tuple[float, Optional[float], float]]:
+    """
+    Liest Marktkapitalisierung und priceChange.m5 je Link für die adaptiven Intervalle
+    (siehe data.refresh_policy).
+
+    Args:
+        times: Zeitpunkt der Antwort je Link (siehe response_times)
+
+    Returns:
+        Dictionary Link -> (Marktkapitalisierung, priceChange.m5 in % oder None, Zeitpunkt der Antwort)
+    """
+    observations = {}
+    for link, data in results.items():
+        if not data or not data.get("pairs"):
+            continue
+        pair_info = data["pairs"][0]
+        change_m5 = (pair_info.get("priceChange") or {}).get("m5")
+        try:
+            change_m5 = float(change_m5) if change_m5 is not None else None
+        except (TypeError, ValueError):
+            change_m5 = None
+        observations[link] = (pair_market_cap(pair_info), change_m5, times[link])
+    return observations
+
+class RefreshEngine:
+    """
+    Führt Abruf und Auswertung der Marktdaten in einem Hintergrund-Thread aus.
+
+    Aufträge werden mit submit() eingereiht. Fertige Ergebnisse landen in einer
+    thread-sicheren Queue und werden vom Tk-Thread mit poll_results() abgeholt,
+    damit das Fenster während des Abrufs bedienbar bleibt.
+    """
+
+    def __init__(self, timeout: int = API_TIMEOUT):
+        self.timeout = timeout
+        self._jobs = queue.Queue()
+        self._results = queue.Queue()
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def start(self) -> None:
+        """Startet den Worker-Thread (mehrfacher Aufruf ist unschädlich)."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(target=self._run, name="RefreshEngine", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Beendet den Worker-Thread nach dem aktuellen Auftrag."""
+        if self._thread and self._thread.is_alive():
+            self._jobs.put(None)
+
+    def is_busy(self) -> bool:
+        """True, solange noch Aufträge offen sind oder ihre Ergebnisse nicht abgeholt wurden."""
+        with self._lock:
+            return self._pending > 0
+
+    def submit(self, calls: List[Call], watchlist: List[Call], links: Iterable[str] = ()) -> None:
+        """
+        Reiht einen Aktualisierungsauftrag ein.
+
+        Args:
+            calls: Kopien der aktiven Calls
+            watchlist: Kopien der Watchlist-Einträge
+            links: Weitere Links (z.B. der Main-Bot-Link), deren Antworten unverändert
+                   im Ergebnis unter "links" zurückgegeben werden
+        """
+        with self._lock:
+            self._pending += 1
+        self._jobs.put((calls, watchlist, list(links)))
+
+    def poll_results(self) -> List[Dict[str, Any]]:
+        """Holt alle fertigen Ergebnisse ab, ohne zu blockieren."""
+        results = []
+        while True:
+            try:
+                results.append(self._results.get_nowait())
+            except queue.Empty:
+                break
+        with self._lock:
+            self._pending -= len(results)
+        return results
+
+    def _run(self) -> None:
+        """Hauptschleife des Worker-Threads."""
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                return
+            calls, watchlist, extra_links = job
+            delivered = False
+            try:
+                start = time.perf_counter()
+                links = list(dict.fromkeys([row.link for row in calls + watchlist] + extra_links))
+                results = api.fetch_dexscreener_batch(links, self.timeout)
+                fetched_at = time.time()
+                times = response_times(results, fetched_at)
+                self._results.put({
+                    "calls": compute_updates(calls, results),
+                    "watchlist": compute_updates(watchlist, results),
+                    "links": {link: results.get(link) for link in extra_links},
+                    "observations": compute_observations(results, times),
+                    "fetched": links,
+                    "fetched_at": fetched_at,
+                    "response_times": times,
+                    "duration": time.perf_counter() - start,
+                })
+                delivered = True
+            except Exception as e:
+                print(f"Fehler bei der Hintergrund-Aktualisierung: {e}")
+            finally:
+                # Ein geliefertes Ergebnis bleibt offen, bis poll_results() es abholt
+                if not delivered:
+                    with self._lock:
+                        self._pending -= 1
+
+
+class LinkFetcher:
+    """
+    Ruft einzelne Dexscreener-Links (z.B. den Link im Main-Bot-Tab) im Hintergrund ab.
+
+    Wie bei der RefreshEngine werden Aufträge mit submit() eingereiht und die
+    Ergebnisse vom Tk-Thread mit poll_results() abgeholt. Ein Link, der noch
+    in Arbeit ist, wird nicht erneut eingereiht.
+    """
+
+    def __init__(self, timeout: int = API_TIMEOUT):
+        self.timeout = timeout
+        self._jobs = queue.Queue()
+        self._results = queue.Queue()
+        self._pending: Dict[str, bool] = {}
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def start(self) -> None:
+        """Startet den Worker-Thread (mehrfacher Aufruf ist unschädlich)."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(target=self._run, name="LinkFetcher", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Beendet den Worker-Thread nach dem aktuellen Auftrag."""
+        if self._thread and self._thread.is_alive():
+            self._jobs.put(None)
+
+    def is_pending(self, link: str) -> bool:
+        """True, solange der Link noch abgerufen wird."""
+        with self._lock:
+            return link in self._pending
+
+    def submit(self, link: str, interactive: bool = False) -> None:
+        """
+        Reiht den Abruf eines Links ein.
+
+        Args:
+            link: Dexscreener-Link oder Token-Adresse
+            interactive: Vom Benutzer ausgelöst (Fehler werden dann angezeigt)
+        """
+        with self._lock:
+            if link in self._pending:
+                self._pending[link] = self._pending[link] or interactive
+                return
+            self._pending[link] = interactive
+        self._jobs.put(link)
+
+    def poll_results(self) -> List[Dict[str, Any]]:
+        """Holt alle fertigen Ergebnisse ab, ohne zu blockieren."""
+        results = []
+        while True:
+            try:
+                results.append(self._results.get_nowait())
+            except queue.Empty:
+                return results
+
+    def _run(self) -> None:
+        """Hauptschleife des Worker-Threads."""
+        while True:
+            link = self._jobs.get()
+            if link is None:
+                return
+            data = None
+            fetched_at = time.time()
+            try:
+                data = api.fetch_dexscreener_data(link, self.timeout)
+                # Ein frischer Treffer kommt aus dem Cache - dann zählt das Alter der gespeicherten
+                # Antwort (bei einem Fehler ist data None und es wird nichts angezeigt)
+                fetched_at = response_times({link: data}, fetched_at).get(link, fetched_at)
+            except Exception as e:
+                print(f"Fehler beim Abruf von {link}: {e}")
+            finally:
+                with self._lock:
+                    interactive = self._pending.pop(link, False)
+                self._results.put({
+                    "link": link,
+                    "data": data,
+                    "fetched_at": fetched_at,
+                    "interactive": interactive,
+                })
\ No newline at end of file
@@ -0,0 +1,90 @@
+# Adaptive Aktualisierungsintervalle je Link
+import math
+import time
+from typing import Dict, Iterable, Optional, Tuple
+
+from config import (UPDATE_INTERVAL, ADAPTIVE_MIN_INTERVAL, ADAPTIVE_MAX_INTERVAL,
+                    ADAPTIVE_HOT_CHANGE, ADAPTIVE_RECENT_AGE)
+
+# Gewicht einer neuen Beobachtung im gleitenden Mittel der MCAP-Änderung
+SMOOTHING = 0.5
+
+class AdaptiveRefreshPolicy:
+    """
+    Bestimmt, wie oft ein Link abgerufen wird.
+
+    Maß ist die Bewegung des Tokens in Prozent pro 5 Minuten: der größere Wert
+    aus priceChange.m5 der letzten Antwort und der beobachteten Änderung der
+    Marktkapitalisierung zwischen zwei Abrufen (gleitend gemittelt). Ab
+    ADAPTIVE_HOT_CHANGE Prozent gilt das kürzeste Intervall, ohne Bewegung das
+    längste, dazwischen wird logarithmisch interpoliert. Junge Calls (jünger
+    als ADAPTIVE_RECENT_AGE) werden mindestens im Standardintervall
+    aktualisiert; Links ohne Beobachtung ebenfalls.
+    """
+
+    def __init__(self, min_interval: float = ADAPTIVE_MIN_INTERVAL, max_interval: float = ADAPTIVE_MAX_INTERVAL,
+                 hot_change: float = ADAPTIVE_HOT_CHANGE, recent_age: float = ADAPTIVE_RECENT_AGE,
+                 default_interval: float = UPDATE_INTERVAL / 1000):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.hot_change = hot_change
+        self.recent_age = recent_age
+        self.default_interval = default_interval
+        self._last: Dict[str, Tuple[float, float]] = {}  # Link -> (Zeitpunkt, Marktkapitalisierung)
+        self._drift: Dict[str, float] = {}               # Link -> beobachtete Änderung in % pro 5 min
+        self._m5: Dict[str, float] = {}                  # Link -> letzte priceChange.m5 in %
+
+    def observe(self, link: str, market_cap: float, change_m5: Optional[float] = None,
+                now: Optional[float] = None) -> None:
+        """
+        Nimmt eine neue Antwort für den Link auf (Marktkapitalisierung und priceChange.m5).
+
+        Args:
+            now: Zeitpunkt der Antwort - bei Treffern aus dem HTTP-Cache deren stored_at.
+                 Eine Antwort, die nicht neuer als die zuletzt beobachtete ist, zählt
+                 nicht als Stichprobe (sie würde eine Bewegung von 0 vortäuschen).
+        """
+        now = time.time() if now is None else now
+        if change_m5 is not None:
+            self._m5[link] = abs(change_m5)
+        if market_cap <= 0:
+            return
+        last = self._last.get(link)
+        if last is not None and now <= last[0]:
+            return
+        self._last[link] = (now, market_cap)
+        if last is None or last[1] <= 0:
+            return
+        drift = abs(market_cap - last[1]) / last[1] * 100 * 300 / (now - last[0])
+        previous = self._drift.get(link)
+        self._drift[link] = drift if previous is None else SMOOTHING * drift + (1 - SMOOTHING) * previous
+
+    def activity(self, link: str) -> Optional[float]:
+        """Bewegung des Tokens in % pro 5 Minuten (None ohne Beobachtung)."""
+        values = [value for value in (self._m5.get(link), self._drift.get(link)) if value is not None]
+        return max(values) if values else None
+
+    def interval(self, link: str, created_at: Optional[float] = None, now: Optional[float] = None) -> float:
+        """
+        Gibt das Abrufintervall des Links in Sekunden zurück.
+
+        Args:
+            created_at: Erstellungszeitpunkt des Calls (Unix-Zeitstempel), falls bekannt
+        """
+        activity = self.activity(link)
+        if activity is None:
+            return self.default_interval
+        # 0 % -> max_interval, ab hot_change -> min_interval (Wurzel, damit kleine Bewegungen schon zählen)
+        share = min(1.0, math.sqrt(activity / self.hot_change)) if self.hot_change > 0 else 1.0
+        interval = self.max_interval * (self.min_interval / self.max_interval) ** share
+        now = time.time() if now is None else now
+        if created_at is not None and now - created_at < self.recent_age:
+            interval = min(interval, self.default_interval)
+        return interval
+
+    def retain(self, links: Iterable[str]) -> None:
+        """Verwirft die Beobachtungen aller anderen Links."""
+        keep = set(links)
+        for state in (self._last, self._drift, self._m5):
+            for link in [link for link in state if link not in keep]:
+                del state[link]
\ No newline at end of file
@@ -0,0 +1,355 @@
+# In-Memory-Repository für Calls, Watchlist und Kontostand
+import threading
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from data.aggregates import CallAggregates
+from data.backends import StorageBackend, create_backend
+from data.models import Call, new_id
+from utils.events import EventBus
+
+class CallIndex:
+    """
+    Calls bzw. Watchlist-Einträge mit Hash-Indizes nach ID, Link und Symbol.
+
+    Die Einträge liegen in Einfügereihenfolge unter ihrer ID. Link und Symbol
+    verweisen jeweils auf die IDs aller passenden Einträge, sodass Zugriffe
+    über ID, Link oder Symbol ohne Durchlauf aller Einträge auskommen.
+    """
+
+    def __init__(self, items: Iterable[Call] = ()):
+        self.by_id: Dict[str, Call] = {}
+        # Dictionaries statt Sets, damit die Reihenfolge erhalten bleibt
+        self.by_link: Dict[str, Dict[str, None]] = {}
+        self.by_symbol: Dict[str, Dict[str, None]] = {}
+        for item in items:
+            self.add(item)
+
+    def __len__(self) -> int:
+        return len(self.by_id)
+
+    def __iter__(self) -> Iterator[Call]:
+        return iter(self.by_id.values())
+
+    def __contains__(self, item_id: str) -> bool:
+        return item_id in self.by_id
+
+    def get(self, item_id: str) -> Optional[Call]:
+        return self.by_id.get(item_id)
+
+    def add(self, item: Call) -> None:
+        """Hängt einen Eintrag an (die ID muss neu sein)."""
+        self.by_id[item.id] = item
+        self.by_link.setdefault(item.link, {})[item.id] = None
+        self.by_symbol.setdefault(item.symbol, {})[item.id] = None
+
+    def replace(self, item: Call) -> Call:
+        """Ersetzt den Eintrag mit derselben ID an seiner Position und gibt den alten zurück."""
+        old = self.by_id[item.id]
+        if old.link != item.link:
+            self._unlink(self.by_link, old.link, old.id)
+            self.by_link.setdefault(item.link, {})[item.id] = None
+        if old.symbol != item.symbol:
+            self._unlink(self.by_symbol, old.symbol, old.id)
+            self.by_symbol.setdefault(item.symbol, {})[item.id] = None
+        self.by_id[item.id] = item
+        return old
+
+    def remove(self, item_id: str) -> Optional[Call]:
+        """Entfernt einen Eintrag und gibt ihn zurück (None, falls nicht vorhanden)."""
+        item = self.by_id.pop(item_id, None)
+        if item is not None:
+            self._unlink(self.by_link, item.link, item_id)
+            self._unlink(self.by_symbol, item.symbol, item_id)
+        return item
+
+    def find(self, link: Optional[str] = None, symbol: Optional[str] = None) -> List[Call]:
+        """Gibt alle Einträge mit dem Link und/oder Symbol zurück."""
+        if link is not None:
+            ids = self.by_link.get(link, {})
+            items = [self.by_id[item_id] for item_id in ids]
+            return [item for item in items if symbol is None or item.symbol == symbol]
+        if symbol is not None:
+            return [self.by_id[item_id] for item_id in self.by_symbol.get(symbol, {})]
+        return list(self.by_id.values())
+
+    @staticmethod
+    def _unlink(index: Dict[str, Dict[str, None]], key: str, item_id: str) -> None:
+        ids = index.get(key)
+        if ids is not None:
+            ids.pop(item_id, None)
+            if not ids:
+                del index[key]
+
+class DataRepository:
+    """
+    Hält Calls, Watchlist und Kontostand prozessweit im Speicher.
+
+    Die Daten werden beim ersten Zugriff einmalig aus dem Speicher-Backend
+    (siehe data.backends) eingelesen, danach sind
+    Lesezugriffe reine Speicherzugriffe. Jede Änderung wird über den Event-Bus
+    unter dem Thema "calls", "watchlist" bzw. "budget" gemeldet.
+
+    Calls und Watchlist-Einträge werden als Call-Objekte in einem CallIndex
+    gehalten und sind über ihre ID, ihren Link oder ihr Symbol direkt
+    erreichbar. Lesende Methoden geben Kopien zurück, damit Änderungen erst
+    mit dem passenden set_*/update_*-Aufruf wirksam werden. Die Kennzahlen
+    der Gewinn-Anzeige werden bei jeder Änderung der Calls in `aggregates`
+    nachgeführt.
+    """
+
+    def __init__(self, backend: Optional[StorageBackend] = None):
+        self.backend = backend or create_backend()
+        self.events = EventBus()
+        self._lock = threading.RLock()
+        self._calls: Optional[CallIndex] = None
+        self._watchlist: Optional[CallIndex] = None
+        self._budget: Optional[float] = None
+        self.aggregates = CallAggregates()
+
+    def _ensure_loaded(self) -> None:
+        """Liest die Daten beim ersten Zugriff aus dem Backend ein."""
+        changed = set()
+        if self._calls is None:
+            self._calls = self._load_index(self.backend.load_calls(), "calls", changed)
+            self.aggregates.rebuild(self._calls)
+        if self._watchlist is None:
+            self._watchlist = self._load_index(self.backend.load_watchlist(), "watchlist", changed)
+        if self._budget is None:
+            self._budget = self.backend.load_budget()
+        
+        # Wiederhergestellte Bereiche melden, damit die beschädigte Datei neu geschrieben wird
+        # (ebenso Bereiche, deren Einträge gerade erst eine ID erhalten haben)
+        changed.update(self.backend.recovered)
+        self.backend.recovered.clear()
+        for topic in changed:
+            self.events.publish(topic)
+
+    @staticmethod
+    def _load_index(rows: List[Dict[str, Any]], topic: str, changed: set) -> CallIndex:
+        """Baut den Index aus gespeicherten Zeilen; fehlende oder doppelte IDs werden neu vergeben."""
+        index = CallIndex()
+        for data in rows:
+            item = Call.from_dict(data)
+            if not data.get("ID") or item.id in index:
+                item.id = new_id()
+                changed.add(topic)
+            index.add(item)
+        return index
+
+    @staticmethod
+    def _build_index(items: Iterable[Call]) -> CallIndex:
+        """Baut einen Index aus Kopien der Einträge; doppelte IDs werden neu vergeben."""
+        index = CallIndex()
+        for item in items:
+            item = item.copy()
+            if item.id in index:
+                item.id = new_id()
+            index.add(item)
+        return index
+
+    def reload(self) -> None:
+        """Verwirft den Speicherstand und liest beim nächsten Zugriff neu ein."""
+        with self._lock:
+            self._calls = None
+            self._watchlist = None
+            self._budget = None
+
+    def get_calls(self) -> List[Call]:
+        """Gibt Kopien aller Calls zurück."""
+        with self._lock:
+            self._ensure_loaded()
+            return [call.copy() for call in self._calls]
+
+    def get_call(self, call_id: str) -> Optional[Call]:
+        """Gibt eine Kopie des Calls mit der ID zurück (None, falls nicht vorhanden)."""
+        with self._lock:
+            self._ensure_loaded()
+            call = self._calls.get(call_id)
+            return call.copy() if call is not None else None
+
+    def find_calls(self, link: Optional[str] = None, symbol: Optional[str] = None) -> List[Call]:
+        """Gibt Kopien aller Calls mit dem Link und/oder Symbol zurück."""
+        with self._lock:
+            self._ensure_loaded()
+            return [call.copy() for call in self._calls.find(link, symbol)]
+
+    def set_calls(self, calls: List[Call]) -> None:
+        """Ersetzt alle Calls und meldet die Änderung (ohne Änderung wird nichts gemeldet)."""
+        with self._lock:
+            self._ensure_loaded()
+            new_calls = self._build_index(calls)
+            if list(new_calls) == list(self._calls):
+                return
+            self._update_aggregates(self._calls, new_calls)
+            self._calls = new_calls
+        self.events.publish("calls")
+
+    def add_call(self, call: Call) -> None:
+        """Hängt einen neuen Call an und meldet die Änderung."""
+        with self._lock:
+            self._ensure_loaded()
+            new_call = call.copy()
+            if new_call.id in self._calls:
+                new_call.id = new_id()
+            self._calls.add(new_call)
+            self.aggregates.add(new_call)
+        self.events.publish("calls")
+
+    def update_calls(self, calls: Iterable[Call]) -> int:
+        """
+        Übernimmt geänderte Calls anhand ihrer ID.
+
+        Returns:
+            Anzahl der tatsächlich geänderten Calls (nur dann wird gemeldet)
+        """
+        updated = 0
+        with self._lock:
+            self._ensure_loaded()
+            for call in calls:
+                old = self._calls.get(call.id)
+                if old is None or old == call:
+                    continue
+                new_call = call.copy()
+                self._calls.replace(new_call)
+                self.aggregates.replace(old, new_call)
+                updated += 1
+        if updated:
+            self.events.publish("calls")
+        return updated
+
+    def remove_calls(self, call_ids: Iterable[str]) -> int:
+        """
+        Entfernt die Calls mit den IDs.
+
+        Returns:
+            Anzahl der entfernten Calls (nur dann wird gemeldet)
+        """
+        removed = 0
+        with self._lock:
+            self._ensure_loaded()
+            for call_id in call_ids:
+                call = self._calls.remove(call_id)
+                if call is not None:
+                    self.aggregates.remove(call)
+                    removed += 1
+        if removed:
+            self.events.publish("calls")
+        return removed
+
+    def get_aggregates(self) -> CallAggregates:
+        """Gibt die laufend gepflegten Kennzahlen der Calls zurück."""
+        with self._lock:
+            self._ensure_loaded()
+            return self.aggregates
+
+    def _update_aggregates(self, old_calls: CallIndex, new_calls: CallIndex) -> None:
+        """Rechnet nur die neuen, geänderten und entfernten Calls in die Kennzahlen ein."""
+        for call in new_calls:
+            old = old_calls.get(call.id)
+            if old is None:
+                self.aggregates.add(call)
+            elif old != call:
+                self.aggregates.replace(old, call)
+        for call in old_calls:
+            if call.id not in new_calls:
+                self.aggregates.remove(call)
+
+    def get_watchlist(self) -> List[Call]:
+        """Gibt Kopien aller Watchlist-Einträge zurück."""
+        with self._lock:
+            self._ensure_loaded()
+            return [item.copy() for item in self._watchlist]
+
+    def get_watchlist_item(self, item_id: str) -> Optional[Call]:
+        """Gibt eine Kopie des Watchlist-Eintrags mit der ID zurück (None, falls nicht vorhanden)."""
+        with self._lock:
+            self._ensure_loaded()
+            item = self._watchlist.get(item_id)
+            return item.copy() if item is not None else None
+
+    def find_watchlist(self, link: Optional[str] = None, symbol: Optional[str] = None) -> List[Call]:
+        """Gibt Kopien aller Watchlist-Einträge mit dem Link und/oder Symbol zurück."""
+        with self._lock:
+            self._ensure_loaded()
+            return [item.copy() for item in self._watchlist.find(link, symbol)]
+
+    def set_watchlist(self, watchlist: List[Call]) -> None:
+        """Ersetzt die Watchlist und meldet die Änderung (ohne Änderung wird nichts gemeldet)."""
+        with self._lock:
+            self._ensure_loaded()
+            new_watchlist = self._build_index(watchlist)
+            if list(new_watchlist) == list(self._watchlist):
+                return
+            self._watchlist = new_watchlist
+        self.events.publish("watchlist")
+
+    def add_watchlist_item(self, item: Call) -> None:
+        """Hängt einen neuen Watchlist-Eintrag an und meldet die Änderung."""
+        with self._lock:
+            self._ensure_loaded()
+            new_item = item.copy()
+            if new_item.id in self._watchlist:
+                new_item.id = new_id()
+            self._watchlist.add(new_item)
+        self.events.publish("watchlist")
+
+    def update_watchlist(self, items: Iterable[Call]) -> int:
+        """
+        Übernimmt geänderte Watchlist-Einträge anhand ihrer ID.
+
+        Returns:
+            Anzahl der tatsächlich geänderten Einträge (nur dann wird gemeldet)
+        """
+        updated = 0
+        with self._lock:
+            self._ensure_loaded()
+            for item in items:
+                old = self._watchlist.get(item.id)
+                if old is None or old == item:
+                    continue
+                self._watchlist.replace(item.copy())
+                updated += 1
+        if updated:
+            self.events.publish("watchlist")
+        return updated
+
+    def remove_watchlist_items(self, item_ids: Iterable[str]) -> int:
+        """
+        Entfernt die Watchlist-Einträge mit den IDs.
+
+        Returns:
+            Anzahl der entfernten Einträge (nur dann wird gemeldet)
+        """
+        removed = 0
+        with self._lock:
+            self._ensure_loaded()
+            for item_id in item_ids:
+                if self._watchlist.remove(item_id) is not None:
+                    removed += 1
+        if removed:
+            self.events.publish("watchlist")
+        return removed
+
+    def get_budget(self) -> float:
+        """Gibt den Kontostand zurück."""
+        with self._lock:
+            self._ensure_loaded()
+            return self._budget
+
+    def set_budget(self, budget: float) -> bool:
+        """
+        Setzt den Kontostand.
+
+        Returns:
+            True, wenn sich der Wert geändert hat (nur dann wird gemeldet)
+        """
+        with self._lock:
+            self._ensure_loaded()
+            if self._budget == budget:
+                return False
+            self._budget = budget
+        self.events.publish("budget")
+        return True
+
+# Prozessweite Instanz
+repository = DataRepository()
\ No newline at end of file
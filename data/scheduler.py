@@ -0,0 +1,214 @@
+# Zentraler Scheduler für alle wiederkehrenden Aufgaben und Abrufe
+import math
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+@dataclass
+class TaskStats:
+    """Laufzeitstatistik einer Aufgabe (Sekunden)."""
+    runs: int = 0
+    total: float = 0.0
+    last: float = 0.0
+    max: float = 0.0
+
+    @property
+    def average(self) -> float:
+        return self.total / self.runs if self.runs else 0.0
+
+    def record(self, duration: float) -> None:
+        self.runs += 1
+        self.total += duration
+        self.last = duration
+        self.max = max(self.max, duration)
+
+@dataclass
+class ScheduledTask:
+    """Eine wiederkehrende Aufgabe des Schedulers."""
+    name: str
+    interval: float
+    callback: Callable[[], Any]
+    next_due: float = 0.0
+    enabled: bool = True
+    stats: TaskStats = field(default_factory=TaskStats)
+
+class TokenDemand:
+    """
+    Hält fest, welcher Verbraucher (z.B. "calls", "watchlist", "main") welche
+    Links in welchem Intervall aktualisiert haben möchte.
+
+    Jeder Link wird nur einmal geführt: Sein Intervall ist das kürzeste aller
+    Verbraucher, und ein Abruf zählt für alle. due() liefert die Links, die
+    jetzt abgerufen werden müssen - zusammen mit denen, die innerhalb des
+    Ausrichtungsfensters fällig würden, damit sie im selben Abruf mitlaufen.
+    """
+
+    def __init__(self):
+        self._wanted: Dict[str, Dict[str, float]] = {}  # Verbraucher -> Link -> Intervall
+        self._intervals: Dict[str, float] = {}          # Link -> kürzestes Intervall
+        self._last_fetch: Dict[str, float] = {}         # Link -> Zeitpunkt des letzten Abrufs
+        self._lock = threading.Lock()
+
+    def set(self, consumer: str, intervals: Dict[str, float]) -> None:
+        """Ersetzt die Links eines Verbrauchers (Link -> Intervall in Sekunden)."""
+        with self._lock:
+            if intervals:
+                self._wanted[consumer] = dict(intervals)
+            else:
+                self._wanted.pop(consumer, None)
+            self._rebuild()
+
+    def clear(self, consumer: str) -> None:
+        """Entfernt alle Links eines Verbrauchers."""
+        self.set(consumer, {})
+
+    def _rebuild(self) -> None:
+        intervals: Dict[str, float] = {}
+        for wanted in self._wanted.values():
+            for link, interval in wanted.items():
+                if link:
+                    intervals[link] = min(interval, intervals.get(link, interval))
+        self._intervals = intervals
+        # Zeitstempel nicht mehr gewünschter Links verwerfen
+        self._last_fetch = {link: ts for link, ts in self._last_fetch.items() if link in intervals}
+
+    def links(self) -> List[str]:
+        """Alle gewünschten Links."""
+        with self._lock:
+            return list(self._intervals)
+
+    def interval(self, link: str) -> Optional[float]:
+        """Kürzestes gewünschtes Intervall des Links (None, falls nicht gewünscht)."""
+        with self._lock:
+            return self._intervals.get(link)
+
+    def consumers(self, link: str) -> List[str]:
+        """Verbraucher, die den Link wünschen."""
+        with self._lock:
+            return [consumer for consumer, wanted in self._wanted.items() if link in wanted]
+
+    def due(self, now: Optional[float] = None, align_window: float = 0.0) -> List[str]:
+        """
+        Gibt die fälligen Links zurück.
+
+        Args:
+            now: Zeitpunkt (time.monotonic()), Standard: jetzt
+            align_window: Ist mindestens ein Link fällig, werden Links, die innerhalb
+                          dieses Fensters (Sekunden) fällig würden, mit zurückgegeben
+        """
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            remaining = {
+                link: self._last_fetch.get(link, -math.inf) + interval - now
+                for link, interval in self._intervals.items()
+            }
+        if not any(left <= 0 for left in remaining.values()):
+            return []
+        return [link for link, left in remaining.items() if left <= align_window]
+
+    def mark_fetched(self, links: Iterable[str], now: Optional[float] = None) -> None:
+        """Merkt den Abruf der Links (gilt für alle Verbraucher)."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            for link in links:
+                if link in self._intervals:
+                    self._last_fetch[link] = now
+
+class Scheduler:
+    """
+    Führt alle wiederkehrenden Aufgaben über einen gemeinsamen Takt aus.
+
+    Statt mehrerer unabhängiger Timer ruft der Besitzer (im Tk-Thread über
+    root.after) regelmäßig run_due() auf. Fälligkeiten werden auf Vielfache
+    des Takts gerundet, sodass Aufgaben mit passenden Intervallen im selben
+    Takt laufen. Für jede Aufgabe wird die Laufzeit gemessen (siehe stats());
+    Arbeit, die außerhalb des Takts läuft (z.B. der Abruf im Hintergrund),
+    kann mit record() eingetragen werden.
+
+    `demand` bündelt die gewünschten Links aller Ansichten (siehe TokenDemand).
+    """
+
+    def __init__(self, tick: float):
+        self.tick = tick
+        self.tasks: Dict[str, ScheduledTask] = {}
+        self.demand = TokenDemand()
+        self._external: Dict[str, TaskStats] = {}
+
+    def _align(self, due: float) -> float:
+        """Rundet einen Zeitpunkt auf das nächste Vielfache des Takts auf."""
+        return math.ceil(due / self.tick - 1e-9) * self.tick
+
+    def add_task(self, name: str, interval: float, callback: Callable[[], Any],
+                 delay: Optional[float] = None) -> ScheduledTask:
+        """
+        Registriert eine wiederkehrende Aufgabe.
+
+        Args:
+            interval: Sekunden zwischen zwei Ausführungen
+            delay: Sekunden bis zur ersten Ausführung (Standard: ein Intervall, 0 = im nächsten Takt)
+        """
+        delay = interval if delay is None else delay
+        task = ScheduledTask(name, interval, callback, self._align(time.monotonic() + delay))
+        self.tasks[name] = task
+        return task
+
+    def remove_task(self, name: str) -> None:
+        self.tasks.pop(name, None)
+
+    def pause(self, name: str) -> None:
+        """Setzt eine Aufgabe aus, bis resume() aufgerufen wird."""
+        if name in self.tasks:
+            self.tasks[name].enabled = False
+
+    def resume(self, name: str, immediate: bool = False) -> None:
+        """Nimmt eine Aufgabe wieder auf (mit immediate=True schon im nächsten Takt)."""
+        task = self.tasks.get(name)
+        if task is None:
+            return
+        if immediate or not task.enabled:
+            delay = 0.0 if immediate else task.interval
+            task.next_due = self._align(time.monotonic() + delay)
+        task.enabled = True
+
+    def trigger(self, name: str) -> None:
+        """Führt eine Aufgabe im nächsten Takt aus (das Intervall beginnt danach neu)."""
+        self.resume(name, immediate=True)
+
+    def run_due(self, now: Optional[float] = None) -> List[str]:
+        """
+        Führt alle fälligen Aufgaben aus und gibt ihre Namen zurück.
+        Fehler einer Aufgabe werden ausgegeben und unterbrechen die übrigen nicht.
+        """
+        now = time.monotonic() if now is None else now
+        ran = []
+        for task in list(self.tasks.values()):
+            if not task.enabled or task.next_due > now:
+                continue
+            start = time.perf_counter()
+            try:
+                task.callback()
+            except Exception as e:
+                print(f"Fehler in der Aufgabe '{task.name}': {e}")
+            task.stats.record(time.perf_counter() - start)
+            # Verpasste Takte nicht nachholen: Liegt die nächste Fälligkeit schon zurück,
+            # beginnt das Intervall jetzt neu (sonst liefe die Aufgabe im nächsten Takt gleich wieder)
+            next_due = task.next_due + task.interval
+            if next_due <= now:
+                next_due = now + task.interval
+            task.next_due = self._align(next_due)
+            ran.append(task.name)
+        return ran
+
+    def record(self, name: str, duration: float) -> None:
+        """Trägt die Laufzeit von Arbeit ein, die außerhalb des Takts lief."""
+        self._external.setdefault(name, TaskStats()).record(duration)
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Laufzeitstatistik je Aufgabe: Aufrufe, Summe, letzte, mittlere und längste Laufzeit (Sekunden)."""
+        all_stats = {name: task.stats for name, task in self.tasks.items()}
+        all_stats.update(self._external)
+        return {
+            name: {"runs": s.runs, "total": s.total, "last": s.last, "average": s.average, "max": s.max}
+            for name, s in all_stats.items()
+        }
\ No newline at end of file
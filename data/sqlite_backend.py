@@ -0,0 +1,241 @@
+# SQLite-Backend (WAL-Modus) mit zeilenweisen Änderungen
+import json
+import os
+import sqlite3
+import threading
+from bisect import bisect_left
+from typing import Any, Dict, List, Optional, Tuple
+
+from config import SQLITE_FILE, DEFAULT_BUDGET, CALLS_FILE, WATCHLIST_FILE, BUDGET_FILE, BACKUP_FILE
+from data.backends import StorageBackend, JsonBackend, row_keys, _read_from_backups
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS calls (
+    key TEXT PRIMARY KEY,
+    position REAL NOT NULL,
+    link TEXT,
+    symbol TEXT,
+    closed INTEGER NOT NULL DEFAULT 0,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_calls_position ON calls(position);
+CREATE INDEX IF NOT EXISTS idx_calls_link ON calls(link);
+CREATE INDEX IF NOT EXISTS idx_calls_symbol ON calls(symbol);
+CREATE INDEX IF NOT EXISTS idx_calls_closed ON calls(closed);
+
+CREATE TABLE IF NOT EXISTS watchlist (
+    key TEXT PRIMARY KEY,
+    position REAL NOT NULL,
+    link TEXT,
+    symbol TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_watchlist_position ON watchlist(position);
+CREATE INDEX IF NOT EXISTS idx_watchlist_link ON watchlist(link);
+
+CREATE TABLE IF NOT EXISTS meta (
+    name TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+# Abstand der Sortierschlüssel bei neu vergebenen Positionen
+POSITION_GAP = 1024.0
+
+def _kept_indices(positions: List[Optional[float]]) -> set:
+    """Indizes einer längsten aufsteigenden Teilfolge der vorhandenen Positionen (diese bleiben unverändert)."""
+    tails: List[float] = []    # kleinstes Ende einer Teilfolge je Länge
+    tail_index: List[int] = []
+    parent: Dict[int, Optional[int]] = {}
+    for index, position in enumerate(positions):
+        if position is None:
+            continue
+        length = bisect_left(tails, position)
+        parent[index] = tail_index[length - 1] if length else None
+        if length == len(tails):
+            tails.append(position)
+            tail_index.append(index)
+        else:
+            tails[length] = position
+            tail_index[length] = index
+    kept = set()
+    index = tail_index[-1] if tail_index else None
+    while index is not None:
+        kept.add(index)
+        index = parent[index]
+    return kept
+
+def sparse_positions(positions: List[Optional[float]]) -> List[float]:
+    """
+    Vergibt Sortierschlüssel für die neue Reihenfolge der Zeilen.
+
+    Args:
+        positions: Bisherige Position je Zeile in der neuen Reihenfolge (None für neue Zeilen)
+
+    Returns:
+        Positionen, bei denen möglichst viele Zeilen ihren bisherigen Wert behalten:
+        Neue und verschobene Zeilen erhalten Werte zwischen ihren Nachbarn. Erst wenn
+        dazwischen kein Platz mehr ist, wird alles im Abstand POSITION_GAP neu nummeriert.
+    """
+    kept = _kept_indices(positions)
+    result: List[float] = []
+    index = 0
+    while index < len(positions):
+        if index in kept:
+            result.append(positions[index])
+            index += 1
+            continue
+        end = index
+        while end < len(positions) and end not in kept:
+            end += 1
+        count = end - index
+        low = result[-1] if result else None
+        high = positions[end] if end < len(positions) else None
+        if low is None and high is None:
+            values = [(step + 1) * POSITION_GAP for step in range(count)]
+        elif low is None:
+            values = [high - (count - step) * POSITION_GAP for step in range(count)]
+        elif high is None:
+            values = [low + (step + 1) * POSITION_GAP for step in range(count)]
+        else:
+            width = (high - low) / (count + 1)
+            values = [low + (step + 1) * width for step in range(count)]
+        bounds = ([low] if low is not None else []) + values + ([high] if high is not None else [])
+        if any(a >= b for a, b in zip(bounds, bounds[1:])):
+            # Kein Platz mehr zwischen den Nachbarn (Gleitkomma-Genauigkeit)
+            return [(step + 1) * POSITION_GAP for step in range(len(positions))]
+        result.extend(values)
+        index = end
+    return result
+
+class SqliteBackend(StorageBackend):
+    """
+    Speichert Calls, Watchlist und Kontostand in einer SQLite-Datenbank.
+
+    Jede Zeile liegt unter einem Schlüssel (siehe row_keys) in einer eigenen
+    Tabellenzeile. Beim Speichern wird der neue Stand mit dem zuletzt
+    geschriebenen verglichen und nur neue, geänderte oder entfernte Zeilen
+    werden in einer Transaktion geschrieben - das Abschließen oder Löschen
+    eines Calls ist damit ein einzelnes UPDATE bzw. DELETE statt eines
+    kompletten Neuschreibens. Die Reihenfolge hält ein lückenhafter
+    Sortierschlüssel (siehe sparse_positions), sodass auch Einfügen oder
+    Löschen am Anfang nur die betroffene Zeile schreibt.
+    """
+
+    def __init__(self, path: str = SQLITE_FILE):
+        super().__init__()
+        self.path = path
+        self._lock = threading.Lock()
+        # Verbindung wird vom Tk-Thread (Laden) und vom Flush-Timer (Speichern) genutzt
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        # Zuletzt geschriebener Stand je Tabelle: Schlüssel -> (Position, JSON)
+        self._persisted: Dict[str, Dict[str, Tuple[float, str]]] = {"calls": {}, "watchlist": {}}
+
+    def _load_rows(self, table: str) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = self._conn.execute(f"SELECT key, position, data FROM {table} ORDER BY position").fetchall()
+        self._persisted[table] = {key: (position, data) for key, position, data in rows}
+        return [json.loads(data) for _, _, data in rows]
+
+    def _save_rows(self, table: str, rows: List[Dict[str, Any]]) -> None:
+        """Schreibt nur die Zeilen, die sich gegenüber dem letzten Stand geändert haben."""
+        previous = self._persisted[table]
+        keys = row_keys(rows)
+        positions = sparse_positions([previous[key][0] if key in previous else None for key in keys])
+        current = {}
+        upserts = []
+        for key, row, position in zip(keys, rows, positions):
+            data = json.dumps(row)
+            current[key] = (position, data)
+            if previous.get(key) != (position, data):
+                params = [key, position, row.get("Link", ""), row.get("Symbol", "")]
+                if table == "calls":
+                    params.append(1 if row.get("abgeschlossen", False) else 0)
+                upserts.append(tuple(params) + (data,))
+        deletes = [(key,) for key in previous if key not in current]
+        if not upserts and not deletes:
+            return
+
+        columns = "key, position, link, symbol, closed, data" if table == "calls" else "key, position, link, symbol, data"
+        placeholders = ", ".join("?" for _ in columns.split(","))
+        with self._lock, self._conn:
+            if deletes:
+                self._conn.executemany(f"DELETE FROM {table} WHERE key = ?", deletes)
+            if upserts:
+                self._conn.executemany(f"INSERT OR REPLACE INTO {table} ({columns}) VALUES ({placeholders})", upserts)
+        self._persisted[table] = current
+
+    def load_calls(self) -> List[Dict[str, Any]]:
+        return self._load_rows("calls")
+
+    def load_watchlist(self) -> List[Dict[str, Any]]:
+        return self._load_rows("watchlist")
+
+    def load_budget(self) -> float:
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE name = 'budget'").fetchone()
+        try:
+            return float(row[0]) if row else DEFAULT_BUDGET
+        except (TypeError, ValueError):
+            return DEFAULT_BUDGET
+
+    def save_calls(self, calls: List[Dict[str, Any]]) -> None:
+        self._save_rows("calls", calls)
+
+    def save_watchlist(self, watchlist: List[Dict[str, Any]]) -> None:
+        self._save_rows("watchlist", watchlist)
+
+    def save_budget(self, budget: float) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("INSERT OR REPLACE INTO meta (name, value) VALUES ('budget', ?)", (str(budget),))
+
+    def backup_due(self) -> bool:
+        # Nur geänderte Zeilen werden geschrieben, ein JSON-Backup je Speichern wäre wieder O(N)
+        return False
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+def migrate_from_json(path: str = SQLITE_FILE) -> Dict[str, int]:
+    """
+    Übernimmt einmalig die Daten aus calls.json, watchlist.json und der
+    Budget-Datei in die SQLite-Datenbank. Fehlende oder beschädigte Dateien
+    werden aus complete_backup.json bzw. den rotierten Backups ersetzt.
+
+    Returns:
+        Anzahl der übernommenen Calls und Watchlist-Einträge
+    """
+    source = JsonBackend(CALLS_FILE, WATCHLIST_FILE, BUDGET_FILE)
+    calls = source.load_calls()
+    watchlist = source.load_watchlist()
+    budget = source.load_budget()
+    if not os.path.exists(CALLS_FILE):
+        calls = _read_from_backups("calls")
+    if not os.path.exists(WATCHLIST_FILE):
+        watchlist = _read_from_backups("watchlist")
+    if not os.path.exists(BUDGET_FILE) and os.path.exists(BACKUP_FILE):
+        try:
+            with open(BACKUP_FILE, "r") as f:
+                budget = float(json.load(f).get("budget", budget))
+        except Exception:
+            pass
+
+    target = SqliteBackend(path)
+    try:
+        target.load_calls()
+        target.load_watchlist()
+        target.save_calls(calls)
+        target.save_watchlist(watchlist)
+        target.save_budget(budget)
+    finally:
+        target.close()
+    return {"calls": len(calls), "watchlist": len(watchlist)}
+
+if __name__ == "__main__":
+    counts = migrate_from_json()
+    print(f"Migration abgeschlossen: {counts['calls']} Calls, {counts['watchlist']} Watchlist-Einträge "
+          f"nach {SQLITE_FILE} übernommen")
\ No newline at end of file
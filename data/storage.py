@@ -2,104 +2,123 @@
 import json
 import os
 from typing import List, Dict, Any, Optional
-from datetime import datetime
 
 # Importiere Konfiguration
-from config import CALLS_FILE, BUDGET_FILE, DEFAULT_BUDGET, WATCHLIST_FILE, BACKUP_FILE
-
-def load_call_data() -> List[Dict[str, Any]]:
-    """Lädt die gespeicherten Call-Daten aus der JSON-Datei."""
-    if os.path.exists(CALLS_FILE):
-        with open(CALLS_FILE, "r") as f:
-            try:
-                return json.load(f)
-            except json.JSONDecodeError:
-                return []
-    return []
-
-def save_call_data(calls: List[Dict[str, Any]]) -> None:
-    """Speichert die Call-Daten in der JSON-Datei."""
-    with open(CALLS_FILE, "w") as f:
-        json.dump(calls, f, indent=4)
-    # Nach dem Speichern der Calls auch das Backup aktualisieren
-    create_backup()
-
-def save_new_call(call_data: Dict[str, Any]) -> None:
-    """Speichert einen neuen Call in der JSON-Datei."""
-    calls = load_call_data()
-    calls.append(call_data)
-    save_call_data(calls)
-
-def create_new_call(symbol: str, mcap: str, liquidity: str, link: str) -> Dict[str, Any]:
+from config import BACKUP_FILE
+from data.repository import repository
+from data.models import Call, parse_number, pair_market_cap
+from data.persistence import PersistenceScheduler, build_backup, write_json
+
+# Änderungsbenachrichtigungen ("calls", "watchlist", "budget")
+events = repository.events
+
+# Schreibt Änderungen verzögert und zusammengefasst auf die Platte
+persistence = PersistenceScheduler(repository)
+
+def flush() -> None:
+    """Schreibt alle ausstehenden Änderungen sofort (z.B. beim Beenden)."""
+    persistence.flush()
+
+def load_call_data() -> List[Call]:
+    """Gibt die Call-Daten aus dem In-Memory-Repository zurück (Kopien)."""
+    return repository.get_calls()
+
+def save_call_data(calls: List[Call]) -> None:
+    """Übernimmt die Call-Daten ins Repository (gespeichert wird verzögert)."""
+    repository.set_calls(calls)
+
+def save_new_call(call_data: Call) -> None:
+    """Speichert einen neuen Call."""
+    repository.add_call(call_data)
+
+def get_call(call_id: str) -> Optional[Call]:
+    """Gibt den Call mit der ID zurück (Kopie, None falls nicht vorhanden)."""
+    return repository.get_call(call_id)
+
+def find_calls(link: Optional[str] = None, symbol: Optional[str] = None) -> List[Call]:
+    """Gibt alle Calls mit dem Link und/oder Symbol zurück (Kopien)."""
+    return repository.find_calls(link, symbol)
+
+def update_calls(calls: List[Call]) -> int:
+    """Übernimmt geänderte Calls anhand ihrer ID und gibt die Anzahl der Änderungen zurück."""
+    return repository.update_calls(calls)
+
+def delete_calls(call_ids: List[str]) -> int:
+    """Löscht die Calls mit den IDs und gibt die Anzahl der gelöschten zurück."""
+    return repository.remove_calls(call_ids)
+
+def current_market_cap(current_data: Optional[Dict[str, Any]], fallback: Any = None) -> float:
+    """
+    Gibt die ungerundete Marktkapitalisierung des geladenen Tokens zurück.
+
+    Args:
+        current_data: Zuletzt abgerufene Dexscreener-Antwort (shared_vars['current_data'])
+        fallback: Angezeigter Wert (z.B. '281K'), falls keine Rohdaten vorliegen
+    """
+    pairs = (current_data or {}).get("pairs") or []
+    if pairs:
+        market_cap = pair_market_cap(pairs[0])
+        if market_cap > 0:
+            return market_cap
+    return parse_number(fallback)
+
+def create_new_call(symbol: str, mcap: Any, liquidity: str, link: str) -> Call:
     """Erstellt einen neuen Call mit den notwendigen Daten."""
-    return {
-        "Datum": datetime.now().strftime("%d.%m."),
-        "Symbol": symbol,
-        "MCAP_at_Call": mcap,
-        "Link": link,
-        "Aktuelles_MCAP": mcap,  # initial gleich MCAP_at_Call
-        "X_Factor": "1.0X",      # Initialer X-Factor: 1.0
-        "PL_Percent": "0%",      # Initialer Wert
-        "PL_Dollar": "0.00$",    # Initialer Wert
-        "Invest": "10"           # Fester Investitionswert: 10$
-    }
-
-def load_watchlist_data() -> List[Dict[str, Any]]:
-    """Lädt die gespeicherten Beobachtungsliste-Daten aus der JSON-Datei."""
-    if os.path.exists(WATCHLIST_FILE):
-        with open(WATCHLIST_FILE, "r") as f:
-            try:
-                return json.load(f)
-            except json.JSONDecodeError:
-                return []
-    return []
-
-def save_watchlist_data(watchlist: List[Dict[str, Any]]) -> None:
-    """Speichert die Beobachtungsliste-Daten in der JSON-Datei."""
-    with open(WATCHLIST_FILE, "w") as f:
-        json.dump(watchlist, f, indent=4)
-    # Nach dem Speichern der Watchlist auch das Backup aktualisieren
-    create_backup()
-
-def save_new_watchlist_item(item_data: Dict[str, Any]) -> None:
-    """Speichert einen neuen Beobachtungsliste-Eintrag in der JSON-Datei."""
-    watchlist = load_watchlist_data()
-    watchlist.append(item_data)
-    save_watchlist_data(watchlist)
-
-def create_new_watchlist_item(symbol: str, mcap: str, link: str) -> Dict[str, Any]:
+    market_cap = parse_number(mcap)
+    return Call(
+        symbol=symbol,
+        link=link,
+        mcap_at_call=market_cap,
+        current_mcap=market_cap,  # initial gleich MCAP_at_Call
+        invest=10.0               # Fester Investitionswert: 10$
+    )
+
+def load_watchlist_data() -> List[Call]:
+    """Gibt die Beobachtungsliste aus dem In-Memory-Repository zurück (Kopien)."""
+    return repository.get_watchlist()
+
+def save_watchlist_data(watchlist: List[Call]) -> None:
+    """Übernimmt die Beobachtungsliste ins Repository (gespeichert wird verzögert)."""
+    repository.set_watchlist(watchlist)
+
+def save_new_watchlist_item(item_data: Call) -> None:
+    """Speichert einen neuen Beobachtungsliste-Eintrag."""
+    repository.add_watchlist_item(item_data)
+
+def get_watchlist_item(item_id: str) -> Optional[Call]:
+    """Gibt den Beobachtungsliste-Eintrag mit der ID zurück (Kopie, None falls nicht vorhanden)."""
+    return repository.get_watchlist_item(item_id)
+
+def find_watchlist_items(link: Optional[str] = None, symbol: Optional[str] = None) -> List[Call]:
+    """Gibt alle Beobachtungsliste-Einträge mit dem Link und/oder Symbol zurück (Kopien)."""
+    return repository.find_watchlist(link, symbol)
+
+def update_watchlist_items(items: List[Call]) -> int:
+    """Übernimmt geänderte Beobachtungsliste-Einträge anhand ihrer ID."""
+    return repository.update_watchlist(items)
+
+def delete_watchlist_items(item_ids: List[str]) -> int:
+    """Löscht die Beobachtungsliste-Einträge mit den IDs."""
+    return repository.remove_watchlist_items(item_ids)
+
+def create_new_watchlist_item(symbol: str, mcap: Any, link: str) -> Call:
     """Erstellt einen neuen Beobachtungsliste-Eintrag mit den notwendigen Daten."""
-    return {
-        "Datum": datetime.now().strftime("%d.%m."),
-        "Symbol": symbol,
-        "MCAP_at_Call": mcap,
-        "Link": link,
-        "Aktuelles_MCAP": mcap,  # initial gleich MCAP_at_Call
-        "X_Factor": "1.0X",      # initialer X-Factor: 1.0
-        "PL_Percent": "0%",      # initial 0%
-        "PL_Dollar": "0.00$",    # initial 0.00$
-        "Invest": "10"           # fiktiver Invest-Wert für Anzeige
-    }
+    market_cap = parse_number(mcap)
+    return Call(
+        symbol=symbol,
+        link=link,
+        mcap_at_call=market_cap,
+        current_mcap=market_cap,  # initial gleich MCAP_at_Call
+        invest=10.0               # fiktiver Invest-Wert für Anzeige
+    )
 
 def load_budget() -> float:
-    """Lädt den gespeicherten Kontostand."""
-    try:
-        if os.path.exists(BUDGET_FILE):
-            with open(BUDGET_FILE, "r") as f:
-                return float(f.read().strip())
-    except Exception:
-        pass
-    return DEFAULT_BUDGET
+    """Gibt den Kontostand aus dem In-Memory-Repository zurück."""
+    return repository.get_budget()
 
 def save_budget(budget: float) -> None:
-    """Speichert den aktuellen Kontostand."""
-    try:
-        with open(BUDGET_FILE, "w") as f:
-            f.write(str(budget))
-        # Nach dem Speichern des Budgets auch das Backup aktualisieren
-        create_backup()
-    except Exception as e:
-        print(f"Budget-Backup fehlgeschlagen: {e}")
+    """Übernimmt den Kontostand ins Repository (gespeichert wird verzögert, nur bei Änderung)."""
+    repository.set_budget(budget)
 
 def create_backup() -> None:
     """
@@ -107,22 +126,14 @@ def create_backup() -> None:
     Enthält: Kontostand, aktive Calls, Beobachtungsliste und Timestamp.
     """
     try:
-        # Lade alle benötigten Daten
+        # Lade alle benötigten Daten (aus dem Speicher, nicht von der Platte)
         budget = load_budget()
         calls = load_call_data()
         watchlist = load_watchlist_data()
         
-        # Erstelle Backup-Struktur
-        backup_data = {
-            "timestamp": datetime.now().isoformat(),
-            "budget": budget,
-            "calls": calls,
-            "watchlist": watchlist
-        }
-        
-        # Speichere Backup-Daten
-        with open(BACKUP_FILE, "w") as f:
-            json.dump(backup_data, f, indent=4)
+        # Erstelle und speichere die Backup-Struktur
+        write_json(BACKUP_FILE, build_backup(budget, [call.to_dict() for call in calls],
+                                             [item.to_dict() for item in watchlist]))
     except Exception as e:
         print(f"Vollständiges Backup fehlgeschlagen: {e}")
 
@@ -147,8 +158,8 @@ def restore_from_backup() -> bool:
             
         # Stelle Daten wieder her
         save_budget(backup_data["budget"])
-        save_call_data(backup_data["calls"])
-        save_watchlist_data(backup_data["watchlist"])
+        save_call_data([Call.from_dict(call) for call in backup_data["calls"]])
+        save_watchlist_data([Call.from_dict(item) for item in backup_data["watchlist"]])
         
         return True
     except Exception as e:
@@ -162,23 +173,7 @@ def calculate_total_profit() -> float:
     Returns:
         Float mit dem Gesamtgewinn/Verlust in Dollar
     """
-    total_profit = 0.0
-    calls = load_call_data()
-    
-    # Summe aller PL_Dollar-Werte (nur von aktiven Calls)
-    for call in calls:
-        # Ignoriere abgeschlossene Calls
-        if call.get("abgeschlossen", False):
-            continue
-            
-        try:
-            # Entfernt das Dollarzeichen und wandelt in float um
-            profit = float(call.get("PL_Dollar", "0").rstrip("$"))
-            total_profit += profit
-        except Exception:
-            continue
-            
-    return total_profit
+    return repository.get_aggregates().total_profit()
 
 def calculate_today_profit() -> float:
     """
@@ -187,34 +182,11 @@ def calculate_today_profit() -> float:
     Returns:
         Float mit dem heutigen Gewinn/Verlust in Dollar
     """
-    today_profit = 0.0
-    calls = load_call_data()
-    
-    # Aktuelles Datum im Format "DD.MM."
-    today = datetime.now().strftime("%d.%m.")
-    
-    # Nur Calls vom heutigen Tag berücksichtigen (nur aktive)
-    for call in calls:
-        # Ignoriere abgeschlossene Calls
-        if call.get("abgeschlossen", False):
-            continue
-            
-        if call.get("Datum") != today:
-            continue
-            
-        try:
-            # Entfernt das Dollarzeichen und wandelt in float um
-            profit = float(call.get("PL_Dollar", "0").rstrip("$"))
-            today_profit += profit
-        except Exception:
-            continue
-            
-    return today_profit
+    return repository.get_aggregates().today_profit()
 
 def count_active_calls() -> int:
     """Zählt die aktiven (nicht abgeschlossenen) Calls."""
-    calls = load_call_data()
-    return sum(1 for call in calls if not call.get("abgeschlossen", False))
+    return repository.get_aggregates().active_count
 
 def calculate_current_balance() -> float:
     """
@@ -224,22 +196,7 @@ def calculate_current_balance() -> float:
     Returns:
         Float mit dem aktuellen Kontostand in Dollar
     """
-    # Lade das Start-Budget
-    base_budget = DEFAULT_BUDGET
-    
-    # Berechne den Gesamt-P/L aller Calls (aktiv und abgeschlossen)
-    total_profit = 0.0
-    calls = load_call_data()
-    
-    for call in calls:
-        try:
-            profit = float(call.get("PL_Dollar", "0").rstrip("$"))
-            total_profit += profit
-        except Exception:
-            continue
-    
-    # Aktueller Kontostand
-    current_balance = base_budget + total_profit
+    current_balance = repository.get_aggregates().current_balance()
     
     # Speichere den aktuellen Kontostand
     save_budget(current_balance)
@@ -253,8 +210,7 @@ def calculate_total_investment() -> float:
     Returns:
         Float mit dem investierten Betrag in Dollar
     """
-    active_calls_count = count_active_calls()
-    return active_calls_count * 10.0  # 10$ pro aktivem Call
+    return repository.get_aggregates().total_investment()
 
 def calculate_average_profit_per_call() -> float:
     """
@@ -263,13 +219,7 @@ def calculate_average_profit_per_call() -> float:
     Returns:
         Float mit dem durchschnittlichen Gewinn/Verlust pro Call
     """
-    total_profit = calculate_total_profit()
-    active_calls_count = count_active_calls()
-    
-    if active_calls_count > 0:
-        return total_profit / active_calls_count
-    else:
-        return 0.0
+    return repository.get_aggregates().average_profit()
 
 def find_call_by_symbol(symbol: str, data=None):
     """
@@ -287,20 +237,19 @@ def find_call_by_symbol(symbol: str, data=None):
         from utils.formatters import parse_km
         import json
 
-    # Hole aktuellste Calls
-    calls = load_call_data()
-    target_call = next((call for call in calls if call.get("Symbol", "") == symbol), None)
+    # Hole aktuellste Calls (über den Symbol-Index)
+    matches = find_calls(symbol=symbol)
     
-    if not target_call:
+    if not matches:
         # Wenn nicht in den Calls gefunden, suche in der Watchlist
-        watchlist = load_watchlist_data()
-        target_call = next((item for item in watchlist if item.get("Symbol", "") == symbol), None)
-        if not target_call:
+        matches = find_watchlist_items(symbol=symbol)
+        if not matches:
             return None
+    target_call = matches[0]
     
     # Wenn kein Datenparameter übergeben wurde, rufe Daten von API ab
     if not data:
-        link = target_call.get("Link", "")
+        link = target_call.link
         if not link:
             return None
         
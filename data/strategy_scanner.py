@@ -0,0 +1,221 @@
+# Laufender Strategie-Scan, der nur veränderte Tokens neu bewertet
+import heapq
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from data.birdeye_api import SCAN_MAX_WORKERS, get_filtered_tokens, iter_strategy_scan
+from data.strategy_scoring import rank_tokens
+
+SCANNER_INTERVAL = 60  # Sekunden zwischen zwei Abrufen der Token-Liste
+SCANNER_TOP_N = 10  # Anzahl der Tokens in der Rangliste
+SCANNER_FETCH_LIMIT = 50  # Tokens je Abruf der Token-Liste
+SCANNER_DEEP_CRAWL = True  # MCAP-Bereich seitenweise durchsuchen statt nur die 50 umsatzstärksten Tokens
+SCANNER_CRAWL_PAGES = 5  # Seitenbudget je Durchsuchung (plus meist zwei Abrufe für den Beginn des Bereichs)
+RESCORE_MAX_AGE = 600  # Sekunden, nach denen ein Token auch ohne Änderung neu bewertet wird
+
+# Relative Änderung seit der letzten Bewertung, ab der neu bewertet wird
+RESCORE_THRESHOLDS = {
+    "mcap": 0.03,
+    "volume_24h": 0.05,
+    "price": 0.03,
+}
+
+def token_snapshot(token: Dict[str, Any]) -> Dict[str, float]:
+    """Die für die Neubewertung beobachteten Werte eines Tokens (Felder wie in extract_token_info)."""
+    return {
+        "mcap": token.get("marketCap", token.get("mc", 0)) or 0,
+        "volume_24h": token.get("v24hUSD", token.get("v24h", 0)) or 0,
+        "price": token.get("price", 0) or 0,
+    }
+
+def _relative_change(old: float, new: float) -> float:
+    if old == 0:
+        return 0.0 if new == 0 else float("inf")
+    return abs(new - old) / abs(old)
+
+@dataclass
+class TokenState:
+    """Stand eines Tokens im Scanner."""
+    token: Dict[str, Any]
+    position: int
+    analysis: Optional[Dict[str, Any]] = None  # letzte Analyse (siehe analyze_token_for_strategy)
+    snapshot: Optional[Dict[str, float]] = None  # Werte zum Zeitpunkt der letzten Bewertung
+    scored_at: float = 0.0
+
+class StrategyScanner:
+    """
+    Scannt die Token-Liste fortlaufend und bewertet nur veränderte Tokens neu.
+
+    Jeder Durchlauf (update) vergleicht die neue Token-Liste mit dem bisherigen
+    Stand: Neue Tokens werden bewertet, verschwundene entfernt, und bekannte
+    Tokens nur dann neu analysiert, wenn sich Marktkapitalisierung, Volumen
+    oder Preis seit der letzten Bewertung um mehr als RESCORE_THRESHOLDS
+    geändert haben oder die Bewertung älter als RESCORE_MAX_AGE ist.
+
+    Die Rangliste der besten top_n Tokens wird mit jedem fertigen Ergebnis
+    fortgeschrieben. top() ist threadsicher; on_update wird im Thread des
+    Scanners mit der neuen Rangliste aufgerufen (die UI muss selbst in den
+    Tk-Thread wechseln, z.B. über root.after).
+    """
+
+    def __init__(
+        self,
+        fetch_tokens: Optional[Callable[[], List[Dict[str, Any]]]] = None,
+        top_n: int = SCANNER_TOP_N,
+        thresholds: Optional[Dict[str, float]] = None,
+        max_age: float = RESCORE_MAX_AGE,
+        with_price_history: bool = True,
+        max_workers: int = SCAN_MAX_WORKERS,
+        on_update: Optional[Callable[[List[Dict[str, Any]]], None]] = None,
+        **weights
+    ):
+        """
+        Args:
+            fetch_tokens: Liefert die aktuelle Token-Liste (Standard: get_filtered_tokens,
+                          mit SCANNER_DEEP_CRAWL über SCANNER_CRAWL_PAGES Seiten)
+            top_n: Anzahl der Tokens in der Rangliste
+            thresholds: Relative Änderungen je Wert (siehe RESCORE_THRESHOLDS)
+            max_age: Sekunden, nach denen ein Token in jedem Fall neu bewertet wird
+            with_price_history: Kerzen abrufen und das Preismuster bewerten
+            on_update: Wird nach jeder Änderung der Rangliste aufgerufen
+            **weights: Gewichtungen für analyze_token_for_strategy (pattern_weight, ...)
+        """
+        self.fetch_tokens = fetch_tokens or (lambda: get_filtered_tokens(
+            limit=SCANNER_FETCH_LIMIT, deep=SCANNER_DEEP_CRAWL, max_pages=SCANNER_CRAWL_PAGES))
+        self.top_n = top_n
+        self.thresholds = dict(RESCORE_THRESHOLDS if thresholds is None else thresholds)
+        self.max_age = max_age
+        self.with_price_history = with_price_history
+        self.max_workers = max_workers
+        self.on_update = on_update
+        self.weights = weights
+        self._states: Dict[str, TokenState] = {}
+        self._top: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self, interval: float = SCANNER_INTERVAL) -> None:
+        """Startet den Scan im Hintergrund (mehrfacher Aufruf ist unschädlich)."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, args=(interval,), name="StrategyScanner", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Beendet den Scan nach dem aktuellen Durchlauf."""
+        self._stop.set()
+
+    @property
+    def running(self) -> bool:
+        """True, solange der Scan gestartet und nicht beendet ist."""
+        return self._thread is not None and not self._stop.is_set()
+
+    def top(self) -> List[Dict[str, Any]]:
+        """Die aktuelle Rangliste (Analysen, bester Score zuerst)."""
+        with self._lock:
+            return list(self._top)
+
+    def _needs_rescore(self, state: TokenState, token: Dict[str, Any], now: float) -> bool:
+        if state.analysis is None or now - state.scored_at >= self.max_age:
+            return True
+        snapshot = token_snapshot(token)
+        return any(_relative_change(state.snapshot[key], snapshot[key]) >= threshold
+                   for key, threshold in self.thresholds.items())
+
+    def _rank(self) -> List[Dict[str, Any]]:
+        """Bestimmt die besten top_n Tokens (bei Gleichstand nach Listenposition); Aufruf mit Lock."""
+        scored = [state for state in self._states.values() if state.analysis is not None]
+        best = heapq.nlargest(self.top_n, scored,
+                              key=lambda state: (state.analysis["score"]["total"], -state.position))
+        self._top = [state.analysis for state in best]
+        return list(self._top)
+
+    def _notify(self, ranking: List[Dict[str, Any]]) -> None:
+        if self.on_update:
+            try:
+                self.on_update(ranking)
+            except Exception as e:
+                print(f"Fehler beim Aktualisieren der Rangliste: {e}")
+
+    def update(self, tokens: List[Dict[str, Any]], now: Optional[float] = None) -> Dict[str, int]:
+        """
+        Gleicht eine neue Token-Liste ab und bewertet neue und veränderte Tokens.
+
+        Args:
+            tokens: Token-Objekte aus /defi/tokenlist
+
+        Returns:
+            Anzahl neuer, veränderter, entfernter und unveränderter Tokens
+        """
+        now = time.time() if now is None else now
+        current: Dict[str, Tuple[int, Dict[str, Any]]] = {}
+        for position, token in enumerate(tokens):
+            address = token.get("address")
+            if address and address not in current:
+                current[address] = (position, token)
+
+        with self._lock:
+            removed = [address for address in self._states if address not in current]
+            for address in removed:
+                del self._states[address]
+            new, changed = [], []
+            for address, (position, token) in current.items():
+                state = self._states.get(address)
+                if state is None:
+                    self._states[address] = TokenState(token=token, position=position)
+                    new.append(address)
+                    continue
+                if self._needs_rescore(state, token, now):
+                    changed.append(address)
+                state.token, state.position = token, position
+            ranking = self._rank() if removed else None
+        if ranking is not None:
+            self._notify(ranking)
+
+        # Nur neue und veränderte Tokens analysieren, die Rangliste wächst mit jedem Ergebnis.
+        # Die Kerzen werden in der Reihenfolge des Vorab-Scores (ohne Kerzen) abgerufen,
+        # damit die vielversprechendsten Tokens zuerst in der Rangliste erscheinen.
+        to_score = new + changed
+        if self.with_price_history and len(to_score) > 1:
+            order = rank_tokens([current[address][1] for address in to_score], **self.weights)
+            to_score = [to_score[index] for index in order]
+        pending = [current[address][1] for address in to_score]
+        for index, analysis in iter_strategy_scan(pending, with_price_history=self.with_price_history,
+                                                  max_workers=self.max_workers, **self.weights):
+            if self._stop.is_set():
+                break  # noch nicht gestartete Abrufe werden verworfen
+            with self._lock:
+                state = self._states.get(to_score[index])
+                if state is None:
+                    continue
+                state.analysis = analysis
+                state.snapshot = token_snapshot(pending[index])
+                state.scored_at = now
+                ranking = self._rank()
+            self._notify(ranking)
+
+        return {
+            "new": len(new),
+            "changed": len(changed),
+            "removed": len(removed),
+            "unchanged": len(current) - len(new) - len(changed),
+        }
+
+    def scan_once(self) -> Dict[str, int]:
+        """Ruft die Token-Liste ab und gleicht sie ab (siehe update)."""
+        return self.update(self.fetch_tokens())
+
+    def _run(self, interval: float) -> None:
+        """Hauptschleife des Scan-Threads."""
+        while not self._stop.is_set():
+            try:
+                counts = self.scan_once()
+                print(f"Strategie-Scan: {counts['new']} neu, {counts['changed']} verändert, "
+                      f"{counts['removed']} entfernt, {counts['unchanged']} unverändert")
+            except Exception as e:
+                print(f"Fehler beim Strategie-Scan: {e}")
+            self._stop.wait(interval)
\ No newline at end of file
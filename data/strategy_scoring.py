@@ -0,0 +1,247 @@
+# Spaltenweise Bewertung vieler Tokens nach der "Second Bounce Strategy"
+from typing import Any, Dict, List, Optional, Sequence
+
+from data.birdeye_api import analyze_token_for_strategy
+from data.price_analysis import HAS_NUMPY, analyze_price_responses, np
+
+# Felder aus /defi/tokenlist bzw. /token_overview (wie in extract_token_info)
+TOKEN_COLUMNS = {
+    "mcap": ("marketCap", "mc"),
+    "liquidity": ("liquidity", None),
+    "volume_24h": ("v24hUSD", "v24h"),
+    "price_change_1h": ("priceChange1hPercent", "priceChange1h"),
+    "price_change_12h": ("priceChange12hPercent", "priceChange12h"),
+    "price_change_24h": ("priceChange24hPercent", "priceChange24h"),
+}
+
+# Schwellen der Einzelbewertungen (wie in data.birdeye_api), absteigend: (Schwelle, Rohpunkte)
+VOLUME_LEVELS = [(0.3, 35), (0.2, 30), (0.1, 25), (0.05, 20), (0.02, 15)]
+LIQUIDITY_LEVELS = [(0.3, 10), (0.2, 8), (0.1, 6), (0.05, 4), (0.02, 2)]
+
+# Volumen-Trend als Code: 0 = ↓↓, 1 = ↓, 2 = →, 3 = ↑, 4 = ↑↑
+VOLUME_TRENDS = ["↓↓", "↓", "→", "↑", "↑↑"]
+
+def _column(tokens: Sequence[Dict[str, Any]], key: str, fallback: Optional[str]):
+    if fallback is None:
+        return np.array([token.get(key, 0) for token in tokens], dtype=float)
+    return np.array([token.get(key, token.get(fallback, 0)) for token in tokens], dtype=float)
+
+def token_columns(tokens: Sequence[Dict[str, Any]]) -> Dict[str, Any]:
+    """Liest die für die Bewertung nötigen Felder aller Tokens als float-Arrays."""
+    return {name: _column(tokens, key, fallback) for name, (key, fallback) in TOKEN_COLUMNS.items()}
+
+def analysis_columns(analyses: Sequence[Optional[Dict[str, Any]]]) -> Dict[str, Any]:
+    """
+    Wandelt Preishistorie-Analysen (siehe analyze_price_history) in Arrays um.
+    None steht für ein Token ohne Kerzen.
+    """
+    def column(key, dtype=float):
+        return np.array([(analysis or {}).get(key, 0) for analysis in analyses], dtype=dtype)
+
+    patterns = [(analysis or {}).get("volume_pattern") for analysis in analyses]
+    return {
+        "has_analysis": np.array([bool(analysis) for analysis in analyses]),
+        "dip_detected": column("dip_detected", bool),
+        "bounce_detected": column("bounce_detected", bool),
+        "dip_percentage": column("dip_percentage"),
+        "recovery_percentage": column("recovery_percentage"),
+        "stabilization_count": column("stabilization_count"),
+        "current_price": column("current_price"),
+        "lowest_price": column("lowest_price"),
+        "high_dip_volume": np.array([pattern == "high_dip_volume" for pattern in patterns]),
+        "increasing_after_dip": np.array([pattern == "increasing_after_dip" for pattern in patterns]),
+    }
+
+def _levels(values, levels):
+    """Rohpunkte der ersten erreichten Schwelle (0, wenn keine erreicht ist)."""
+    return np.select([values >= threshold for threshold, _ in levels], [points for _, points in levels], 0)
+
+def _scale(raw, internal_max: int, max_score: int):
+    """Skaliert Rohpunkte wie die Einzelanalysen: round(raw / internal_max * max_score), höchstens max_score."""
+    return np.minimum(np.round(raw / internal_max * max_score), max_score).astype(int)
+
+def _ratio(numerator, mcap):
+    return np.divide(numerator, mcap, out=np.zeros_like(numerator), where=mcap > 0)
+
+def score_columns(
+    columns: Dict[str, Any],
+    analyses: Dict[str, Any],
+    pattern_weight: int = 40,
+    volume_weight: int = 35,
+    timeframe_weight: int = 15,
+    rugpull_weight: int = 10
+) -> Dict[str, Any]:
+    """
+    Berechnet alle Teil-Scores spaltenweise.
+
+    Liefert dieselben Punkte wie analyze_price_pattern, analyze_volume_quality,
+    analyze_timeframes und analyze_rugpull_safety, aber ohne Gründe.
+
+    Args:
+        columns: Token-Felder (siehe token_columns)
+        analyses: Preishistorie-Analysen (siehe analysis_columns)
+
+    Returns:
+        Arrays "pattern", "volume", "timeframe", "rugpull", "total" sowie
+        "volume_trend" (Code, siehe VOLUME_TRENDS)
+    """
+    has_analysis = analyses["has_analysis"]
+    dip = has_analysis & analyses["dip_detected"]
+    bounce = has_analysis & analyses["bounce_detected"]
+    dip_percentage = analyses["dip_percentage"]
+    stabilization = analyses["stabilization_count"]
+
+    # 1. Muster
+    pattern_raw = np.where(
+        dip,
+        15 + np.where(stabilization >= 3, np.minimum(10, (stabilization - 2) * 5), 0)
+        + np.where(bounce, np.minimum(15, 5 + np.trunc(analyses["recovery_percentage"] / 5)), 0),
+        np.where(dip_percentage > 0, 5, 0))
+    pattern = np.where(has_analysis, _scale(pattern_raw, 40, pattern_weight), 0)
+
+    # 2. Volumen (inkl. Bonus aus dem Volumenmuster)
+    volume_to_mcap = _ratio(columns["volume_24h"], columns["mcap"])
+    volume_raw = np.where(volume_to_mcap > 0, np.maximum(_levels(volume_to_mcap, VOLUME_LEVELS), 10), 0)
+    trend = np.select([volume_to_mcap >= 0.3, volume_to_mcap >= 0.05, volume_to_mcap >= 0.02, volume_to_mcap > 0],
+                      [4, 3, 2, 1], 0)
+    high_dip_volume = has_analysis & analyses["high_dip_volume"] & (volume_raw < 35)
+    increasing = has_analysis & analyses["increasing_after_dip"] & (volume_raw < 35)
+    volume_raw = volume_raw + np.where(high_dip_volume, np.minimum(5, 35 - volume_raw), 0)
+    volume_raw = volume_raw + np.where(increasing, np.minimum(3, 35 - volume_raw), 0)
+    trend = np.where(high_dip_volume & ((trend == 1) | (trend == 2)), trend + 1, trend)
+    volume = _scale(volume_raw, 35, volume_weight)
+
+    # 3. Zeitrahmen
+    change_1h = columns["price_change_1h"]
+    long_term_positive = (columns["price_change_12h"] > 0) | (columns["price_change_24h"] > 0)
+    timeframe_raw = np.select(
+        [(change_1h < -2) & long_term_positive, (change_1h <= 0) & long_term_positive,
+         (change_1h > 0) & long_term_positive, ~long_term_positive],
+        [15, 10, 5, 0], 2)
+    recovering = dip & (analyses["current_price"] > analyses["lowest_price"]) & (timeframe_raw < 15)
+    timeframe_raw = timeframe_raw + np.where(recovering, np.minimum(3, 15 - timeframe_raw), 0)
+    timeframe = _scale(timeframe_raw, 15, timeframe_weight)
+
+    # 4. Rugpull-Sicherheit
+    rugpull = _scale(_levels(_ratio(columns["liquidity"], columns["mcap"]), LIQUIDITY_LEVELS), 10, rugpull_weight)
+
+    return {
+        "pattern": pattern,
+        "volume": volume,
+        "timeframe": timeframe,
+        "rugpull": rugpull,
+        "total": pattern + volume + timeframe + rugpull,
+        "volume_trend": trend,
+    }
+
+def rank_tokens(
+    tokens: Sequence[Dict[str, Any]],
+    price_histories: Optional[Sequence[Optional[Dict[str, Any]]]] = None,
+    pattern_weight: int = 40,
+    volume_weight: int = 35,
+    timeframe_weight: int = 15,
+    rugpull_weight: int = 10
+) -> List[int]:
+    """
+    Bestimmt die Reihenfolge der Tokens nach Score, ohne Analysen aufzubauen.
+
+    Returns:
+        Indizes in tokens, bester Score zuerst (bei Gleichstand nach Position)
+    """
+    if not HAS_NUMPY:
+        totals = [analyze_token_for_strategy(token, price_history=history, pattern_weight=pattern_weight,
+                                             volume_weight=volume_weight, timeframe_weight=timeframe_weight,
+                                             rugpull_weight=rugpull_weight)["score"]["total"]
+                  for token, history in zip(tokens, price_histories or [None] * len(tokens))]
+        return sorted(range(len(totals)), key=lambda index: (-totals[index], index))
+    if not tokens:
+        return []
+    analyses = analyze_price_responses(price_histories or [None] * len(tokens))
+    scores = score_columns(token_columns(tokens), analysis_columns(analyses),
+                           pattern_weight, volume_weight, timeframe_weight, rugpull_weight)
+    return np.lexsort((np.arange(len(tokens)), -scores["total"])).tolist()
+
+def score_tokens(
+    tokens: Sequence[Dict[str, Any]],
+    price_histories: Optional[Sequence[Optional[Dict[str, Any]]]] = None,
+    top_k: Optional[int] = None,
+    pattern_weight: int = 40,
+    volume_weight: int = 35,
+    timeframe_weight: int = 15,
+    rugpull_weight: int = 10
+) -> List[Dict[str, Any]]:
+    """
+    Bewertet viele Tokens auf einmal und gibt die besten zurück.
+
+    Die Scores aller Tokens werden spaltenweise berechnet (score_columns),
+    Gründe, Hauptgrund und Anzeigewerte nur für die besten top_k über
+    analyze_token_for_strategy. Ohne NumPy wird jedes Token einzeln analysiert.
+
+    Args:
+        tokens: Token-Objekte aus /defi/tokenlist
+        price_histories: Je Token die Antwort von get_token_price_history (oder None)
+        top_k: Anzahl der zurückzugebenden Analysen (Standard: alle)
+
+    Returns:
+        Analysen wie von analyze_token_for_strategy, sortiert nach Score
+        (bei Gleichstand nach Position in tokens)
+    """
+    weights = {
+        "pattern_weight": pattern_weight,
+        "volume_weight": volume_weight,
+        "timeframe_weight": timeframe_weight,
+        "rugpull_weight": rugpull_weight,
+    }
+    price_histories = price_histories or [None] * len(tokens)
+    top_k = len(tokens) if top_k is None else max(0, top_k)
+
+    if not HAS_NUMPY:
+        results = [analyze_token_for_strategy(token, price_history=history, **weights)
+                   for token, history in zip(tokens, price_histories)]
+        order = sorted(range(len(results)), key=lambda index: (-results[index]["score"]["total"], index))
+        return [results[index] for index in order[:top_k]]
+    if not tokens:
+        return []
+
+    # Kerzen aller Tokens gemeinsam analysieren
+    analyses = analyze_price_responses(price_histories)
+
+    scores = score_columns(token_columns(tokens), analysis_columns(analyses),
+                           pattern_weight, volume_weight, timeframe_weight, rugpull_weight)
+    order = np.lexsort((np.arange(len(tokens)), -scores["total"]))[:top_k]
+    return [analyze_token_for_strategy(tokens[index], price_history_analysis=analyses[index], **weights)
+            for index in order.tolist()]
+
+# Laufzeitvergleich mit der Einzelanalyse, wenn direkt ausgeführt (Abgleich: tests/test_strategy_scoring.py)
+if __name__ == "__main__":
+    import random
+    import time
+
+    print(f"=== Spaltenweise Strategie-Bewertung (NumPy: {HAS_NUMPY}) ===")
+    rng = random.Random(7)
+
+    def random_token(i):
+        mcap = rng.choice([0, rng.uniform(1e5, 3e6)])
+        token = {"address": f"Token{i}", "symbol": f"t{i}", "mc": mcap,
+                 "liquidity": mcap * rng.uniform(0, 0.5), "v24hUSD": mcap * rng.uniform(0, 0.5)}
+        for period in ("1h", "12h", "24h"):
+            token[f"priceChange{period}Percent"] = rng.uniform(-30, 30)
+        return token
+
+    def random_history():
+        price, items = rng.uniform(0.5, 2), []
+        for i in range(rng.randint(0, 120)):
+            price *= 1 + rng.choice([rng.uniform(-0.25, 0.3), rng.uniform(-0.04, 0.04), 0.0])
+            items.append({"unixTime": i * 300, "c": price, "v": rng.uniform(0, 1e5)})
+        return {"success": True, "data": {"items": items}}
+
+    tokens = [random_token(i) for i in range(2000)]
+    histories = [random_history() for _ in tokens]
+
+    start = time.perf_counter()
+    for token, history in zip(tokens, histories):
+        analyze_token_for_strategy(token, price_history=history)
+    single_time = time.perf_counter() - start
+    start = time.perf_counter()
+    score_tokens(tokens, histories, top_k=20)
+    print(f"Einzeln: {single_time:.3f}s, spaltenweise Top 20: {time.perf_counter() - start:.3f}s")
\ No newline at end of file
@@ -4,11 +4,11 @@ from ui.main_window import MainWindow
 from ui.token_frame import TokenFrame
 from ui.stats_frame import StatsFrame
 from ui.social_frame import SocialFrame
-from ui.recommendation_frame import RecommendationFrame
 from ui.calls_tree import CallsTreeView
 from ui.watchlist_tree import WatchlistTreeView
 from ui.archived_calls_tree import ArchivedCallsTreeView
 from ui.main_bot import MainBot
+import data.storage as storage
 
 def main():
     # Erstelle das Root-Fenster
@@ -23,13 +23,12 @@ def main():
                             main_window.time_price_vars, main_window.time_buys_vars, main_window.time_sells_vars)
     social_frame = SocialFrame(main_window.main_containers['middle_right'], main_window.shared_vars, main_window)
     
-    # Recommendation-Frame
-    recommendation_frame = RecommendationFrame(main_window.main_containers['bottom_right'], main_window.shared_vars, main_window)
+    # Recommendation-Frame (wird bereits von MainWindow im unteren rechten Container angelegt)
+    recommendation_frame = main_window.recommendation_frame
     
     # Speichere Referenzen für den späteren Zugriff
     main_window.stats_frame = stats_frame
     main_window.social_frame = social_frame
-    main_window.recommendation_frame = recommendation_frame
     
     # Erstelle die Treeviews für die Call-Tabs
     calls_tree = CallsTreeView(main_window.tabs['calls'], main_window)
@@ -55,6 +54,16 @@ def main():
     # Auto-Refresh starten
     main_bot.auto_refresh_calls()
     
+    # Strategie-Scanner starten (nur mit Birdeye-API-Key)
+    recommendation_frame.start_scanner()
+    
+    # Beim Schließen ausstehende Änderungen sofort speichern
+    def on_close():
+        recommendation_frame.stop_scanner()
+        storage.flush()
+        root.destroy()
+    root.protocol("WM_DELETE_WINDOW", on_close)
+    
     # Starte die Hauptschleife
     root.mainloop()
 
@@ -0,0 +1,19 @@
+# Gemeinsame Einstellungen der Tests: Projektverzeichnis importierbar machen
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+import data.http_cache as http_cache
+
+
+@pytest.fixture
+def temp_http_cache(tmp_path, monkeypatch):
+    """Ersetzt den prozessweiten HTTP-Cache durch einen leeren Cache im Testverzeichnis."""
+    cache = http_cache.HttpCache(str(tmp_path / "http_cache.db"))
+    monkeypatch.setattr(http_cache, "HTTP_CACHE_ENABLED", True)
+    monkeypatch.setattr(http_cache, "_cache", cache)
+    yield cache
+    cache.close()
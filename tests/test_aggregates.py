@@ -0,0 +1,92 @@
+# Tests für die laufend gepflegten Kennzahlen (Abgleich mit einer vollständigen Neuberechnung)
+import random
+import time
+from collections import defaultdict
+
+import pytest
+
+from config import DEFAULT_BUDGET
+from data.models import Call
+from tests.test_repository import make_repository
+
+DAY = 86400
+
+
+def recompute(calls):
+    """Alle Kennzahlen direkt aus den Calls, ohne CallAggregates."""
+    active = [call for call in calls if not call.closed]
+    by_date = defaultdict(float)
+    for call in active:
+        by_date[call.datum] += call.pl_dollar
+    total = sum(call.pl_dollar for call in active)
+    closed = sum(call.pl_dollar for call in calls if call.closed)
+    return {
+        "total_profit": total,
+        "today_profit": by_date.get(time.strftime("%d.%m."), 0.0),
+        "total_investment": len(active) * 10.0,
+        "average_profit": total / len(active) if active else 0.0,
+        "current_balance": DEFAULT_BUDGET + total + closed,
+        "by_date": {date: profit for date, profit in by_date.items()},
+    }
+
+
+def incremental(aggregates):
+    return {
+        "total_profit": aggregates.total_profit(),
+        "today_profit": aggregates.today_profit(),
+        "total_investment": aggregates.total_investment(),
+        "average_profit": aggregates.average_profit(),
+        "current_balance": aggregates.current_balance(),
+        # Tage ohne aktive Calls bleiben mit (fast) 0 stehen
+        "by_date": {date: profit for date, profit in aggregates._active_profit_by_date.items()
+                    if abs(profit) > 1e-6},
+    }
+
+
+def random_call(rng, now):
+    return Call(f"T{rng.randint(0, 999)}", f"link-{rng.randint(0, 20)}", rng.uniform(1e4, 1e6),
+                rng.uniform(0, 3e6), invest=rng.choice([10.0, 20.0, rng.uniform(1, 50)]),
+                created_at=now - rng.choice([0, DAY, 2 * DAY]) - rng.uniform(0, 3600))
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_incremental_aggregates_match_recompute(tmp_path, seed):
+    rng = random.Random(seed)
+    now = time.time()
+    repository, _ = make_repository(str(tmp_path))
+
+    for step in range(300):
+        calls = repository.get_calls()
+        action = rng.choice(["add", "add", "update", "update", "close", "delete", "set"])
+        if action == "add" or not calls:
+            repository.add_call(random_call(rng, now))
+        elif action == "update":
+            changed = rng.sample(calls, rng.randint(1, min(5, len(calls))))
+            for call in changed:
+                field = rng.choice(["current_mcap", "mcap_at_call", "invest", "created_at"])
+                if field == "created_at":
+                    call.created_at = now - rng.choice([0, DAY, 2 * DAY])
+                else:
+                    setattr(call, field, rng.choice([0, rng.uniform(1e4, 3e6)]) if field != "invest"
+                            else rng.uniform(1, 50))
+            repository.update_calls(changed)
+        elif action == "close":
+            call = rng.choice(calls)
+            call.closed = not call.closed
+            repository.update_calls([call])
+        elif action == "delete":
+            repository.remove_calls([call.id for call in rng.sample(calls, rng.randint(1, min(3, len(calls))))])
+        else:
+            # Gesamte Liste ersetzen: einige behalten, einige ändern, einige neu
+            kept = [call for call in calls if rng.random() < 0.7]
+            for call in kept:
+                if rng.random() < 0.3:
+                    call.current_mcap = rng.uniform(0, 3e6)
+            repository.set_calls(kept + [random_call(rng, now) for _ in range(rng.randint(0, 3))])
+
+        expected = recompute(repository.get_calls())
+        actual = incremental(repository.get_aggregates())
+        for key in ("total_profit", "today_profit", "total_investment", "average_profit", "current_balance"):
+            assert actual[key] == pytest.approx(expected[key], abs=1e-6), (step, action, key)
+        assert actual["by_date"] == pytest.approx(
+            {date: profit for date, profit in expected["by_date"].items() if abs(profit) > 1e-6}, abs=1e-6), step
\ No newline at end of file
@@ -0,0 +1,89 @@
+# Tests für die gebündelten Dexscreener-Abrufe
+import data.api as api
+import data.http_client as http_client
+from tests.test_http_client import FakeResponse
+
+
+def pair(chain, address, market_cap):
+    return {"chainId": chain, "pairAddress": address, "marketCap": market_cap}
+
+
+def fake_dexscreener(requested):
+    """Antwortet auf Pair-Sammelanfragen mit einem Pair je Adresse."""
+    def get(url, timeout=None, params=None, headers=None):
+        requested.append(url)
+        chain, addresses = url[len(api.PAIRS_API_URL):].split("/")
+        return FakeResponse(200, {"pairs": [pair(chain, address, 1000 + len(requested))
+                                            for address in addresses.split(",")]})
+    return get
+
+
+def test_batch_is_cached_per_link(temp_http_cache, monkeypatch):
+    requested = []
+    monkeypatch.setattr(http_client, "get", fake_dexscreener(requested))
+    links = [f"https://dexscreener.com/solana/P{i}" for i in range(3)]
+
+    first = api.fetch_dexscreener_batch(links[:2])
+    assert len(requested) == 1
+    assert first[links[0]]["pairs"][0]["pairAddress"] == "P0"
+
+    # Jeder Link hat seinen eigenen Eintrag - derselbe, den peek_dexscreener_data liest
+    data, _ = api.peek_dexscreener_data(links[1])
+    assert data == first[links[1]]
+    assert temp_http_cache.get(requested[0]) is None
+
+    # Anders zusammengesetzter Block: nur der neue Link wird abgefragt
+    second = api.fetch_dexscreener_batch([links[2], links[0]])
+    assert requested[1] == f"{api.PAIRS_API_URL}solana/P2"
+    assert second[links[0]] == first[links[0]]
+
+
+def test_missing_pairs_are_not_cached(temp_http_cache, monkeypatch):
+    monkeypatch.setattr(http_client, "get", lambda *args, **kwargs: FakeResponse(200, {"pairs": None}))
+    link = "https://dexscreener.com/solana/P9"
+
+    assert api.fetch_dexscreener_batch([link]) == {link: None}
+    assert api.peek_dexscreener_data(link) is None
+
+
+def token_pair(address, base, quote, market_cap):
+    return {"pairAddress": address, "baseToken": {"address": base}, "quoteToken": {"address": quote},
+            "marketCap": market_cap}
+
+
+def test_token_batch_matches_quote_tokens_and_refetches_missing(temp_http_cache, monkeypatch, capsys):
+    requested = []
+    # Die Sammelantwort lässt C weg (begrenzte Zahl Pairs), D gibt es gar nicht
+    batch = {"pairs": [token_pair("P1", "QuoteOnly", "SOL", 1), token_pair("P2", "B", "QuoteOnly", 2),
+                       token_pair("P3", "Other", "B", 3)]}
+    singles = {"C": {"pairs": [token_pair("P4", "C", "SOL", 4)]}, "D": {"pairs": None}}
+
+    def get(url, timeout=None, params=None, headers=None):
+        requested.append(url)
+        addresses = url[len(api.TOKENS_API_URL):]
+        return FakeResponse(200, batch if "," in addresses else singles[addresses])
+
+    monkeypatch.setattr(http_client, "get", get)
+    links = ["B", "QuoteOnly", "C", "D"]
+    results = api.fetch_dexscreener_batch(links)
+
+    # B ist Basis-Token von P2 und Quote-Token von P3 - das Pair mit B als Basis steht vorn
+    assert [pair["pairAddress"] for pair in results["B"]["pairs"]] == ["P2", "P3"]
+    assert [pair["pairAddress"] for pair in results["QuoteOnly"]["pairs"]] == ["P1", "P2"]
+    assert results["C"] == singles["C"]
+    assert results["D"] is None
+    assert sorted(requested[1:]) == [f"{api.TOKENS_API_URL}C", f"{api.TOKENS_API_URL}D"]
+    assert "keine Daten für D" in capsys.readouterr().out
+    assert api.peek_dexscreener_data("D") is None
+
+
+def test_failed_batch_is_not_refetched_per_link(temp_http_cache, monkeypatch):
+    requested = []
+
+    def get(url, timeout=None, params=None, headers=None):
+        requested.append(url)
+        return FakeResponse(500, {})
+
+    monkeypatch.setattr(http_client, "get", get)
+    assert api.fetch_dexscreener_batch(["A", "B"]) == {"A": None, "B": None}
+    assert len(requested) == 1
\ No newline at end of file
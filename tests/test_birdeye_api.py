@@ -0,0 +1,130 @@
+# Tests für die seitenweise Durchsuchung der Birdeye-Token-Liste
+import pytest
+
+from data import birdeye_api
+
+
+class FakeTokenList:
+    """Nach MCAP absteigend sortierte Token-Liste; merkt sich die abgerufenen Seiten."""
+
+    def __init__(self, mcaps, failing_pages=()):
+        self.tokens = [{"address": f"T{i}", "mc": mcap, "liquidity": 50000, "v24hUSD": i * 7919 % 1009}
+                       for i, mcap in enumerate(sorted(mcaps, reverse=True))]
+        self.failing_pages = set(failing_pages)
+        self.pages = []
+
+    def __call__(self, sort_by="v24hUSD", sort_type="desc", limit=50, offset=0, min_liquidity=0):
+        assert sort_type == "desc"
+        page = offset // limit
+        self.pages.append((sort_by, page) if sort_by != "mc" else page)
+        if page in self.failing_pages:
+            return {"success": False}
+        tokens = self.tokens if sort_by == "mc" else sorted(self.tokens, key=lambda token: -token[sort_by])
+        return {"success": True, "data": {"tokens": tokens[offset:offset + limit]}}
+
+
+@pytest.fixture(autouse=True)
+def first_page_hints(monkeypatch):
+    hints = {}
+    monkeypatch.setattr(birdeye_api, "_first_page_hints", hints)
+    return hints
+
+
+@pytest.fixture
+def token_list(monkeypatch):
+    def install(*args, **kwargs):
+        fake = FakeTokenList(*args, **kwargs)
+        monkeypatch.setattr(birdeye_api, "get_token_list", fake)
+        return fake
+    return install
+
+
+def band(count_above, count_in_band, count_below):
+    """MCAP-Werte: count_above über 3M, count_in_band zwischen 100K und 3M, count_below darunter."""
+    return ([4e6 + i for i in range(count_above)] + [1e5 + i * 1000 for i in range(count_in_band)]
+            + [5e4 - i for i in range(count_below)])
+
+
+def test_find_first_page(token_list):
+    token_list(band(10 * birdeye_api.TOKEN_LIST_PAGE_SIZE + 7, 10, 10))
+    assert birdeye_api._find_first_page(3e6, 0) == 10
+
+    token_list(band(0, 10, 10))
+    assert birdeye_api._find_first_page(3e6, 0) == 0
+
+
+def test_find_first_page_starts_at_last_result(token_list):
+    size = birdeye_api.TOKEN_LIST_PAGE_SIZE
+    fake = token_list(band(37 * size + 3, 10 * size, 10))
+    assert birdeye_api._find_first_page(3e6, 0) == 37
+
+    # Unveränderter Bereich: nur die Seiten um die gemerkte Grenze
+    fake.pages.clear()
+    assert birdeye_api._find_first_page(3e6, 0) == 37
+    assert sorted(fake.pages) == [36, 37]
+
+
+@pytest.mark.parametrize("hint", [0, 1, 5, 20, 21, 22, 30, 200])
+@pytest.mark.parametrize("first_page", [0, 1, 6, 21, 60])
+def test_find_first_page_with_moved_range(token_list, first_page_hints, hint, first_page):
+    size = birdeye_api.TOKEN_LIST_PAGE_SIZE
+    token_list(band(first_page * size + 7 if first_page else 7, 5 * size, 10))
+    first_page_hints[(3e6, 0)] = hint
+    assert birdeye_api._find_first_page(3e6, 0) == first_page
+
+
+@pytest.mark.parametrize("failing_page", [0, 4, 8])
+def test_failed_page_aborts_search(token_list, failing_page):
+    fake = token_list(band(10 * birdeye_api.TOKEN_LIST_PAGE_SIZE + 7, 10, 10), failing_pages=[failing_page])
+
+    assert birdeye_api._find_first_page(3e6, 0) is None
+    assert fake.pages[-1] == failing_page
+    assert birdeye_api.crawl_token_list(1e5, 3e6) is None
+
+
+def test_crawl_returns_tokens_in_band(token_list):
+    token_list(band(3 * birdeye_api.TOKEN_LIST_PAGE_SIZE + 20, 120, 30))
+
+    tokens = birdeye_api.crawl_token_list(1e5, 3e6, max_pages=10, max_workers=2)
+    assert len(tokens) == 120
+    assert all(1e5 <= token["mc"] <= 3e6 for token in tokens)
+
+
+@pytest.mark.parametrize("max_workers", [1, 3])
+def test_crawl_requests_pages_lazily(token_list, max_workers, monkeypatch):
+    size = birdeye_api.TOKEN_LIST_PAGE_SIZE
+    # Bereich auf den Seiten 2 bis 4, Seite 4 reicht unter mcap_min
+    fake = token_list(band(2 * size, 2 * size + 10, 10 * size))
+    monkeypatch.setattr(birdeye_api, "_find_first_page", lambda mcap_max, min_liquidity: 2)
+
+    tokens = birdeye_api.crawl_token_list(1e5, 3e6, max_pages=10, max_workers=max_workers)
+    assert len(tokens) == 2 * size + 10
+    assert fake.pages[:3] == [2, 3, 4]
+    # Nach dem Ende des Bereichs werden höchstens max_workers - 1 Seiten zu viel angefordert
+    assert len(fake.pages) <= 3 + max_workers - 1
+
+
+def test_crawl_stops_after_max_pages(token_list):
+    size = birdeye_api.TOKEN_LIST_PAGE_SIZE
+    fake = token_list(band(0, 20 * size, 0))
+
+    tokens = birdeye_api.crawl_token_list(1e5, 3e6, max_pages=3, max_workers=2)
+    assert len(tokens) == 3 * size
+    assert max(fake.pages) == 2
+
+
+def test_filtered_tokens_read_one_page_unless_deep(token_list):
+    size = birdeye_api.TOKEN_LIST_PAGE_SIZE
+    fake = token_list(band(5 * size, 3 * size, size))
+
+    def by_volume(tokens):
+        return sorted(tokens, key=lambda token: -token["v24hUSD"])
+
+    tokens = birdeye_api.get_filtered_tokens(limit=10)
+    assert fake.pages == [("v24hUSD", 0)]
+    assert tokens == [token for token in by_volume(fake.tokens)[:size] if 1e5 <= token["mc"] <= 3e6][:10]
+
+    fake.pages.clear()
+    tokens = birdeye_api.get_filtered_tokens(limit=500, deep=True)
+    assert all(isinstance(page, int) for page in fake.pages)
+    assert tokens == by_volume([token for token in fake.tokens if 1e5 <= token["mc"] <= 3e6])
\ No newline at end of file
@@ -0,0 +1,97 @@
+# Tests für den In-Memory-Cache mit Ablaufzeit und LRU-Verdrängung
+import pytest
+
+from data import cache
+from data.cache import MISSING, TTLCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_evicts_least_recently_used(clock):
+    entries = TTLCache(maxsize=3)
+    for key in "abc":
+        entries.set(key, key.upper())
+
+    # Lesen und Überschreiben zählen als Nutzung
+    assert entries.get("a") == "A"
+    entries.set("b", "B2")
+    entries.set("d", "D")
+    assert entries.get("c") is MISSING
+    entries.set("e", "E")
+    assert entries.get("a") is MISSING
+    assert [entries.get(key) for key in "bde"] == ["B2", "D", "E"]
+    assert len(entries) == 3
+    assert entries.stats()["evictions"] == 2
+
+
+def test_entries_expire_after_their_ttl(clock):
+    entries = TTLCache(ttl=60)
+    entries.set("default", 1)
+    entries.set("short", 2, ttl=5)
+
+    clock[0] += 4.9
+    assert entries.get("short") == 2
+    clock[0] += 0.1
+    assert entries.get("short", None) is None
+    # Abgelaufene Einträge werden beim Lesen entfernt
+    assert len(entries) == 1
+
+    clock[0] += 54.9
+    assert entries.get("default") == 1
+    clock[0] += 0.1
+    assert entries.get("default") is MISSING
+    assert len(entries) == 0
+
+
+def test_get_or_fetch_caches_only_accepted_values(clock):
+    entries = TTLCache()
+    calls = []
+
+    def fetch(value):
+        def fetch_value():
+            calls.append(value)
+            return value
+        return fetch_value
+
+    # Standard: None wird nicht gespeichert
+    assert entries.get_or_fetch("key", fetch(None)) is None
+    assert entries.get_or_fetch("key", fetch({"success": True})) == {"success": True}
+    assert entries.get_or_fetch("key", fetch("unused")) == {"success": True}
+    assert calls == [None, {"success": True}]
+
+    def successful(value):
+        return not (isinstance(value, dict) and value.get("success") is False)
+
+    failure = {"success": False}
+    assert entries.get_or_fetch("other", fetch(failure), cache_if=successful) == failure
+    assert entries.get_or_fetch("other", fetch(failure), cache_if=successful) == failure
+    assert calls[-2:] == [failure, failure]
+
+    # Eigene TTL je Abruf
+    entries.get_or_fetch("short", fetch(1), ttl=1)
+    clock[0] += 1
+    assert entries.get_or_fetch("short", fetch(2), ttl=1) == 2
+
+
+def test_counts_hits_and_misses(clock):
+    entries = TTLCache(maxsize=1)
+    assert entries.stats() == {"size": 0, "maxsize": 1, "hits": 0, "misses": 0, "hit_rate": 0.0, "evictions": 0}
+
+    entries.get("a")
+    entries.set("a", None)
+    # Ein gespeichertes None ist ein Treffer
+    assert entries.get("a", "default") is None
+    entries.get("a")
+    entries.set("b", 1)
+    assert entries.get("a") is MISSING
+
+    assert entries.stats() == {"size": 1, "maxsize": 1, "hits": 2, "misses": 2, "hit_rate": 0.5, "evictions": 1}
+    # clear() leert nur die Einträge, die Zähler bleiben
+    entries.clear()
+    assert entries.stats()["size"] == 0
+    assert entries.stats()["hits"] == 2
\ No newline at end of file
@@ -0,0 +1,75 @@
+# Test des Dexscreener-Clients gegen einen lokalen Stub-Server (DEXSCREENER_API_BASE)
+import importlib
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import config
+import data.api as api
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Beantwortet Sammelanfragen wie Dexscreener; Adressen FAIL/BROKEN erzeugen Fehler."""
+
+    def do_GET(self):
+        self.server.requested.append(self.path)
+        kind, rest = self.path.split("/latest/dex/")[1].split("/", 1)
+        if kind == "pairs":
+            chain, addresses = rest.split("/")
+            pairs = [{"chainId": chain, "pairAddress": a, "marketCap": 1000} for a in addresses.split(",")]
+        else:
+            addresses = rest
+            pairs = [{"baseToken": {"address": a}, "pairAddress": f"{a}-{i}", "marketCap": 2000 + i}
+                     for a in addresses.split(",") for i in range(2)]
+        if "FAIL" in addresses:
+            self.send_response(500)
+            self.end_headers()
+            return
+        body = b"{kaputt" if "BROKEN" in addresses else json.dumps({"pairs": pairs}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub_api(monkeypatch, temp_http_cache):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    server.requested = []
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    monkeypatch.setenv("DEXSCREENER_API_BASE", f"http://127.0.0.1:{server.server_port}")
+    importlib.reload(config)
+    importlib.reload(api)
+    yield server
+    server.shutdown()
+    server.server_close()
+    monkeypatch.undo()
+    importlib.reload(config)
+    importlib.reload(api)
+
+
+def test_links_are_batched_per_chain(stub_api):
+    links = [f"https://dexscreener.com/solana/S{i}" for i in range(config.DEXSCREENER_BATCH_SIZE + 5)]
+    links += ["https://dexscreener.com/ethereum/E1", "TokenA", "TokenB"]
+    results = api.fetch_dexscreener_batch(links)
+
+    # 2 Blöcke für solana, 1 für ethereum, 1 für die Token-Adressen
+    assert len(stub_api.requested) == 4
+    assert all(results[link]["pairs"][0]["marketCap"] == 1000 for link in links[:-2])
+    assert [pair["pairAddress"] for pair in results["TokenA"]["pairs"]] == ["TokenA-0", "TokenA-1"]
+
+
+def test_errors_only_affect_their_block(stub_api):
+    links = ["https://dexscreener.com/solana/S1", "https://dexscreener.com/ethereum/FAIL",
+             "https://dexscreener.com/base/BROKEN"]
+    results = api.fetch_dexscreener_batch(links)
+
+    assert results[links[0]]["pairs"][0]["pairAddress"] == "S1"
+    assert results[links[1]] is None
+    assert results[links[2]] is None
@@ -0,0 +1,43 @@
+# Tests für das Ereignisprotokoll der Calls
+import os
+
+from data.backends import JsonBackend
+from data.event_log import EventLogBackend
+
+
+def make_backend(directory):
+    inner = JsonBackend(os.path.join(directory, "calls.json"), os.path.join(directory, "watchlist.json"),
+                        os.path.join(directory, "budget.txt"))
+    return EventLogBackend(inner, directory=os.path.join(directory, "event_log"), compact_after=1000)
+
+
+def call(call_id, mcap):
+    return {"ID": call_id, "Symbol": f"T{call_id}", "Aktuelles_MCAP": mcap}
+
+
+def test_reload_replays_events(tmp_path):
+    backend = make_backend(str(tmp_path))
+    backend.load_calls()
+    backend.save_calls([call(1, "10K")])
+    backend.save_calls([call(1, "12K"), call(2, "5K")])
+
+    assert make_backend(str(tmp_path)).load_calls() == [call(1, "12K"), call(2, "5K")]
+
+
+def test_event_after_cut_off_line_survives_reload(tmp_path):
+    backend = make_backend(str(tmp_path))
+    backend.load_calls()
+    backend.save_calls([call(1, "10K")])
+    backend.save_calls([call(1, "11K")])
+
+    # Absturz mitten im Schreiben: letzte Zeile ohne Zeilenende
+    with open(backend.log_file, "a") as f:
+        f.write('{"type": "mcap", "key": "1", "fields": {"Aktuelles_MCAP": "1')
+
+    restarted = make_backend(str(tmp_path))
+    assert restarted.load_calls() == [call(1, "11K")]
+    restarted.save_calls([call(1, "13K")])
+
+    assert make_backend(str(tmp_path)).load_calls() == [call(1, "13K")]
+    with open(backend.log_file, "rb") as f:
+        assert f.read().endswith(b"\n")
@@ -0,0 +1,54 @@
+# Tests für den HTTP-Client mit persistentem Cache
+import requests
+
+import data.http_client as http_client
+
+URL = "https://example.invalid/latest/dex/tokens/A"
+
+
+class FakeResponse:
+    def __init__(self, status_code, data=None, headers=None):
+        self.status_code = status_code
+        self._data = data
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.exceptions.HTTPError(f"HTTP {self.status_code}")
+
+    def json(self):
+        return self._data
+
+
+def test_failed_request_does_not_return_stale_entry(temp_http_cache, monkeypatch):
+    temp_http_cache.put(URL, {"pairs": ["alt"]}, ttl=-1)
+
+    def fail(*args, **kwargs):
+        raise requests.exceptions.ConnectionError("offline")
+
+    monkeypatch.setattr(http_client, "get", fail)
+    assert http_client.get_json_cached(URL, ttl=10) is None
+
+    # Die alte Antwort bleibt samt Alter über peek_entry lesbar
+    entry = http_client.peek_entry(URL)
+    assert entry.data == {"pairs": ["alt"]} and not entry.fresh
+
+
+def test_http_error_returns_none(temp_http_cache, monkeypatch):
+    temp_http_cache.put(URL, {"pairs": ["alt"]}, ttl=-1)
+    monkeypatch.setattr(http_client, "get", lambda *args, **kwargs: FakeResponse(500))
+    assert http_client.get_json_cached(URL, ttl=10) is None
+
+
+def test_not_modified_renews_entry(temp_http_cache, monkeypatch):
+    temp_http_cache.put(URL, {"pairs": ["alt"]}, ttl=-1, etag='"v1"')
+    seen_headers = []
+
+    def not_modified(url, timeout, params, headers):
+        seen_headers.append(headers)
+        return FakeResponse(304)
+
+    monkeypatch.setattr(http_client, "get", not_modified)
+    assert http_client.get_json_cached(URL, ttl=10) == {"pairs": ["alt"]}
+    assert seen_headers[0].get("If-None-Match") == '"v1"'
+    assert http_client.peek_entry(URL).fresh
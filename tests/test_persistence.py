@@ -0,0 +1,88 @@
+# Tests für das verzögerte Speichern und das vollständige Backup
+import os
+
+import pytest
+
+from data import persistence
+from data.backends import JsonBackend
+from data.event_log import EventLogBackend
+from data.models import Call
+from data.repository import DataRepository
+from data.sqlite_backend import SqliteBackend
+
+
+@pytest.fixture
+def backup_writes(tmp_path, monkeypatch):
+    """Leitet die Backups ins Testverzeichnis um und merkt sich jedes geschriebene vollständige Backup."""
+    backup_file = str(tmp_path / "complete_backup.json")
+    monkeypatch.setattr(persistence, "BACKUP_FILE", backup_file)
+    monkeypatch.setattr(persistence, "BACKUP_DIR", str(tmp_path / "backups"))
+    monkeypatch.setattr(persistence.atexit, "register", lambda function: None)
+    written = []
+    write_json = persistence.write_json
+
+    def recording_write_json(path, data):
+        if path == backup_file:
+            written.append(data)
+        write_json(path, data)
+
+    monkeypatch.setattr(persistence, "write_json", recording_write_json)
+    return written
+
+
+def json_backend(directory):
+    return JsonBackend(os.path.join(directory, "calls.json"), os.path.join(directory, "watchlist.json"),
+                       os.path.join(directory, "budget.txt"))
+
+
+def event_log_backend(directory, compact_after=1000):
+    return EventLogBackend(json_backend(directory), directory=os.path.join(directory, "event_log"),
+                           compact_after=compact_after)
+
+
+def edit_and_flush(repository, scheduler, ticks, start=2000):
+    for tick in range(ticks):
+        calls = repository.get_calls()
+        calls[0].current_mcap = start + tick
+        repository.update_calls([calls[0]])
+        scheduler.flush()
+
+
+@pytest.mark.parametrize("make_backend, backups_per_flush", [
+    (json_backend, True),
+    (lambda directory: SqliteBackend(os.path.join(directory, "callbot.db")), False),
+    (event_log_backend, False),
+])
+def test_backup_per_flush_only_for_full_rewrite_backends(tmp_path, backup_writes, make_backend, backups_per_flush):
+    repository = DataRepository(make_backend(str(tmp_path)))
+    repository.get_calls()
+    scheduler = persistence.PersistenceScheduler(repository, interval=3600)
+    repository.set_calls([Call("A", "link-a", 1000, 1500)])
+    scheduler.flush()
+    assert len(backup_writes) == 1  # erstes Backup zusammen mit dem rotierten
+
+    edit_and_flush(repository, scheduler, 5)
+    assert len(backup_writes) == (6 if backups_per_flush else 1)
+
+    # Nach BACKUP_ROTATE_INTERVAL entsteht das Backup wieder mit dem aktuellen Stand
+    scheduler._last_rotation -= persistence.BACKUP_ROTATE_INTERVAL
+    edit_and_flush(repository, scheduler, 1)
+    assert len(backup_writes) == (7 if backups_per_flush else 2)
+    assert backup_writes[-1]["calls"][0]["Aktuelles_MCAP"] == 2000
+    repository.backend.close()
+
+
+def test_event_log_writes_backup_after_compaction(tmp_path, backup_writes):
+    repository = DataRepository(event_log_backend(str(tmp_path), compact_after=3))
+    repository.get_calls()
+    scheduler = persistence.PersistenceScheduler(repository, interval=3600)
+    repository.set_calls([Call("A", "link-a", 1000, 1500)])
+    scheduler.flush()
+    assert len(backup_writes) == 1
+
+    # Ereignisse 2 und 3 nur anhängen, mit dem dritten folgt der Snapshot und damit das Backup
+    edit_and_flush(repository, scheduler, 1, start=2000)
+    assert len(backup_writes) == 1
+    edit_and_flush(repository, scheduler, 1, start=2001)
+    assert len(backup_writes) == 2
+    assert backup_writes[-1]["calls"][0]["Aktuelles_MCAP"] == 2001
\ No newline at end of file
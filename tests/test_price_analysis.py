@@ -0,0 +1,113 @@
+# Tests für die vektorisierte Preishistorie-Analyse (Abgleich mit der Python-Version)
+import random
+
+import pytest
+
+from data import birdeye_api
+from data.price_analysis import analyze_price_histories, analyze_price_responses
+
+
+def random_candles(rng, count, shuffle=True):
+    price = rng.uniform(0.5, 2)
+    candles = []
+    for i in range(count):
+        # Pump, Dip und Seitwärtsphasen in zufälliger Folge
+        price *= 1 + rng.choice([rng.uniform(-0.25, 0.3), rng.uniform(-0.04, 0.04), 0.0])
+        candles.append({"time": 1000 + i * 300, "close": price, "volume": rng.choice([0, rng.uniform(0, 1e5)])})
+    if shuffle:
+        rng.shuffle(candles)
+    return candles
+
+
+def second_bounce():
+    closes = [1.0, 1.5, 2.0, 1.8, 1.6, 1.4, 1.5, 1.52, 1.55, 1.56, 1.58, 1.7]
+    return [{"time": i, "close": close, "volume": 100 * (i + 1)} for i, close in enumerate(closes)]
+
+
+def reference(samples):
+    return [birdeye_api.analyze_price_history(candles) for candles in samples]
+
+
+def test_matches_python_version_on_random_samples():
+    rng = random.Random(42)
+    samples = [random_candles(rng, rng.randint(0, 120)) for _ in range(500)]
+    samples.append(second_bounce())
+
+    expected = reference(samples)
+    assert analyze_price_histories(samples) == expected
+    assert any(result["dip_detected"] for result in expected)
+    assert any(result["bounce_detected"] for result in expected)
+
+
+@pytest.mark.parametrize("count", [0, 1, 9, 10, 11])
+def test_few_candles(count):
+    samples = [random_candles(random.Random(count), count)]
+    assert analyze_price_histories(samples) == reference(samples)
+
+
+def test_zero_prices():
+    rng = random.Random(7)
+    zeros = [{"time": i, "close": 0.0, "volume": 0} for i in range(20)]
+    zero_low = random_candles(rng, 30, shuffle=False)
+    for candle in zero_low[20:25]:
+        candle["close"] = 0.0
+    samples = [zeros, zero_low, [dict(candle, close=0.0) for candle in second_bounce()]]
+    assert analyze_price_histories(samples) == reference(samples)
+
+
+def test_unsorted_times_and_duplicates():
+    rng = random.Random(3)
+    descending = list(reversed(second_bounce()))
+    duplicates = [dict(candle, time=candle["time"] // 3) for candle in random_candles(rng, 40, shuffle=False)]
+    fractional = [dict(candle, time=candle["time"] + 0.5 * (i % 2)) for i, candle in enumerate(random_candles(rng, 40))]
+    samples = [descending, duplicates, fractional, random_candles(rng, 60)]
+    assert analyze_price_histories(samples) == reference(samples)
+
+
+def test_missing_fields_and_strings_use_fallback():
+    candles = second_bounce()
+    del candles[3]["volume"]
+    candles[4]["close"] = "1.6"
+    samples = [candles, second_bounce()]
+    assert analyze_price_histories(samples) == reference(samples)
+
+
+def test_empty_batch():
+    assert analyze_price_histories([]) == []
+
+
+def test_price_responses_match_extract_candles():
+    rng = random.Random(11)
+    ohlcv = {"success": True, "data": {"items": [
+        {"unixTime": candle["time"], "c": candle["close"], "v": candle["volume"]}
+        for candle in random_candles(rng, 50)]}}
+    price_history = {"success": True, "data": {"items": [
+        {"unixTime": candle["time"], "value": candle["close"]} for candle in random_candles(rng, 30)]}}
+    responses = [
+        {"success": True, "data": {"candles": second_bounce()}},
+        ohlcv,
+        price_history,
+        {"success": False},
+        {"success": True, "data": {"items": []}},
+        None,
+    ]
+
+    expected = []
+    for response in responses:
+        candles = birdeye_api.extract_candles(response)
+        expected.append(birdeye_api.analyze_price_history(candles) if candles else None)
+    assert analyze_price_responses(responses) == expected
+
+
+def test_price_arrays_match_python_version():
+    np = pytest.importorskip("numpy")
+    from data.price_analysis import analyze_price_arrays
+
+    rng = random.Random(5)
+    samples = [random_candles(rng, 40, shuffle=False) for _ in range(20)]
+    lengths = [rng.randint(5, 40) for _ in samples]
+    prices = np.array([[candle["close"] for candle in candles] for candles in samples])
+    volumes = np.array([[candle["volume"] for candle in candles] for candles in samples])
+
+    expected = reference([candles[:length] for candles, length in zip(samples, lengths)])
+    assert analyze_price_arrays(prices, volumes, lengths) == expected
\ No newline at end of file
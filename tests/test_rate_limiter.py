@@ -0,0 +1,86 @@
+# Tests für den Token-Bucket-Rate-Limiter (mit simulierter Uhr)
+import pytest
+
+from data import rate_limiter
+from data.rate_limiter import RateLimiter, TokenBucket
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(rate_limiter.time, "monotonic", clock.monotonic)
+    monkeypatch.setattr(rate_limiter.time, "sleep", clock.sleep)
+    return clock
+
+
+def test_bucket_allows_burst_then_rate(clock):
+    bucket = TokenBucket(rate=2.0, capacity=3)
+    for _ in range(3):
+        assert bucket.wait_time(clock.now) == 0
+        bucket.take(clock.now)
+    assert bucket.wait_time(clock.now) == pytest.approx(0.5)
+
+    # Nach einer Pause höchstens wieder `capacity` Anfragen am Stück
+    clock.now += 60
+    for _ in range(3):
+        bucket.take(clock.now)
+    assert bucket.wait_time(clock.now) == pytest.approx(0.5)
+
+
+def test_try_acquire_rotates_keys_and_reports_wait(clock):
+    limiter = RateLimiter(["a", "b", "a", ""], rate=1 / 1.2)
+    assert limiter.keys == ["a", "b"]
+
+    assert {limiter.try_acquire()[0], limiter.try_acquire()[0]} == {"a", "b"}
+    assert limiter.try_acquire() == (None, pytest.approx(1.2))
+
+    clock.now += 0.6
+    assert limiter.try_acquire() == (None, pytest.approx(0.6))
+    clock.now += 0.6
+    assert limiter.try_acquire()[0] in {"a", "b"}
+
+
+def test_endpoint_budget_is_shared_by_all_keys(clock):
+    limiter = RateLimiter(["a", "b"], rate=10, burst=5, endpoint_limits={"/defi/tokenlist": (0.5, 2)})
+    assert limiter.try_acquire("/defi/tokenlist")[1] == 0
+    assert limiter.try_acquire("/defi/tokenlist")[1] == 0
+    assert limiter.try_acquire("/defi/tokenlist") == (None, pytest.approx(2.0))
+    # Andere Endpunkte sind nicht betroffen
+    assert limiter.try_acquire("/defi/price_history")[0] is not None
+
+
+def test_penalize_blocks_key_until_retry_after(clock):
+    limiter = RateLimiter(["a", "b"], rate=1, burst=5)
+    limiter.penalize("a", 30)
+    assert [limiter.try_acquire()[0] for _ in range(5)] == ["b"] * 5
+    assert limiter.try_acquire() == (None, pytest.approx(1.0))
+
+    single = RateLimiter(["a"], rate=1, burst=5)
+    single.penalize("a", 30)
+    assert single.try_acquire() == (None, pytest.approx(30))
+    # Nach der Sperre kein Burst (er löste womöglich erst das 429 aus), sondern die normale Rate
+    clock.now += 30
+    assert single.try_acquire()[0] == "a"
+    assert single.try_acquire() == (None, pytest.approx(1.0))
+
+
+def test_acquire_waits_only_as_long_as_needed(clock):
+    limiter = RateLimiter(["a"], rate=0.5)
+    start = clock.now
+    assert limiter.acquire() == "a"
+    assert limiter.acquire() == "a"
+    assert clock.now - start == pytest.approx(2.0)
+
+    assert limiter.acquire(timeout=1.0) is None
+    assert RateLimiter([], rate=1).acquire() is None
\ No newline at end of file
@@ -0,0 +1,96 @@
+# Tests für die Auswertung der Hintergrund-Aktualisierung
+import time
+
+import data.api as api
+from data.models import Call
+from data.refresh_engine import (RefreshEngine, compute_observations, compute_updates, response_times,
+                                 updated_market_cap)
+
+
+def response(market_cap):
+    return {"pairs": [{"marketCap": market_cap}]}
+
+
+def test_updates_are_keyed_by_call_id():
+    # Gleicher Link, gleiches MCAP at Call und gleicher Invest
+    first = Call("A", "link-a", 1000, 1000)
+    second = Call("A", "link-a", 1000, 1000)
+    updates = compute_updates([first, second], {"link-a": response(2500)})
+
+    assert set(updates) == {first.id, second.id}
+    assert updated_market_cap(first, updates) == 2500
+    assert updated_market_cap(second, updates) == 2500
+
+
+def test_update_survives_edit_but_not_link_change():
+    call = Call("A", "link-a", 1000, 1000)
+    updates = compute_updates([call], {"link-a": response(2500)})
+
+    edited = call.copy()
+    edited.mcap_at_call = 1200
+    edited.invest = 20
+    assert updated_market_cap(edited, updates) == 2500
+
+    edited.link = "link-b"
+    assert updated_market_cap(edited, updates) is None
+
+
+def test_missing_market_cap_keeps_last_value():
+    call = Call("A", "link-a", 1000, 1000)
+    assert compute_updates([call], {"link-a": response(0), "link-b": None}) == {}
+
+
+def test_observations_carry_time_of_cached_response(temp_http_cache):
+    cached_link, fetched_link = "https://dexscreener.com/solana/P1", "https://dexscreener.com/solana/P2"
+    api.http_client.store_json(api.convert_to_api_link(cached_link), response(2500), 10)
+    stored_at = api.peek_dexscreener_data(cached_link)[1]
+    results = {cached_link: response(2500), fetched_link: response(3000), "link-c": None}
+
+    times = response_times(results, now=stored_at + 8)
+    assert times == {cached_link: stored_at, fetched_link: stored_at + 8}
+    assert compute_observations(results, times) == {cached_link: (2500, None, stored_at),
+                                                    fetched_link: (3000, None, stored_at + 8)}
+
+
+def run_engine(engine, calls, watchlist, links):
+    """Führt einen Auftrag aus und gibt die Ergebnisse zurück, sobald der Worker fertig ist."""
+    engine.start()
+    engine.submit(calls, watchlist, links)
+    while engine.is_busy() and engine._results.empty():
+        time.sleep(0.01)
+    engine.stop()
+    return engine.poll_results()
+
+
+def test_main_links_keep_age_of_cached_response(temp_http_cache, monkeypatch):
+    link = "https://dexscreener.com/solana/P1"
+    api.http_client.store_json(api.convert_to_api_link(link), response(2500), 10)
+    stored_at = api.peek_dexscreener_data(link)[1]
+    monkeypatch.setattr(api, "fetch_dexscreener_batch", lambda links, timeout: {link: response(2500)})
+
+    [result] = run_engine(RefreshEngine(), [], [], [link])
+    assert result["links"] == {link: response(2500)}
+    assert result["response_times"][link] == stored_at
+
+
+def test_engine_stays_busy_until_results_are_polled(monkeypatch):
+    monkeypatch.setattr(api, "fetch_dexscreener_batch", lambda links, timeout: {link: None for link in links})
+    engine = RefreshEngine()
+    engine.start()
+    engine.submit([Call("A", "link-a", 1000, 1000)], [], [])
+    while engine._results.empty():
+        time.sleep(0.01)
+    # Fertig, aber noch nicht abgeholt: kein neuer Auftrag, die Links gelten noch nicht als abgerufen
+    assert engine.is_busy()
+    [result] = engine.poll_results()
+    assert result["fetched"] == ["link-a"]
+    assert not engine.is_busy()
+    engine.stop()
+
+
+def test_failed_job_delivers_nothing_and_frees_engine(monkeypatch):
+    def fail(links, timeout):
+        raise RuntimeError("kaputt")
+
+    monkeypatch.setattr(api, "fetch_dexscreener_batch", fail)
+    assert run_engine(RefreshEngine(), [Call("A", "link-a", 1000, 1000)], [], []) == []
\ No newline at end of file
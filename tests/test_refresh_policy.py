@@ -0,0 +1,72 @@
+# Tests für die adaptiven Aktualisierungsintervalle
+import pytest
+
+from data.refresh_policy import SMOOTHING, AdaptiveRefreshPolicy
+
+
+@pytest.fixture
+def policy():
+    return AdaptiveRefreshPolicy(min_interval=10, max_interval=300, hot_change=5.0, recent_age=3600,
+                                 default_interval=20)
+
+
+def test_interval_scales_with_activity(policy):
+    assert policy.interval("unknown", now=0) == 20
+
+    intervals = []
+    for change_m5 in (0, 0.05, 0.5, 2, 5, 40):
+        policy.observe("link", 1000, change_m5, now=0)
+        intervals.append(policy.interval("link", now=0))
+
+    assert intervals[0] == 300
+    assert intervals[-2] == pytest.approx(10)
+    assert intervals[-1] == pytest.approx(10)
+    assert intervals == sorted(intervals, reverse=True)
+    # Wurzel-Skala: 1,25 % (ein Viertel von hot_change) liegt in der Mitte (geometrisch)
+    policy.observe("link", 1000, 1.25, now=0)
+    assert policy.interval("link", now=0) == pytest.approx((10 * 300) ** 0.5)
+
+
+def test_recent_calls_are_capped_at_default_interval(policy):
+    policy.observe("link", 1000, 0, now=0)
+    assert policy.interval("link", created_at=5000 - 3599, now=5000) == 20
+    assert policy.interval("link", created_at=5000 - 3600, now=5000) == 300
+    # Schneller als das Standardintervall bleibt es trotzdem
+    policy.observe("hot", 1000, 10, now=0)
+    assert policy.interval("hot", created_at=5000, now=5000) == pytest.approx(10)
+
+
+def test_drift_is_smoothed_per_five_minutes(policy):
+    policy.observe("link", 1000, now=0)
+    assert policy.activity("link") is None
+
+    # +1 % in 60 s -> 5 % pro 5 Minuten
+    policy.observe("link", 1010, now=60)
+    assert policy.activity("link") == pytest.approx(5)
+    # Keine Bewegung in 300 s -> Mittel aus 0 und 5
+    policy.observe("link", 1010, now=360)
+    assert policy.activity("link") == pytest.approx(SMOOTHING * 0 + (1 - SMOOTHING) * 5)
+
+    # priceChange.m5 zählt, wenn es größer ist
+    policy.observe("link", 1010, -8, now=420)
+    assert policy.activity("link") == 8
+
+
+def test_repeated_response_is_not_a_sample(policy):
+    policy.observe("link", 1000, now=0)
+    policy.observe("link", 1010, now=60)
+    # Dieselbe Antwort aus dem Cache (gleiches stored_at) und eine ältere ändern nichts
+    policy.observe("link", 1010, now=60)
+    policy.observe("link", 1000, now=30)
+    assert policy.activity("link") == pytest.approx(5)
+
+    policy.observe("link", 1010, now=120)
+    assert policy.activity("link") == pytest.approx(SMOOTHING * 0 + (1 - SMOOTHING) * 5)
+
+
+def test_retain_drops_other_links(policy):
+    policy.observe("a", 1000, 3, now=0)
+    policy.observe("b", 1000, 3, now=0)
+    policy.retain(["a"])
+    assert policy.activity("a") == 3
+    assert policy.activity("b") is None
\ No newline at end of file
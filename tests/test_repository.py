@@ -0,0 +1,48 @@
+# Tests für das In-Memory-Repository
+import os
+
+from data.backends import JsonBackend
+from data.models import Call
+from data.repository import DataRepository
+
+
+def make_repository(directory):
+    backend = JsonBackend(os.path.join(directory, "calls.json"), os.path.join(directory, "watchlist.json"),
+                          os.path.join(directory, "budget.txt"))
+    repository = DataRepository(backend)
+    published = []
+    for topic in ("calls", "watchlist"):
+        repository.events.subscribe(topic, lambda topic=topic: published.append(topic))
+    repository.get_calls()
+    return repository, published
+
+
+def test_set_without_change_does_not_publish(tmp_path):
+    repository, published = make_repository(str(tmp_path))
+    repository.set_calls([Call("A", "link-a", 1000, 1500)])
+    repository.set_watchlist([Call("B", "link-b", 2000, 2000)])
+    published.clear()
+
+    repository.set_calls(repository.get_calls())
+    repository.set_watchlist(repository.get_watchlist())
+    assert published == []
+
+    calls = repository.get_calls()
+    calls[0].current_mcap = 1600
+    repository.set_calls(calls)
+    assert published == ["calls"]
+
+
+def test_update_calls_publishes_only_changes(tmp_path):
+    repository, published = make_repository(str(tmp_path))
+    repository.set_calls([Call("A", "link-a", 1000, 1500), Call("B", "link-b", 1000, 900)])
+    published.clear()
+
+    calls = repository.get_calls()
+    assert repository.update_calls(calls) == 0
+    assert published == []
+
+    calls[1].current_mcap = 1200
+    assert repository.update_calls([calls[1]]) == 1
+    assert published == ["calls"]
+    assert [call.current_mcap for call in repository.get_calls()] == [1500, 1200]
@@ -0,0 +1,113 @@
+# Tests für den gemeinsamen Scheduler und die gebündelten Link-Wünsche
+import pytest
+
+from data import scheduler
+from data.scheduler import Scheduler, TokenDemand
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Feste monotone Uhr für add_task/resume (run_due und due bekommen `now` direkt)."""
+    now = [100.0]
+    monkeypatch.setattr(scheduler.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_links_are_deduplicated_across_consumers():
+    demand = TokenDemand()
+    demand.set("calls", {"a": 60, "b": 30})
+    demand.set("main", {"a": 10, "": 5})
+
+    assert sorted(demand.links()) == ["a", "b"]
+    assert demand.interval("a") == 10
+    assert demand.consumers("a") == ["calls", "main"]
+
+    # Ein Abruf zählt für alle Verbraucher
+    demand.mark_fetched(["a", "b"], now=0)
+    assert demand.due(now=9) == []
+    assert demand.due(now=10) == ["a"]
+
+    # Ohne "main" gilt wieder das Intervall der Calls, der letzte Abruf bleibt gemerkt
+    demand.clear("main")
+    assert demand.interval("a") == 60
+    assert demand.due(now=10) == []
+    assert demand.due(now=30) == ["b"]
+
+
+def test_each_link_keeps_its_interval():
+    demand = TokenDemand()
+    demand.set("calls", {"fast": 10, "slow": 300})
+    assert sorted(demand.due(now=0)) == ["fast", "slow"]
+    demand.mark_fetched(["fast", "slow"], now=0)
+
+    fetched = {"fast": 0, "slow": 0}
+    for now in range(1, 601):
+        due = demand.due(now=now)
+        demand.mark_fetched(due, now=now)
+        for link in due:
+            fetched[link] += 1
+    assert fetched == {"fast": 60, "slow": 2}
+
+
+def test_align_window_pulls_in_links_due_soon():
+    demand = TokenDemand()
+    demand.set("calls", {"a": 10, "b": 12, "c": 30})
+    demand.mark_fetched(["a", "b", "c"], now=0)
+
+    # Nichts fällig - das Fenster allein löst keinen Abruf aus
+    assert demand.due(now=9, align_window=5) == []
+    # a ist fällig, b würde in 2 s fällig und läuft mit, c erst in 20 s
+    assert sorted(demand.due(now=10, align_window=5)) == ["a", "b"]
+    assert demand.due(now=10) == ["a"]
+
+
+def test_removed_links_forget_their_last_fetch():
+    demand = TokenDemand()
+    demand.set("calls", {"a": 60})
+    demand.mark_fetched(["a", "unknown"], now=0)
+    demand.clear("calls")
+    demand.set("calls", {"a": 60})
+    assert demand.due(now=1) == ["a"]
+
+
+def test_run_due_aligns_tasks_to_ticks(clock):
+    runs = []
+    timer = Scheduler(tick=0.5)
+    timer.add_task("poll", 0.5, lambda: runs.append("poll"), delay=0)
+    timer.add_task("refresh", 1.2, lambda: runs.append("refresh"))
+
+    assert timer.run_due(now=100.0) == ["poll"]
+    # 101.2 wird auf den Takt 101.5 gerundet
+    assert timer.tasks["refresh"].next_due == 101.5
+    # Ein verspäteter Aufruf holt die Takte 100.5 und 101.0 nur einmal nach
+    assert timer.run_due(now=101.0) == ["poll"]
+    assert timer.run_due(now=101.5) == ["poll", "refresh"]
+    assert timer.tasks["poll"].next_due == 102.0
+    assert timer.tasks["refresh"].next_due == 103.0
+
+    # Verpasste Takte werden nicht nachgeholt, das Intervall beginnt neu
+    assert timer.run_due(now=110.2) == ["poll", "refresh"]
+    assert timer.tasks["poll"].next_due == 111.0
+    assert timer.tasks["refresh"].next_due == 111.5
+    assert timer.run_due(now=110.5) == []
+    assert timer.run_due(now=111.0) == ["poll"]
+    assert timer.tasks["refresh"].stats.runs == 2
+
+
+def test_paused_task_and_failing_task(clock, capsys):
+    runs = []
+    timer = Scheduler(tick=1)
+    timer.add_task("broken", 1, lambda: 1 / 0, delay=0)
+    timer.add_task("refresh", 10, lambda: runs.append(clock[0]), delay=0)
+    timer.pause("refresh")
+
+    assert timer.run_due(now=100) == ["broken"]
+    assert "Fehler in der Aufgabe 'broken'" in capsys.readouterr().out
+
+    clock[0] = 105.3
+    timer.resume("refresh", immediate=True)
+    # Die überfällige Aufgabe läuft einmal (nicht fünfmal), "refresh" erst im nächsten Takt
+    assert timer.run_due(now=105.3) == ["broken"]
+    assert timer.run_due(now=106) == ["refresh"]
+    assert timer.run_due(now=107) == ["broken"]
+    assert timer.tasks["refresh"].next_due == 116
\ No newline at end of file
@@ -0,0 +1,59 @@
+# Tests für das SQLite-Backend
+import random
+
+from data.sqlite_backend import SqliteBackend, sparse_positions
+
+
+def rows(ids):
+    return [{"ID": str(i), "Symbol": f"T{i}", "Link": f"link-{i}"} for i in ids]
+
+
+def writes(backend, table_rows):
+    before = backend._conn.total_changes
+    backend.save_calls(table_rows)
+    return backend._conn.total_changes - before
+
+
+def test_edits_near_the_top_write_only_the_affected_row(tmp_path):
+    path = str(tmp_path / "callbot.db")
+    backend = SqliteBackend(path)
+    backend.load_calls()
+    ids = list(range(100))
+    assert writes(backend, rows(ids)) == 100
+
+    ids.pop(0)
+    assert writes(backend, rows(ids)) == 1          # Löschen am Anfang
+    ids.insert(0, 1000)
+    assert writes(backend, rows(ids)) == 1          # Einfügen am Anfang
+    ids.insert(1, 1001)
+    assert writes(backend, rows(ids)) == 1          # Einfügen zwischen zwei Zeilen
+    ids.append(ids.pop(5))
+    assert writes(backend, rows(ids)) == 1          # Verschieben ans Ende
+    backend.close()
+
+    reloaded = SqliteBackend(path)
+    assert reloaded.load_calls() == rows(ids)
+    reloaded.close()
+
+
+def test_sparse_positions_keep_order_and_unchanged_rows():
+    rng = random.Random(5)
+    positions = sparse_positions([None] * 20)
+    for _ in range(300):
+        current = [position for position in positions if rng.random() > 0.05]  # Löschen
+        moved = current.pop(rng.randrange(len(current)))                        # Verschieben
+        current.insert(rng.randint(0, len(current)), moved)
+        current.insert(rng.randint(0, len(current)), None)                      # Einfügen
+
+        new_positions = sparse_positions(current)
+        assert all(a < b for a, b in zip(new_positions, new_positions[1:]))
+        # Höchstens die verschobene Zeile erhält einen neuen Wert
+        assert sum(1 for old, new in zip(current, new_positions) if old is not None and old != new) <= 1
+        positions = new_positions
+
+
+def test_repeated_inserts_at_the_same_place_renumber_when_needed():
+    positions = sparse_positions([None, None])
+    for _ in range(100):
+        positions = sparse_positions([positions[0], None] + positions[1:])
+        assert all(a < b for a, b in zip(positions, positions[1:]))
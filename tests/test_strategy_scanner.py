@@ -0,0 +1,116 @@
+# Tests für den inkrementellen Strategie-Scanner
+import random
+
+import pytest
+
+from data import birdeye_api, strategy_scanner
+from data.birdeye_api import analyze_token_for_strategy
+from data.strategy_scanner import StrategyScanner
+from tests.test_birdeye_api import FakeTokenList, band
+
+
+def token(address, mcap=1e6, volume=1e5, liquidity=1e5, price=1.0):
+    return {"address": address, "symbol": address, "mc": mcap, "v24hUSD": volume,
+            "liquidity": liquidity, "price": price, "priceChange12hPercent": 5}
+
+
+@pytest.fixture
+def scanned(monkeypatch):
+    """Ersetzt den parallelen Scan durch eine synchrone Analyse ohne Kerzen und merkt sich die Reihenfolge."""
+    batches = []
+
+    def fake_scan(tokens, with_price_history=True, max_workers=1, **weights):
+        batches.append([item["address"] for item in tokens])
+        for index, item in enumerate(tokens):
+            yield index, analyze_token_for_strategy(item, **weights)
+
+    monkeypatch.setattr(strategy_scanner, "iter_strategy_scan", fake_scan)
+    return batches
+
+
+def test_rescores_only_new_and_changed_tokens(scanned):
+    rankings = []
+    scanner = StrategyScanner(fetch_tokens=lambda: [], top_n=2, on_update=rankings.append)
+    tokens = [token("A"), token("B", volume=3e5), token("C", liquidity=0)]
+
+    assert scanner.update(tokens, now=0) == {"new": 3, "changed": 0, "removed": 0, "unchanged": 0}
+    assert [analysis["token_address"] for analysis in scanner.top()] == ["B", "A"]
+    assert rankings[-1] == scanner.top()
+
+    # A unter der Schwelle, B mit 10 % mehr Volumen, C entfernt
+    changed = [token("A", mcap=1.01e6), token("B", volume=3.3e5)]
+    assert scanner.update(changed, now=10) == {"new": 0, "changed": 1, "removed": 1, "unchanged": 1}
+    assert scanned[-1] == ["B"]
+
+    # Nach RESCORE_MAX_AGE wird auch ohne Änderung neu bewertet
+    assert scanner.update(changed, now=10 + strategy_scanner.RESCORE_MAX_AGE)["changed"] == 2
+
+
+def test_fetches_promising_tokens_first(scanned):
+    scanner = StrategyScanner(fetch_tokens=lambda: [])
+    tokens = [token("weak", volume=0, liquidity=0), token("strong", volume=3e5, liquidity=3e5), token("mid")]
+
+    scanner.update(tokens, now=0)
+    assert scanned[0] == ["strong", "mid", "weak"]
+
+    # Ohne Kerzen-Abruf gibt es nichts vorzuziehen
+    StrategyScanner(fetch_tokens=lambda: [], with_price_history=False).update(tokens, now=0)
+    assert scanned[1] == ["weak", "strong", "mid"]
+
+
+def test_running_follows_start_and_stop(scanned):
+    scanner = StrategyScanner(fetch_tokens=lambda: [])
+    assert not scanner.running
+    scanner.start(interval=60)
+    assert scanner.running
+    scanner.stop()
+    assert not scanner.running
+
+
+def test_default_source_crawls_beyond_first_page(scanned, monkeypatch):
+    size = birdeye_api.TOKEN_LIST_PAGE_SIZE
+    # Die umsatzstärksten 50 Tokens liegen fast alle außerhalb des Bereichs
+    fake = FakeTokenList(band(8 * size, 3 * size, 4 * size))
+    monkeypatch.setattr(birdeye_api, "get_token_list", fake)
+    monkeypatch.setattr(birdeye_api, "_first_page_hints", {})
+
+    scanner = StrategyScanner()
+    counts = scanner.scan_once()
+
+    in_band = {token["address"] for token in fake.tokens if 1e5 <= token["mc"] <= 3e6}
+    by_volume = sorted(fake.tokens, key=lambda token: -token["v24hUSD"])[:size]
+    first_page = {token["address"] for token in by_volume}
+    assert counts["new"] == strategy_scanner.SCANNER_FETCH_LIMIT
+    assert set(scanned[0]) <= in_band
+    assert set(scanned[0]) - first_page
+    # Budget: Suche nach dem Beginn des Bereichs plus höchstens SCANNER_CRAWL_PAGES Seiten
+    # (die erste Seite des Bereichs kommt beim zweiten Abruf aus dem Seiten-Cache)
+    assert len({page for page in fake.pages if page >= 8}) <= strategy_scanner.SCANNER_CRAWL_PAGES
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+def test_scan_analyzes_arrived_candles_together(monkeypatch, use_numpy):
+    from data import price_analysis
+    from tests.test_strategy_scoring import random_history
+
+    if use_numpy:
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(price_analysis, "HAS_NUMPY", False)
+    rng = random.Random(3)
+    tokens = [token(f"T{i}", volume=rng.uniform(0, 5e5), liquidity=rng.uniform(0, 5e5)) for i in range(40)]
+    histories = {item["address"]: random_history(rng) for item in tokens}
+    monkeypatch.setattr(birdeye_api, "get_token_price_history",
+                        lambda address, resolution=None: histories[address])
+    batches = []
+    analyze_price_responses = price_analysis.analyze_price_responses
+
+    def recording_analyze(price_histories):
+        batches.append(len(price_histories))
+        return analyze_price_responses(price_histories)
+
+    monkeypatch.setattr(price_analysis, "analyze_price_responses", recording_analyze)
+
+    results = dict(birdeye_api.iter_strategy_scan(tokens, max_workers=4))
+    assert results == {index: analyze_token_for_strategy(item, price_history=histories[item["address"]])
+                       for index, item in enumerate(tokens)}
+    assert sum(batches) == len(tokens)
\ No newline at end of file
@@ -0,0 +1,106 @@
+# Tests für die spaltenweise Strategie-Bewertung (Abgleich mit analyze_token_for_strategy)
+import random
+
+import pytest
+
+from data import strategy_scoring
+from data.birdeye_api import analyze_token_for_strategy
+from data.strategy_scoring import rank_tokens, score_tokens
+
+WEIGHT_SETS = [{}, {"pattern_weight": 25, "volume_weight": 50, "timeframe_weight": 5, "rugpull_weight": 20}]
+
+
+def random_token(rng, i):
+    mcap = rng.choice([0, rng.uniform(1e5, 3e6)])
+    token = {
+        "address": f"Token{i}",
+        "symbol": f"t{i}",
+        "mc": mcap,
+        "liquidity": mcap * rng.choice([0, 0.01, 0.02, 0.05, rng.uniform(0, 0.5)]),
+        "v24hUSD": mcap * rng.choice([0, 0.02, 0.3, rng.uniform(0, 0.5)]),
+    }
+    for period in ("1h", "12h", "24h"):
+        token[f"priceChange{period}Percent"] = rng.choice([0, -2, rng.uniform(-30, 30)])
+    return token
+
+
+def random_history(rng):
+    if rng.random() < 0.2:
+        return None
+    price, items = rng.uniform(0.5, 2), []
+    for i in range(rng.randint(0, 120)):
+        price *= 1 + rng.choice([rng.uniform(-0.25, 0.3), rng.uniform(-0.04, 0.04), 0.0])
+        items.append({"unixTime": i * 300, "c": price, "v": rng.uniform(0, 1e5)})
+    return {"success": True, "data": {"items": items}}
+
+
+@pytest.fixture(scope="module")
+def sample():
+    rng = random.Random(7)
+    tokens = [random_token(rng, i) for i in range(600)]
+    histories = [random_history(rng) for _ in tokens]
+    return tokens, histories
+
+
+def single_analyses(tokens, histories, weights):
+    return [analyze_token_for_strategy(token, price_history=history, **weights)
+            for token, history in zip(tokens, histories)]
+
+
+@pytest.mark.parametrize("weights", WEIGHT_SETS)
+def test_score_columns_match_single_analysis(sample, weights):
+    pytest.importorskip("numpy")
+    from data.price_analysis import analyze_price_responses
+    from data.strategy_scoring import VOLUME_TRENDS, analysis_columns, score_columns, token_columns
+
+    tokens, histories = sample
+    expected = single_analyses(tokens, histories, weights)
+    scores = score_columns(token_columns(tokens), analysis_columns(analyze_price_responses(histories)), **weights)
+
+    for key in ("pattern", "volume", "timeframe", "rugpull", "total"):
+        assert scores[key].tolist() == [analysis["score"][key] for analysis in expected], key
+    assert [VOLUME_TRENDS[code] for code in scores["volume_trend"].tolist()] == \
+        [analysis["volume_trend"] for analysis in expected]
+    assert any(analysis["dip_detected"] for analysis in expected)
+
+
+@pytest.mark.parametrize("weights", WEIGHT_SETS)
+@pytest.mark.parametrize("use_numpy", [True, False])
+def test_score_tokens_top_k_matches_single_analysis(sample, weights, use_numpy, monkeypatch):
+    if use_numpy:
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(strategy_scoring, "HAS_NUMPY", False)
+
+    tokens, histories = sample
+    expected = single_analyses(tokens, histories, weights)
+    order = sorted(range(len(tokens)), key=lambda index: (-expected[index]["score"]["total"], index))
+
+    top = score_tokens(tokens, histories, top_k=20, **weights)
+    assert top == [expected[index] for index in order[:20]]
+
+
+def test_score_tokens_edge_cases(sample):
+    tokens, histories = sample
+    assert score_tokens([]) == []
+    assert score_tokens(tokens[:5], histories[:5], top_k=0) == []
+
+    # Ohne Preishistorien und ohne top_k: alle Tokens, gleiche Scores in Listenreihenfolge
+    expected = single_analyses(tokens[:30], [None] * 30, {})
+    order = sorted(range(30), key=lambda index: (-expected[index]["score"]["total"], index))
+    assert score_tokens(tokens[:30]) == [expected[index] for index in order]
+
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+def test_rank_tokens_matches_score_tokens_order(sample, use_numpy, monkeypatch):
+    if use_numpy:
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(strategy_scoring, "HAS_NUMPY", False)
+
+    tokens, histories = sample
+    tokens, histories = tokens[:100], histories[:100]
+    expected = single_analyses(tokens, histories, WEIGHT_SETS[1])
+    order = sorted(range(len(tokens)), key=lambda index: (-expected[index]["score"]["total"], index))
+    assert rank_tokens(tokens, histories, **WEIGHT_SETS[1]) == order
+    assert rank_tokens([]) == []
\ No newline at end of file
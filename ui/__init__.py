@@ -1,5 +1,6 @@
 # UI-Paket-Initialisierung
 from . import styles
+from . import tree_sync
 from . import main_window
 from . import token_frame
 from . import stats_frame
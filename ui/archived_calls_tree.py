@@ -3,6 +3,9 @@ import tkinter as tk
 from tkinter import ttk, messagebox, simpledialog
 import webbrowser
 import data.storage as storage
+import utils.formatters as formatters
+from config import ARCHIVE_BUFFER_ROWS
+from ui.tree_sync import TreeSync
 
 class ArchivedCallsTreeView:
     def __init__(self, parent, main_window):
@@ -16,9 +19,10 @@ class ArchivedCallsTreeView:
         self.frame = tk.Frame(self.parent)
         self.frame.pack(fill="both", expand=True)
         
-        # Nur vertikaler Scrollbar
-        yscrollbar = ttk.Scrollbar(self.frame, orient="vertical")
-        yscrollbar.pack(side="right", fill="y")
+        # Nur vertikaler Scrollbar - bezieht sich auf alle archivierten Calls,
+        # nicht nur auf die Zeilen, die gerade im Treeview stehen
+        self.yscrollbar = ttk.Scrollbar(self.frame, orient="vertical", command=self.on_scrollbar)
+        self.yscrollbar.pack(side="right", fill="y")
         
         # Erstelle den Treeview für archivierte Calls mit Scrollbars
         self.archived_calls_tree = ttk.Treeview(
@@ -35,12 +39,9 @@ class ArchivedCallsTreeView:
             ),
             show="headings",
             style="Treeview",
-            yscrollcommand=yscrollbar.set
+            yscrollcommand=self.on_tree_scrolled
         )
         
-        # Konfiguriere die Scrollbars
-        yscrollbar.config(command=self.archived_calls_tree.yview)
-        
         # Definiere die Spaltenüberschriften
         self.archived_calls_tree.heading("Datum", text="Datum")
         self.archived_calls_tree.heading("Symbol", text="Symbol")
@@ -76,6 +77,12 @@ class ArchivedCallsTreeView:
         self.archived_calls_tree.bind("<Button-1>", self.on_archived_click)
         # Überwache die Auswahl und wende die Tags erneut an
         self.archived_calls_tree.bind("<<TreeviewSelect>>", self.ensure_custom_selection)
+        # Mausrad (Windows/macOS bzw. X11) blättert durch alle archivierten Calls
+        self.archived_calls_tree.bind("<MouseWheel>", self.on_mousewheel)
+        self.archived_calls_tree.bind("<Button-4>", self.on_mousewheel)
+        self.archived_calls_tree.bind("<Button-5>", self.on_mousewheel)
+        # Bei Größenänderung die Anzahl sichtbarer Zeilen neu bestimmen
+        self.archived_calls_tree.bind("<Configure>", self.on_tree_configure)
         
         self.archived_calls_tree.pack(fill="both", expand=True)
         
@@ -87,23 +94,40 @@ class ArchivedCallsTreeView:
         self.context_menu.add_command(label="MCAP at Call ändern", command=self.edit_mcap_at_call)
         self.context_menu.add_separator()
         self.context_menu.add_command(label="Call löschen", command=self.delete_selected_archived_call)
+        
+        # Alle archivierten Calls im Speicher: Zeilen-IDs in Anzeigereihenfolge
+        # und Zuordnung Zeilen-ID -> Call (wird in update_tree befüllt)
+        self.archived_ids = []
+        self.row_calls = {}
+        
+        # Virtualisierung: Im Treeview stehen nur die Zeilen window_start..window_end,
+        # d.h. der sichtbare Bereich ab offset plus ARCHIVE_BUFFER_ROWS davor und danach
+        self.offset = 0
+        self.visible_rows = 20
+        self.window_start = 0
+        self.window_end = 0
+        
+        # Ausgewählte Zeilen-IDs (auch solche, die gerade nicht im Treeview stehen)
+        self.selected_ids = set()
+        
+        # Abgleich der Zeilen bei Aktualisierungen
+        self.tree_sync = TreeSync(self.archived_calls_tree)
     
 
     def edit_mcap_at_call(self):
         """Bearbeitet den MCAP at Call Wert des ausgewählten archivierten Eintrags"""
-        selected_items = self.archived_calls_tree.selection()
+        selected_items = self.get_selected_items()
         if not selected_items:
             messagebox.showinfo("Hinweis", "Bitte wähle zuerst einen Call aus.")
             return
             
         # Wenn mehrere ausgewählt sind, nur den ersten bearbeiten
         item = selected_items[0]
-        values = self.archived_calls_tree.item(item, "values")
-        
-        # Datum, Symbol und MCAP_at_Call aus den Werten extrahieren
-        datum = values[0]
-        symbol = values[1]
-        current_mcap = values[2]
+        selected_call = self.row_calls.get(item)
+        if selected_call is None:
+            return
+        symbol = selected_call.symbol
+        current_mcap = formatters.format_k(selected_call.mcap_at_call)
         
         # Dialog zur Eingabe des neuen MCAP-Wertes
         new_mcap = simpledialog.askstring(
@@ -140,71 +164,19 @@ class ArchivedCallsTreeView:
             messagebox.showerror("Fehler", "Der MCAP-Wert muss positiv sein.")
             return
             
-        # Formatiere den neuen Wert im K/M Format
-        if parsed_value >= 1000000:
-            formatted_mcap = f"{parsed_value/1000000:.1f}M"
-        elif parsed_value >= 1000:
-            formatted_mcap = f"{parsed_value/1000:.0f}K"
-        else:
-            formatted_mcap = f"{parsed_value:.0f}"
-        
-        # Lade alle Calls
-        calls = storage.load_call_data()
+        # Formatiert für die Bestätigung, gespeichert wird der Rohwert
+        formatted_mcap = formatters.format_k(parsed_value)
         
-        # Finde den entsprechenden Call und aktualisiere den MCAP-Wert
-        call_found = False
-        for call in calls:
-            # Nur abgeschlossene Calls prüfen
-            if not call.get("abgeschlossen", False):
-                continue
-                
-            if call.get("Datum") == datum and call.get("Symbol") == symbol:
-                # MCAP-Wert aktualisieren
-                call["MCAP_at_Call"] = formatted_mcap
-                
-                # X-Factor, PL_Percent und PL_Dollar neu berechnen
-                try:
-                    initial_mcap = parsed_value  # Verwende direkt unseren bereits geparsten Wert
-                    
-                    # Parse aktuelles MCAP
-                    current_mcap_str = call.get("Aktuelles_MCAP", "0")
-                    if current_mcap_str.endswith("K"):
-                        current_mcap = float(current_mcap_str[:-1]) * 1000
-                    elif current_mcap_str.endswith("M"):
-                        current_mcap = float(current_mcap_str[:-1]) * 1000000
-                    else:
-                        current_mcap = float(current_mcap_str)
-                    
-                    if initial_mcap > 0 and current_mcap > 0:
-                        x_factor = current_mcap / initial_mcap
-                        pl_percent = (x_factor - 1) * 100
-                        
-                        # Invest-Wert aus dem Call verwenden oder auf 10$ setzen
-                        invest = 10.0
-                        try:
-                            invest_str = call.get("Invest", "10")
-                            invest = float(invest_str)
-                        except:
-                            invest = 10.0
-                            
-                        pl_dollar = invest * x_factor - invest
-                        
-                        call["X_Factor"] = f"{x_factor:.1f}X"
-                        call["PL_Percent"] = f"{pl_percent:.0f}%"
-                        call["PL_Dollar"] = f"{pl_dollar:.2f}$"
-                except Exception as e:
-                    messagebox.showerror("Fehler bei Berechnung", f"Fehler: {str(e)}")
-                    return
-                    
-                call_found = True
-                break
-                
-        if not call_found:
+        # Finde den entsprechenden Call über seine ID (= Zeilen-ID)
+        call = storage.get_call(item)
+        if call is None or not call.closed:
             messagebox.showerror("Fehler", f"Der Call für {symbol} konnte nicht gefunden werden.")
             return
             
-        # Speichere die aktualisierten Calls
-        storage.save_call_data(calls)
+        # MCAP-Wert aktualisieren und speichern
+        # (X-Factor und P/L ergeben sich daraus im Modell)
+        call.mcap_at_call = parsed_value
+        storage.update_calls([call])
         
         # Aktualisiere die Anzeige
         self.update_tree()
@@ -216,8 +188,19 @@ class ArchivedCallsTreeView:
         # Bestätigungsmeldung
         messagebox.showinfo("Erfolg", f"Der MCAP-Wert für {symbol} wurde auf {formatted_mcap} geändert.")
 
+    def get_selected_items(self):
+        """Gibt die ausgewählten Zeilen-IDs in Anzeigereihenfolge zurück (auch außerhalb des sichtbaren Bereichs)"""
+        return [item_id for item_id in self.archived_ids if item_id in self.selected_ids]
+
     def ensure_custom_selection(self, event):
         """Stellt sicher, dass ausgewählte Elemente die benutzerdefinierten Tags behalten"""
+        # Auswahl der Zeilen im Treeview übernehmen; Zeilen außerhalb des
+        # gerade dargestellten Bereichs bleiben ausgewählt
+        rendered = set(self.archived_calls_tree.get_children())
+        self.selected_ids = {item_id for item_id in self.selected_ids
+                             if item_id not in rendered and item_id in self.row_calls}
+        self.selected_ids.update(self.archived_calls_tree.selection())
+        
         for item in self.archived_calls_tree.selection():
             tags = list(self.archived_calls_tree.item(item, "tags"))
             if "row_green" in tags and "selected_green" not in tags:
@@ -235,25 +218,17 @@ class ArchivedCallsTreeView:
         
         # Wenn ein Klick ins Leere erfolgt, die Auswahl aufheben
         if not item:
+            self.selected_ids.clear()
             self.archived_calls_tree.selection_remove(self.archived_calls_tree.selection())
             return
         
-        # Zurücksetzen aller Tags auf ihre Basisfarbe
-        for i in self.archived_calls_tree.get_children():
-            current_tags = list(self.archived_calls_tree.item(i, "tags"))
-            
-            # Entferne alle Auswahl-Tags
-            if "selected_green" in current_tags:
-                current_tags.remove("selected_green")
-            if "selected_red" in current_tags:
-                current_tags.remove("selected_red")
-                
-            # Setze die Tags zurück
-            if "row_green" in current_tags or "row_red" in current_tags:
-                self.archived_calls_tree.item(i, tags=tuple(current_tags))
+        # Zurücksetzen der Tags der bisher ausgewählten Zeilen auf ihre Basisfarbe
+        for i in self.archived_calls_tree.selection():
+            self.reset_selection_tags(i)
         
         # Wenn das angeklickte Element bereits ausgewählt war, hebe die Auswahl auf
         if item in self.archived_calls_tree.selection():
+            self.selected_ids.discard(item)
             self.archived_calls_tree.selection_remove(item)
             return
             
@@ -267,11 +242,19 @@ class ArchivedCallsTreeView:
             current_tags.append("selected_red")
             
         # Auswahl setzen
+        self.selected_ids = {item}
         self.archived_calls_tree.selection_set(item)
         self.archived_calls_tree.item(item, tags=tuple(current_tags))
         
         # Nach jeder Auswahländerung neu zeichnen, um sicherzustellen, dass die Tags sichtbar sind
         self.archived_calls_tree.update()
+
+    def reset_selection_tags(self, item):
+        """Entfernt die Auswahl-Tags einer Zeile"""
+        current_tags = list(self.archived_calls_tree.item(item, "tags"))
+        if "selected_green" in current_tags or "selected_red" in current_tags:
+            current_tags = [tag for tag in current_tags if tag not in ("selected_green", "selected_red")]
+            self.archived_calls_tree.item(item, tags=tuple(current_tags))
         
     def show_context_menu(self, event):
         """Zeigt das Kontextmenü bei Rechtsklick an"""
@@ -279,71 +262,137 @@ class ArchivedCallsTreeView:
         item = self.archived_calls_tree.identify_row(event.y)
         if item:
             # Setze die Auswahl auf das Item unter dem Cursor
+            self.selected_ids = {item}
             self.archived_calls_tree.selection_set(item)
             # Zeige das Kontextmenü
             self.context_menu.post(event.x_root, event.y_root)
         
     def update_tree(self):
         """Aktualisiert den Treeview für archivierte Calls"""
-        self.archived_calls_tree.delete(*self.archived_calls_tree.get_children())
-        
-        for call in storage.load_call_data():
-            # Nur abgeschlossene Calls anzeigen
-            if not call.get("abgeschlossen", False):
-                continue
-                
-            try:
-                x_factor_str = call.get("X_Factor", "0")
-                pl_dollar_str = call.get("PL_Dollar", "0")
-                # Entferne das "X" bzw. "$", um float-Werte zu erhalten
-                x_factor_val = float(x_factor_str.rstrip("X"))
-                pl_dollar_val = float(pl_dollar_str.rstrip("$"))
-            except Exception:
-                x_factor_val = 0
-                pl_dollar_val = 0
-                
+        # Nur abgeschlossene Calls, Reihenfolge wie gespeichert
+        calls = [call for call in storage.load_call_data() if call.closed]
+        self.archived_ids = [call.id for call in calls]
+        self.row_calls = dict(zip(self.archived_ids, calls))
+        self.selected_ids &= self.row_calls.keys()
+        
+        # Nur der aktuelle Ausschnitt wird als Tk-Items dargestellt
+        self.render_window(self.offset)
+    
+    def render_window(self, offset):
+        """Stellt den Ausschnitt um offset (Index der obersten sichtbaren Zeile) im Treeview dar"""
+        total = len(self.archived_ids)
+        self.offset = max(0, min(offset, total - self.visible_rows))
+        self.window_start = max(0, self.offset - ARCHIVE_BUFFER_ROWS)
+        self.window_end = min(total, self.offset + self.visible_rows + ARCHIVE_BUFFER_ROWS)
+        window = self.archived_ids[self.window_start:self.window_end]
+        
+        rows = []
+        for item_id in window:
+            call = self.row_calls[item_id]
+            
             # Wähle die Zeilenfarbe
-            if x_factor_val >= 5:
+            if call.x_factor >= 5:
                 row_tag = "row_green"
-            elif pl_dollar_val >= 0:
+            elif call.pl_dollar >= 0:
                 row_tag = "row_green"
             else:
                 row_tag = "row_red"
                 
-            self.archived_calls_tree.insert(
-                "",
-                "end",
-                values=(
-                    call.get("Datum", ""),
-                    call.get("Symbol", ""),
-                    call.get("MCAP_at_Call", ""),
-                    call.get("Aktuelles_MCAP", ""),
-                    call.get("X_Factor", ""),
-                    call.get("PL_Percent", ""),
-                    call.get("PL_Dollar", ""),
-                    call.get("Invest", "")
-                ),
-                tags=(row_tag,)
-            )
+            # Formatierung erst bei der Anzeige
+            rows.append((item_id, formatters.call_row_values(call), (row_tag,)))
         
+        # Nur geänderte Zeilen anfassen
+        self.tree_sync.sync(rows)
+        self.tree_sync.reorder(window)
+        
+        # Auswahl für Zeilen wiederherstellen, die (wieder) im Ausschnitt liegen
+        selected = [item_id for item_id in window if item_id in self.selected_ids]
+        if selected:
+            self.archived_calls_tree.selection_set(selected)
+        
+        self.position_view()
+    
+    def position_view(self):
+        """Scrollt den Treeview innerhalb des Ausschnitts auf offset und setzt den Scrollbar"""
+        window_size = self.window_end - self.window_start
+        if window_size:
+            self.archived_calls_tree.yview_moveto((self.offset - self.window_start) / window_size)
+        self.update_scrollbar()
+    
+    def update_scrollbar(self):
+        """Setzt den Scrollbar bezogen auf alle archivierten Calls"""
+        total = len(self.archived_ids)
+        if total <= self.visible_rows:
+            self.yscrollbar.set(0.0, 1.0)
+        else:
+            self.yscrollbar.set(self.offset / total, (self.offset + self.visible_rows) / total)
+    
+    def scroll_to(self, offset):
+        """Scrollt auf die Zeile offset; neu dargestellt wird nur, wenn der Puffer nicht mehr reicht"""
+        total = len(self.archived_ids)
+        offset = max(0, min(offset, total - self.visible_rows))
+        if offset == self.offset:
+            return
+        if offset >= self.window_start and (offset + self.visible_rows <= self.window_end or self.window_end == total):
+            # Zeilen liegen bereits im Treeview
+            self.offset = offset
+            self.position_view()
+        else:
+            self.render_window(offset)
+    
+    def on_scrollbar(self, *args):
+        """Command des Scrollbars ('moveto' bzw. 'scroll' mit Einheiten oder Seiten)"""
+        if args[0] == "moveto":
+            self.scroll_to(round(float(args[1]) * len(self.archived_ids)))
+        elif args[0] == "scroll":
+            step = int(args[1])
+            if args[2] == "pages":
+                step *= max(1, self.visible_rows - 1)
+            self.scroll_to(self.offset + step)
+    
+    def on_mousewheel(self, event):
+        """Blättert mit dem Mausrad um drei Zeilen"""
+        if event.num == 4 or getattr(event, "delta", 0) > 0:
+            self.scroll_to(self.offset - 3)
+        else:
+            self.scroll_to(self.offset + 3)
+        return "break"  # Eigenes Scrollen des Treeviews unterdrücken
+    
+    def on_tree_scrolled(self, first, last):
+        """
+        yscrollcommand des Treeviews: übernimmt Bildläufe, die der Treeview
+        selbst auslöst (z.B. Pfeiltasten), in den Versatz.
+        """
+        window_size = self.window_end - self.window_start
+        if window_size:
+            offset = self.window_start + round(float(first) * window_size)
+            if offset != self.offset:
+                self.scroll_to(offset)
+                return
+        self.update_scrollbar()
+    
+    def on_tree_configure(self, event):
+        """Bestimmt die Anzahl sichtbarer Zeilen aus Höhe des Treeviews und Zeilenhöhe"""
+        header_height, row_height = 25, 20
+        if self.window_start <= self.offset < self.window_end:
+            # Maße der obersten sichtbaren Zeile
+            bbox = self.archived_calls_tree.bbox(self.archived_ids[self.offset])
+            if bbox:
+                header_height, row_height = bbox[1], bbox[3]
+        visible_rows = max(1, (event.height - header_height) // max(1, row_height))
+        if visible_rows != self.visible_rows:
+            self.visible_rows = visible_rows
+            self.render_window(self.offset)
             
     def on_archived_double_click(self, event):
         """Reagiert auf Doppelklick in der Treeview für archivierte Calls"""
         item = self.archived_calls_tree.identify_row(event.y)
         if item:
-            # Hole alle Werte der ausgewählten Zeile
-            values = self.archived_calls_tree.item(item, "values")
-            
-            # Suche nach dem Link für diesen Call
-            calls = storage.load_call_data()
-            matching_calls = [call for call in calls if 
-                              call.get("Symbol") == values[1] and  # Symbol stimmt überein
-                              call.get("Datum") == values[0] and  # Datum stimmt überein
-                              call.get("abgeschlossen", False)]   # Nur abgeschlossene Calls
+            # Link des Calls dieser Zeile
+            call = self.row_calls.get(item)
             
-            if matching_calls and len(matching_calls) > 0:
-                call = matching_calls[0]
-                link = call.get("Link")
+            if call is not None:
+                link = call.link
                 
                 if link:
                     # Setze den Link in die Entry-Variable
@@ -358,37 +407,11 @@ class ArchivedCallsTreeView:
 
     def delete_selected_archived_call(self):
         """Löscht nur die ausgewählten archivierten Calls"""
-        selected_items = self.archived_calls_tree.selection()
+        selected_items = self.get_selected_items()
         if not selected_items:
             messagebox.showinfo("Hinweis", "Bitte wähle zuerst mindestens einen Call aus, den du löschen möchtest.")
             return
         
-        # Lade vorhandene Calls
-        calls = storage.load_call_data()
-        new_calls = []
-        
-        # Details für jeden ausgewählten Call sammeln
-        to_delete = []
-        for item in selected_items:
-            values = self.archived_calls_tree.item(item, "values")
-            # Speichere Datum, Symbol UND MCAP als eindeutige Identifikation
-            to_delete.append((values[0], values[1], values[2]))  # (Datum, Symbol, MCAP_at_Call)
-            
-        # Nur Calls behalten, die nicht gelöscht werden sollen
-        for call in calls:
-            # Überspringe nicht-abgeschlossene Calls
-            if not call.get("abgeschlossen", False):
-                new_calls.append(call)
-                continue
-                
-            # Prüfe, ob dieser Call gelöscht werden soll
-            current_call_id = (call.get("Datum", ""), call.get("Symbol", ""), call.get("MCAP_at_Call", ""))
-            if current_call_id in to_delete:
-                continue  # Diesen Call nicht behalten
-            
-            # Ansonsten Call behalten
-            new_calls.append(call)
-        
-        # Speichern und aktualisieren
-        storage.save_call_data(new_calls)
+        # Die Zeilen-IDs sind die IDs der Calls
+        storage.delete_calls(selected_items)
         self.update_tree()
\ No newline at end of file
@@ -4,6 +4,8 @@ from tkinter import ttk, messagebox, simpledialog
 import webbrowser
 import data.storage as storage
 import utils.formatters as formatters
+from data.models import SORT_KEYS
+from ui.tree_sync import TreeSync
 
 class CallsTreeView:
     def __init__(self, parent, main_window):
@@ -101,6 +103,12 @@ class CallsTreeView:
         
         # Sortierungsstatus initialisieren
         self.sort_status = {"column": None, "reverse": False}
+        
+        # Zuordnung Zeilen-ID -> angezeigter Call (wird in update_tree befüllt)
+        self.row_calls = {}
+        
+        # Abgleich der Zeilen bei Aktualisierungen
+        self.tree_sync = TreeSync(self.calls_tree)
     
     def edit_mcap_at_call(self):
         """Bearbeitet den MCAP at Call Wert des ausgewählten Eintrags"""
@@ -111,12 +119,11 @@ class CallsTreeView:
             
         # Wenn mehrere ausgewählt sind, nur den ersten bearbeiten
         item = selected_items[0]
-        values = self.calls_tree.item(item, "values")
-        
-        # Datum, Symbol und MCAP_at_Call aus den Werten extrahieren
-        datum = values[0]
-        symbol = values[1]
-        current_mcap = values[2]
+        selected_call = self.row_calls.get(item)
+        if selected_call is None:
+            return
+        symbol = selected_call.symbol
+        current_mcap = formatters.format_k(selected_call.mcap_at_call)
         
         # Dialog zur Eingabe des neuen MCAP-Wertes
         new_mcap = simpledialog.askstring(
@@ -138,54 +145,19 @@ class CallsTreeView:
             messagebox.showerror("Fehler", "Bitte gib einen gültigen MCAP-Wert ein (z.B. 500K, 1.2M)")
             return
             
-        # Formatiere den neuen Wert im K/M Format
+        # Formatiert für die Bestätigung, gespeichert wird der Rohwert
         formatted_mcap = formatters.format_k(parsed_value)
         
-        # Lade alle Calls
-        calls = storage.load_call_data()
-        
-        # Finde den entsprechenden Call und aktualisiere den MCAP-Wert
-        call_found = False
-        for call in calls:
-            # Überspringe abgeschlossene Calls
-            if call.get("abgeschlossen", False):
-                continue
-                
-            if call.get("Datum") == datum and call.get("Symbol") == symbol:
-                # MCAP-Wert aktualisieren
-                call["MCAP_at_Call"] = formatted_mcap
-                
-                # X-Factor, PL_Percent und PL_Dollar neu berechnen
-                initial_mcap = formatters.parse_km(formatted_mcap)
-                current_mcap = formatters.parse_km(call.get("Aktuelles_MCAP", "0"))
-                
-                if initial_mcap > 0 and current_mcap > 0:
-                    x_factor = current_mcap / initial_mcap
-                    pl_percent = (x_factor - 1) * 100
-                    
-                    # Invest-Wert aus dem Call verwenden oder auf 10$ setzen
-                    invest = 10.0
-                    try:
-                        invest_str = call.get("Invest", "10")
-                        invest = float(invest_str)
-                    except:
-                        invest = 10.0
-                        
-                    pl_dollar = invest * x_factor - invest
-                    
-                    call["X_Factor"] = f"{x_factor:.1f}X"
-                    call["PL_Percent"] = f"{pl_percent:.0f}%"
-                    call["PL_Dollar"] = f"{pl_dollar:.2f}$"
-                
-                call_found = True
-                break
-                
-        if not call_found:
+        # Finde den entsprechenden Call über seine ID (= Zeilen-ID)
+        call = storage.get_call(item)
+        if call is None:
             messagebox.showerror("Fehler", f"Der Call für {symbol} konnte nicht gefunden werden.")
             return
             
-        # Speichere die aktualisierten Calls
-        storage.save_call_data(calls)
+        # MCAP-Wert aktualisieren und speichern
+        # (X-Factor und P/L ergeben sich daraus im Modell)
+        call.mcap_at_call = parsed_value
+        storage.update_calls([call])
         
         # Aktualisiere die Anzeige
         self.update_tree()
@@ -202,48 +174,12 @@ class CallsTreeView:
         # Speichere die aktuelle Auswahl, bevor wir sortieren
         selected_items = self.calls_tree.selection()
         
-        # Liste aller Zeilen-IDs und ihre Werte in der Sortierspalte
-        data = []
-        for child in self.calls_tree.get_children(''):
-            values = self.calls_tree.item(child, 'values')
-            col_index = self.calls_tree["columns"].index(column)
-            data.append((child, values[col_index]))
-        
-        # Custom Sortierfunktion basierend auf dem Datentyp
-        def sort_by_value(item):
-            value = item[1]
-            if column in ["X_Factor", "PL_Percent", "PL_Dollar"]:
-                # Entferne 'X', '%', '$' und konvertiere zu float
-                try:
-                    if column == "X_Factor":
-                        return float(value.rstrip("X"))
-                    elif column == "PL_Percent":
-                        return float(value.rstrip("%"))
-                    elif column == "PL_Dollar":
-                        return float(value.rstrip("$"))
-                except ValueError:
-                    return 0
-            elif column in ["MCAP_at_Call", "Aktuelles_MCAP"]:
-                # Konvertiere K/M Notation zu float
-                try:
-                    return formatters.parse_km(value)
-                except ValueError:
-                    return 0
-            elif column == "Invest":
-                # Konvertiere zu float
-                try:
-                    return float(value)
-                except ValueError:
-                    return 0
-            # Für Datum und Symbol: alphabetische Sortierung
-            return value
-        
-        # Sortiere die Daten
-        data.sort(key=sort_by_value, reverse=reverse)
+        # Sortiert wird nach den Rohwerten der Calls, nicht nach den angezeigten Strings
+        sort_key = SORT_KEYS[column]
+        data = sorted(self.calls_tree.get_children(''), key=lambda child: sort_key(self.row_calls[child]), reverse=reverse)
         
-        # Neu anordnen der Elemente im Treeview
-        for i, item in enumerate(data):
-            self.calls_tree.move(item[0], '', i)
+        # Neu anordnen der Elemente im Treeview (nur wenn sich die Reihenfolge geändert hat)
+        self.tree_sync.reorder(data)
         
         # Aktualisiere den Sortierungsstatus
         self.sort_status = {"column": column, "reverse": reverse}
@@ -314,16 +250,7 @@ class CallsTreeView:
         self.calls_tree.selection_set(item)
         
         # Bestimme, ob der Call profitabel ist
-        values = self.calls_tree.item(item, "values")
-        try:
-            pl_dollar_str = values[6]  # PL_Dollar ist an Position 6
-            if pl_dollar_str:
-                pl_dollar = float(pl_dollar_str.rstrip("$"))
-                is_profitable = pl_dollar >= 0
-            else:
-                is_profitable = False
-        except (ValueError, IndexError):
-            is_profitable = False
+        is_profitable = self.is_profitable(item)
         
         # Ändere die Hintergrundfarbe direkt ohne Tags
         if is_profitable:
@@ -354,16 +281,7 @@ class CallsTreeView:
             self.calls_tree.selection_set(item)
             
             # Bestimme, ob der Call profitabel ist
-            values = self.calls_tree.item(item, "values")
-            try:
-                pl_dollar_str = values[6]  # PL_Dollar ist an Position 6
-                if pl_dollar_str:
-                    pl_dollar = float(pl_dollar_str.rstrip("$"))
-                    is_profitable = pl_dollar >= 0
-                else:
-                    is_profitable = False
-            except (ValueError, IndexError):
-                is_profitable = False
+            is_profitable = self.is_profitable(item)
             
             # Ändere die Hintergrundfarbe direkt ohne Tags
             style = ttk.Style()
@@ -381,135 +299,53 @@ class CallsTreeView:
             # Zeige das Kontextmenü
             self.context_menu.post(event.x_root, event.y_root)
     
+    def is_profitable(self, item):
+        """True, wenn der Call der Zeile nicht im Verlust ist"""
+        call = self.row_calls.get(item)
+        return call is not None and call.pl_dollar >= 0
+    
     def update_tree(self):
         """Aktualisiert den Treeview im 'Meine Calls'-Tab mit den gespeicherten Calls."""
-        # Speichere die aktuelle Auswahl, bevor wir die Daten aktualisieren
-        selected_item_values = None
-        if self.calls_tree.selection():
-            item_id = self.calls_tree.selection()[0]
-            selected_item_values = self.calls_tree.item(item_id, "values")
-        
-        self.calls_tree.delete(*self.calls_tree.get_children())
-        
-        # Stil für aktive/inaktive Auswahl konfigurieren
-        style = ttk.Style()
-        style.configure("profitable.Treeview", 
-                    background="white",
-                    fieldbackground="white",
-                    font=("Arial", 9))
-        style.map('profitable.Treeview', 
-              background=[('selected', '#64c264')])  # Dunkleres Grün
-              
-        style.configure("unprofitable.Treeview", 
-                    background="white",
-                    fieldbackground="white",
-                    font=("Arial", 9))
-        style.map('unprofitable.Treeview', 
-              background=[('selected', '#f48a8a')])  # Dunkleres Rot
-        
-        # Dictionary zum Speichern der IDs nach Symbol und Datum für die Wiederherstellung der Auswahl
-        id_map = {}
-        
-        for call in storage.load_call_data():
-            # Überspringe abgeschlossene Calls
-            if call.get("abgeschlossen", False):
-                continue
-                
-            # Versuche, die Zahlenwerte aus dem Call zu holen
-            try:
-                x_factor_str = call.get("X_Factor") or "0"
-                pl_dollar_str = call.get("PL_Dollar") or "0"
-                # Entferne das "X" und "$", damit wir float-Werte haben
-                x_factor_val = float(x_factor_str.rstrip("X"))
-                pl_dollar_val = float(pl_dollar_str.rstrip("$"))
-            except:
-                x_factor_val = 0
-                pl_dollar_val = 0
-                
-            # Standard-Tag (keine Färbung)
-            row_tag = ""
-                
+        # Nur aktive Calls anzeigen
+        calls = [call for call in storage.load_call_data() if not call.closed]
+        ids = [call.id for call in calls]
+        
+        rows = []
+        for item_id, call in zip(ids, calls):
             # 1) Falls X-Faktor >= 5 => ganze Zeile hellgrün
-            if x_factor_val >= 5:
+            if call.x_factor >= 5:
                 row_tag = "row_green"
             # 2) Sonst, falls $ P/L >= 0 => ganze Zeile hellgrün
-            elif pl_dollar_val >= 0:
+            elif call.pl_dollar >= 0:
                 row_tag = "row_green"
             # 3) Sonst, falls $ P/L < 0 => ganze Zeile hellrot
             else:
                 row_tag = "row_red"
             
-            # Symbol und Datum für die Identifikation des Calls
-            symbol = call.get("Symbol", "")
-            datum = call.get("Datum", "")
-                
-            # Einfügen der Werte in den Treeview
-            item_id = self.calls_tree.insert(
-                "",
-                "end",
-                values=(
-                    datum,
-                    symbol,
-                    call.get("MCAP_at_Call", ""),
-                    call.get("Aktuelles_MCAP", ""),
-                    call.get("X_Factor", ""),
-                    call.get("PL_Percent", ""),
-                    call.get("PL_Dollar", ""),
-                    call.get("Invest", "")
-                ),
-                tags=(row_tag,)
-            )
-            
-            # Speichere die ID für die spätere Wiederherstellung der Auswahl
-            id_map[(datum, symbol)] = item_id
+            # Formatierung erst bei der Anzeige
+            rows.append((item_id, formatters.call_row_values(call), (row_tag,)))
+        
+        # Nur geänderte Zeilen anfassen - Auswahl und Scrollposition bleiben erhalten
+        self.row_calls = dict(zip(ids, calls))
+        self.tree_sync.sync(rows)
+        
+        # Gemerkte Auswahl verwerfen, falls die Zeile nicht mehr existiert
+        if self.current_selected_item not in self.row_calls:
+            self.current_selected_item = None
+            self.current_selected_tag = None
         
         # Standardmäßig nach $ P/L sortieren, absteigend
         self.sort_treeview("PL_Dollar", True)
-        
-        # Stelle die Auswahl wieder her, falls zuvor eine Auswahl vorhanden war
-        if selected_item_values:
-            # Versuche, das Element anhand von Datum und Symbol zu finden
-            datum = selected_item_values[0]
-            symbol = selected_item_values[1]
-            if (datum, symbol) in id_map:
-                item_id = id_map[(datum, symbol)]
-                self.calls_tree.selection_set(item_id)
-                self.current_selected_item = item_id
-                # Bestimme den Tag basierend auf der Profitabilität
-                try:
-                    pl_dollar_str = selected_item_values[6]  # PL_Dollar ist an Position 6
-                    if pl_dollar_str:
-                        pl_dollar = float(pl_dollar_str.rstrip("$"))
-                        is_profitable = pl_dollar >= 0
-                    else:
-                        is_profitable = False
-                except (ValueError, IndexError):
-                    is_profitable = False
-                
-                self.current_selected_tag = "profitable" if is_profitable else "unprofitable"
-                
-                # Setze den Stil basierend auf der Profitabilität
-                if is_profitable:
-                    style.map('Treeview', background=[('selected', '#64c264')])  # Dunkleres Grün
-                else:
-                    style.map('Treeview', background=[('selected', '#f48a8a')])  # Dunkleres Rot
     
     def on_treeview_double_click(self, event):
         """Reagiert auf Doppelklick in der Treeview"""
         item = self.calls_tree.identify_row(event.y)
         if item:
-            # Hole alle Werte der ausgewählten Zeile
-            values = self.calls_tree.item(item, "values")
+            # Link des Calls dieser Zeile
+            call = self.row_calls.get(item)
             
-            # Suche nach dem Link für diesen Call
-            calls = storage.load_call_data()
-            matching_calls = [call for call in calls if 
-                              call.get("Symbol") == values[1] and  # Symbol stimmt überein
-                              call.get("Datum") == values[0]]     # Datum stimmt überein
-            
-            if matching_calls and len(matching_calls) > 0:
-                call = matching_calls[0]
-                link = call.get("Link")
+            if call is not None:
+                link = call.link
                 
                 if link:
                     # Setze den Link in die Entry-Variable
@@ -528,34 +364,8 @@ class CallsTreeView:
             messagebox.showinfo("Hinweis", "Bitte wähle zuerst mindestens einen Call aus, den du löschen möchtest.")
             return
         
-        # Lade vorhandene Calls
-        calls = storage.load_call_data()
-        new_calls = []
-        
-        # Details für jeden ausgewählten Call sammeln
-        to_delete = []
-        for item in selected_items:
-            values = self.calls_tree.item(item, "values")
-            # Speichere Datum, Symbol UND MCAP als eindeutige Identifikation
-            to_delete.append((values[0], values[1], values[2]))  # (Datum, Symbol, MCAP_at_Call)
-            
-        # Nur Calls behalten, die nicht gelöscht werden sollen
-        for call in calls:
-            # Überspringe abgeschlossene Calls
-            if call.get("abgeschlossen", False):
-                new_calls.append(call)
-                continue
-                
-            # Prüfe, ob dieser Call gelöscht werden soll
-            current_call_id = (call.get("Datum", ""), call.get("Symbol", ""), call.get("MCAP_at_Call", ""))
-            if current_call_id in to_delete:
-                continue  # Diesen Call nicht behalten
-            
-            # Ansonsten Call behalten
-            new_calls.append(call)
-        
-        # Speichern und aktualisieren
-        storage.save_call_data(new_calls)
+        # Die Zeilen-IDs sind die IDs der Calls
+        storage.delete_calls(selected_items)
         
         # Setze die Auswahl zurück
         self.current_selected_item = None
@@ -570,29 +380,17 @@ class CallsTreeView:
             messagebox.showinfo("Hinweis", "Bitte wähle zuerst mindestens einen Call aus, den du abschließen möchtest.")
             return
             
-        # Lade vorhandene Calls
-        calls = storage.load_call_data()
-        
-        # Details für jeden ausgewählten Call sammeln
+        # Die Calls der ausgewählten Zeilen (Zeilen-ID = ID des Calls)
         to_close = []
         for item in selected_items:
-            values = self.calls_tree.item(item, "values")
-            # Speichere Datum, Symbol UND MCAP als eindeutige Identifikation
-            to_close.append((values[0], values[1], values[2]))  # (Datum, Symbol, MCAP_at_Call)
-        
-        # Alle Calls durchgehen und abschließen
-        for call in calls:
+            call = storage.get_call(item)
             # Überspringe bereits abgeschlossene Calls
-            if call.get("abgeschlossen", False):
-                continue
-                
-            # Prüfe, ob dieser Call abgeschlossen werden soll
-            current_call_id = (call.get("Datum", ""), call.get("Symbol", ""), call.get("MCAP_at_Call", ""))
-            if current_call_id in to_close:
-                call["abgeschlossen"] = True
+            if call is not None and not call.closed:
+                call.closed = True
+                to_close.append(call)
         
         # Daten speichern und UI aktualisieren
-        storage.save_call_data(calls)
+        storage.update_calls(to_close)
         
         # Setze die Auswahl zurück
         self.current_selected_item = None
@@ -1,10 +1,15 @@
 # Main Bot-Implementierung
+import time
 import tkinter as tk
 from tkinter import messagebox
 import data.api as api
 import data.storage as storage
+import data.refresh_engine as refresh_engine
+import data.scheduler as scheduler
+import data.refresh_policy as refresh_policy
 import utils.formatters as formatters
-from config import API_TIMEOUT, UPDATE_INTERVAL
+from config import (API_TIMEOUT, REFRESH_POLL_INTERVAL, MAIN_BOT_UPDATE_INTERVAL,
+                    REFRESH_CHECK_INTERVAL, REFRESH_ALIGN_WINDOW)
 
 
 class MainBot:
@@ -13,7 +18,8 @@ class MainBot:
         self.shared_vars = main_window.shared_vars
         self.live_update_active = True  # Immer aktiv
         self.current_tab = None  # Aktiver Tab
-        self.main_bot_update_id = None  # ID für den Main-Bot-Refresh
+        self.displayed_link = None      # Link, zu dem current_data gehört
+        self.data_fetched_at = None     # Abrufzeitpunkt von current_data (für die Altersanzeige)
         
         # Update-Methode beim Hauptfenster registrieren
         self.main_window.fetch_data = self.fetch_data
@@ -21,8 +27,31 @@ class MainBot:
         self.main_window.toggle_live_update = self.toggle_live_update
         self.main_window.reset_budget = self.reset_budget
         
-        # Platzhalter für after_id
-        self.live_update_after_id = None
+        # Hintergrund-Aktualisierung für Calls und Watchlist
+        self.refresh_engine = refresh_engine.RefreshEngine(API_TIMEOUT)
+        self.refresh_engine.start()
+        
+        # Abruf des Main-Bot-Links im Hintergrund (Tab-Wechsel und Einfügen blockieren nicht)
+        self.link_fetcher = refresh_engine.LinkFetcher(API_TIMEOUT)
+        self.link_fetcher.start()
+        
+        # Ein gemeinsamer Takt für alle wiederkehrenden Aufgaben. Welche Links wie oft
+        # abgerufen werden, sammelt scheduler.demand je Ansicht ("calls", "watchlist", "main");
+        # jeder Link wird dabei nur einmal pro Intervall abgerufen.
+        self.scheduler = scheduler.Scheduler(REFRESH_POLL_INTERVAL / 1000)
+        self.scheduler.add_task("results", REFRESH_POLL_INTERVAL / 1000, self.process_refresh_results)
+        self.scheduler.add_task("refresh", REFRESH_CHECK_INTERVAL / 1000, self.dispatch_refresh)
+        self.scheduler.pause("refresh")  # startet mit auto_refresh_calls()
+        self.demand_dirty = True
+        # Intervalle je Call nach Kursbewegung und Alter (bewegte Tokens oft, ruhende selten)
+        self.refresh_policy = refresh_policy.AdaptiveRefreshPolicy()
+        storage.events.subscribe("calls", self.on_rows_changed)
+        storage.events.subscribe("watchlist", self.on_rows_changed)
+        # Statistik und Call-Tabellen nur neu berechnen, wenn sich Calls geändert haben
+        self.stats_update_id = None
+        storage.events.subscribe("calls", self.schedule_ui_stats)
+        self.schedule_ui_stats()
+        self.scheduler_after_id = self.main_window.root.after(REFRESH_POLL_INTERVAL, self.run_scheduler)
         
         # Warte kurz, bis das Fenster vollständig initialisiert ist
         self.main_window.root.after(100, self.setup_tab_tracking)
@@ -51,21 +80,10 @@ class MainBot:
         
         # Wenn der Main-Bot-Tab ausgewählt ist (Index 0), starte das Update
         if current_tab_index == main_tab_index:
-            # Hole den aktuellen Link und aktualisiere sofort
-            dex_link = self.shared_vars['entry_var'].get().strip()
-            if dex_link:
-                try:
-                    data = api.fetch_dexscreener_data(dex_link, API_TIMEOUT)
-                    if data and "pairs" in data and data["pairs"]:
-                        self.shared_vars['current_data'] = data
-                        self.update_ui_with_data(data)
-                except Exception:
-                    pass
-                    
-            # Starte den Update-Timer
+            # Zeigt sofort den letzten Stand an und meldet den Link beim Scheduler an
             self.start_main_bot_update()
-        elif current_tab_index != main_tab_index and self.main_bot_update_id:
-            # Wenn ein anderer Tab aktiv ist und ein Update läuft, stoppe es
+        else:
+            # Wenn ein anderer Tab aktiv ist, wird der Main-Bot-Link nicht mehr aktualisiert
             self.stop_main_bot_update()
 
     def toggle_live_update(self):
@@ -79,17 +97,10 @@ class MainBot:
             messagebox.showerror("Fehler", "Bitte einen Dexscreener Link eingeben.")
             return
 
-        data = api.fetch_dexscreener_data(dex_link, API_TIMEOUT)
-        if not data:
-            return  # Fehler wurde bereits in der API-Funktion behandelt
-
-        pairs = data.get("pairs", [])
-        if not pairs:
-            messagebox.showerror("Fehler", "Keine Daten im 'pairs'-Feld gefunden.")
-            return
-
-        self.shared_vars['current_data'] = data
-        self.update_ui_with_data(data)
+        # Letzten bekannten Stand sofort anzeigen, abgerufen wird im Hintergrund
+        # (das Ergebnis übernimmt apply_fetch_result())
+        self.show_snapshot(dex_link)
+        self.request_refresh(dex_link, interactive=True)
         
         # Aktualisiere den aktuellen Tab
         self.current_tab = self.main_window.notebook.select()
@@ -105,6 +116,87 @@ class MainBot:
         except Exception:
             pass
         
+    def show_snapshot(self, dex_link):
+        """
+        Zeigt sofort den letzten bekannten Stand des Links an, ohne auf das Netzwerk zu warten.
+        
+        Returns:
+            True, wenn Daten zum Link angezeigt werden
+        """
+        if dex_link == self.displayed_link and self.shared_vars['current_data']:
+            return True
+        
+        snapshot = api.peek_dexscreener_data(dex_link)
+        if snapshot and snapshot[0].get("pairs"):
+            data, fetched_at = snapshot
+            self.shared_vars['current_data'] = data
+            self.displayed_link = dex_link
+            self.data_fetched_at = fetched_at
+            self.update_ui_with_data(data)
+            return True
+        
+        # Noch nichts gespeichert: alte Token-Daten nicht beim neuen Link stehen lassen
+        self.clear_token_data()
+        return False
+    
+    def clear_token_data(self):
+        """Leert die Token-Daten, bis der Abruf für den neuen Link fertig ist"""
+        self.shared_vars['current_data'] = None
+        self.displayed_link = None
+        self.data_fetched_at = None
+        for key in ('token_blockchain_var', 'token_name_var', 'token_symbol_var', 'token_address_var',
+                    'mcap_var', 'liq_var', 'vol24_var'):
+            self.shared_vars[key].set("")
+        if hasattr(self.main_window, 'xpost_frame') and hasattr(self.main_window.xpost_frame, 'update_xpost_container'):
+            self.main_window.xpost_frame.update_xpost_container()
+    
+    def request_refresh(self, dex_link, interactive=False):
+        """Stößt den Abruf des Links im Hintergrund an (läuft er schon, passiert nichts)"""
+        self.link_fetcher.submit(dex_link, interactive)
+        self.update_data_age()
+    
+    def apply_fetch_result(self, result):
+        """Übernimmt einen fertigen Abruf des LinkFetchers in die UI (läuft im Tk-Thread)"""
+        dex_link = self.shared_vars['entry_var'].get().strip()
+        if result["link"] != dex_link:
+            return  # Link wurde inzwischen geändert
+        
+        data = result["data"]
+        if not data:
+            return  # Fehler wurde bereits in der API-Funktion ausgegeben
+        
+        if not data.get("pairs"):
+            if result["interactive"]:
+                messagebox.showerror("Fehler", "Keine Daten im 'pairs'-Feld gefunden.")
+            return
+        
+        self.data_fetched_at = result["fetched_at"]
+        # Unveränderte Daten nicht neu zeichnen, nur das Alter aktualisieren
+        if dex_link == self.displayed_link and data == self.shared_vars['current_data']:
+            return
+        
+        self.shared_vars['current_data'] = data
+        self.displayed_link = dex_link
+        self.update_ui_with_data(data)
+    
+    def update_data_age(self):
+        """Aktualisiert die Altersanzeige der Token-Daten (nur bei geändertem Text)"""
+        dex_link = self.shared_vars['entry_var'].get().strip()
+        pending = bool(dex_link) and self.link_fetcher.is_pending(dex_link)
+        
+        if self.data_fetched_at is not None and dex_link == self.displayed_link:
+            text = f"Stand: {formatters.format_age(time.time() - self.data_fetched_at)}"
+            if pending:
+                text += " · aktualisiere …"
+        elif pending:
+            text = "Lädt …"
+        else:
+            text = ""
+        
+        age_var = self.shared_vars['data_age_var']
+        if age_var.get() != text:
+            age_var.set(text)
+        
     def update_ui_with_data(self, data):
         """Aktualisiert die UI mit den Daten aus der API"""
         pairs = data.get("pairs", [])
@@ -258,199 +350,157 @@ class MainBot:
             messagebox.showinfo("Erfolg", "Der Kontostand wurde auf 500$ zurückgesetzt.")
     
     def start_main_bot_update(self):
-        """Startet die automatische Aktualisierung des Main Bot Tabs alle 30 Sekunden"""
-        # Stoppe vorherige Updates, falls vorhanden
-        self.stop_main_bot_update()
-        
+        """Startet die automatische Aktualisierung des Main Bot Tabs (alle MAIN_BOT_UPDATE_INTERVAL ms)"""
         # Hole den aktuellen Dexscreener-Link
         dex_link = self.shared_vars['entry_var'].get().strip()
         if not dex_link:
+            self.stop_main_bot_update()
             return  # Kein Link, kein Update
         
-        # Führe ein sofortiges Update durch
-        try:
-            data = api.fetch_dexscreener_data(dex_link, API_TIMEOUT)
-            if data and "pairs" in data and data["pairs"]:
-                self.shared_vars['current_data'] = data
-                self.update_ui_with_data(data)
-        except Exception:
-            pass
+        # Letzten Stand sofort anzeigen und im Hintergrund aktualisieren
+        self.show_snapshot(dex_link)
+        self.request_refresh(dex_link)
         
-        # Starte den Update-Timer (30000 ms = 30 Sekunden)
-        self.main_bot_update_id = self.main_window.root.after(30000, self.update_main_bot_data)
+        # Weitere Abrufe übernimmt der Scheduler (zusammen mit den Calls)
+        self.scheduler.demand.set("main", {dex_link: MAIN_BOT_UPDATE_INTERVAL / 1000})
     
     def stop_main_bot_update(self):
         """Stoppt die automatische Aktualisierung des Main Bot Tabs"""
-        if self.main_bot_update_id:
-            self.main_window.root.after_cancel(self.main_bot_update_id)
-            self.main_bot_update_id = None
+        self.scheduler.demand.clear("main")
     
-    def update_main_bot_data(self):
-        """Aktualisiert die Daten im Main Bot Tab"""
-        # Vergleichen des aktuellen Tab-Index statt des Tab-Objekts
-        try:
-            current_tab_index = self.main_window.notebook.index(self.current_tab)
-            main_tab_index = self.main_window.notebook.index(self.main_window.tabs['main'])
-            
-            # Nur aktualisieren, wenn der Main Bot Tab aktiv ist
-            if current_tab_index == main_tab_index:
-                # Hole den aktuellen Dexscreener-Link
-                dex_link = self.shared_vars['entry_var'].get().strip()
-                if dex_link:
-                    try:
-                        # Rufe die API ab, ohne Fehlermeldungen anzuzeigen
-                        data = api.fetch_dexscreener_data(dex_link, API_TIMEOUT)
-                        if data and "pairs" in data and data["pairs"]:
-                            # Aktualisiere die UI mit den neuen Daten
-                            self.shared_vars['current_data'] = data
-                            self.update_ui_with_data(data)
-                    except Exception:
-                        pass
-            
-            # Plane das nächste Update
-            self.main_bot_update_id = self.main_window.root.after(30000, self.update_main_bot_data)
-            
-        except Exception:
-            # Starten Sie dennoch einen neuen Timer, um die Update-Schleife nicht zu unterbrechen
-            self.main_bot_update_id = self.main_window.root.after(30000, self.update_main_bot_data)
+    def run_scheduler(self):
+        """Gemeinsamer Tk-Timer: führt die fälligen Aufgaben des Schedulers aus"""
+        self.scheduler.run_due()
+        self.scheduler_after_id = self.main_window.root.after(REFRESH_POLL_INTERVAL, self.run_scheduler)
+    
+    def on_rows_changed(self):
+        """Calls oder Watchlist wurden geändert - gewünschte Links beim nächsten Abruf neu bestimmen"""
+        self.demand_dirty = True
+    
+    def update_demand(self):
+        """Überträgt die Links der aktiven Calls und der Watchlist mit ihren adaptiven Intervallen an den Scheduler"""
+        calls = self.link_intervals(call for call in storage.load_call_data() if not call.closed)
+        watchlist = self.link_intervals(storage.load_watchlist_data())
+        self.scheduler.demand.set("calls", calls)
+        self.scheduler.demand.set("watchlist", watchlist)
+        self.refresh_policy.retain(list(calls) + list(watchlist))
+        self.demand_dirty = False
+    
+    def link_intervals(self, rows):
+        """Abrufintervall je Link (bei mehreren Einträgen mit demselben Link gilt das kürzeste)"""
+        intervals = {}
+        for row in rows:
+            interval = self.refresh_policy.interval(row.link, row.created_at)
+            intervals[row.link] = min(interval, intervals.get(row.link, interval))
+        return intervals
 
     def auto_refresh_calls(self):
         """
-        Aktualisiert alle Calls und Watchlist-Einträge mit aktuellen Daten.
-        Funktioniert jetzt mit verbesserter Watchlist-Unterstützung.
+        Startet die automatische Aktualisierung aller Calls und Watchlist-Einträge.
+        Fällige Links sammelt der Scheduler (Aufgabe "refresh", siehe dispatch_refresh()).
         """
-        # Aktualisiere Calls
-        self.update_active_calls()
-        
-        # Aktualisiere Watchlist
-        self.update_watchlist_items()
+        self.scheduler.resume("refresh", immediate=True)
+
+    def dispatch_refresh(self):
+        """
+        Reicht alle fälligen Links gesammelt an die RefreshEngine weiter.
+        Abruf und Berechnung laufen im Hintergrund, die Ergebnisse übernimmt process_refresh_results().
+        """
+        # Nur einen Auftrag gleichzeitig, damit sich bei langsamer API nichts aufstaut
+        if self.refresh_engine.is_busy():
+            return
+        if self.demand_dirty:
+            self.update_demand()
         
-        # Aktualisiere UI
-        self.update_ui_stats()
+        demand = self.scheduler.demand
+        due = set(demand.due(align_window=REFRESH_ALIGN_WINDOW / 1000))
+        if not due:
+            return
         
-        # Plane den nächsten Update-Aufruf
-        self.live_update_after_id = self.main_window.root.after(UPDATE_INTERVAL, self.auto_refresh_calls)
+        calls = [call for call in storage.load_call_data() if not call.closed and call.link in due]
+        watchlist = [item for item in storage.load_watchlist_data() if item.link in due]
+        main_links = [link for link in due if "main" in demand.consumers(link)]
+        # Als abgerufen gelten die Links erst mit dem Ergebnis (siehe process_refresh_results);
+        # scheitert der Auftrag, sind sie beim nächsten Durchlauf wieder fällig
+        self.refresh_engine.submit(calls, watchlist, main_links)
+
+    def process_refresh_results(self):
+        """Übernimmt fertige Ergebnisse von RefreshEngine und LinkFetcher in Daten und UI (läuft im Tk-Thread)"""
+        try:
+            for result in self.refresh_engine.poll_results():
+                self.scheduler.demand.mark_fetched(result["fetched"])
+                self.scheduler.record("refresh.fetch", result["duration"])
+                for link, (market_cap, change_m5, observed_at) in result["observations"].items():
+                    self.refresh_policy.observe(link, market_cap, change_m5, now=observed_at)
+                # Neue Beobachtungen ändern die Intervalle
+                self.demand_dirty = True
+                self.update_active_calls(result["calls"])
+                self.update_watchlist_items(result["watchlist"])
+                for link, data in result["links"].items():
+                    # Wie beim LinkFetcher: bei Treffern aus dem Cache zählt deren Alter
+                    fetched_at = result["response_times"].get(link, result["fetched_at"])
+                    self.apply_fetch_result({"link": link, "data": data,
+                                             "fetched_at": fetched_at, "interactive": False})
+            for result in self.link_fetcher.poll_results():
+                self.scheduler.demand.mark_fetched([result["link"]])
+                self.apply_fetch_result(result)
+            self.update_data_age()
+        except Exception as e:
+            print(f"Fehler beim Übernehmen der Aktualisierung: {e}")
 
-    def update_active_calls(self):
-        """Aktualisiert die aktiven Calls mit aktuellen Daten"""
-        calls = storage.load_call_data()
-        updated_calls = []
-        
-        for call in calls:
-            # Abgeschlossene Calls direkt übernehmen
-            if call.get("abgeschlossen", False):
-                updated_calls.append(call)
+    def update_active_calls(self, updates):
+        """
+        Übernimmt berechnete Updates in die aktiven Calls.
+        
+        Nur Calls mit geänderter Marktkapitalisierung werden ans Repository
+        übergeben; ohne Änderung wird weder gemeldet noch gespeichert.
+        
+        Args:
+            updates: Dictionary ID -> (Link, aktuelle Marktkapitalisierung) aus der RefreshEngine
+        """
+        changed = []
+        for call in storage.load_call_data():
+            # Abgeschlossene Calls unverändert lassen
+            if call.closed:
                 continue
-                
-            # Aktualisierung für aktive Calls
-            try:
-                # Rufe Daten basierend auf dem Symbol oder Link ab
-                symbol = call.get("Symbol")
-                link = call.get("Link")
-                
-                # API-Daten abrufen
-                data = api.fetch_dexscreener_data(link, API_TIMEOUT)
-                
-                if data and "pairs" in data and data["pairs"]:
-                    pair_info = data["pairs"][0]
-                    
-                    # Market Cap aktualisieren
-                    market_cap = pair_info.get("marketCap", pair_info.get("mcap", pair_info.get("fdv", "N/A")))
-                    call["Aktuelles_MCAP"] = formatters.format_k(market_cap)
-                    
-                    # Berechnung der Kennzahlen für aktive Calls
-                    initial_mcap = formatters.parse_km(call.get("MCAP_at_Call", "0"))
-                    current_mcap = formatters.parse_km(call.get("Aktuelles_MCAP", "0"))
-                    
-                    if initial_mcap > 0 and current_mcap > 0:
-                        x_factor = current_mcap / initial_mcap
-                        pl_percent = (x_factor - 1) * 100
-                        
-                        # Invest-Wert aus dem Call verwenden oder auf 10$ setzen
-                        invest = 10.0
-                        try:
-                            invest_str = call.get("Invest", "10")
-                            invest = float(invest_str)
-                        except:
-                            invest = 10.0
-                            
-                        pl_dollar = invest * x_factor - invest
-                        
-                        call["X_Factor"] = f"{x_factor:.1f}X"
-                        call["PL_Percent"] = f"{pl_percent:.0f}%"
-                        call["PL_Dollar"] = f"{pl_dollar:.2f}$"
-                        call["Invest"] = f"{invest}"
-                    else:
-                        # Fallback bei ungültigen Werten
-                        call["X_Factor"] = "0.0X"
-                        call["PL_Percent"] = "0%"
-                        call["PL_Dollar"] = "0.00$"
-                        call["Invest"] = "10"
-            except Exception:
-                pass
-                
-            updated_calls.append(call)
             
-        # Speichern der aktualisierten Calls
-        storage.save_call_data(updated_calls)
+            market_cap = refresh_engine.updated_market_cap(call, updates)
+            if market_cap and market_cap != call.current_mcap:
+                call.current_mcap = market_cap
+                changed.append(call)
+            
+        if changed:
+            storage.update_calls(changed)
 
-    def update_watchlist_items(self):
-        """Aktualisiert die Watchlist-Einträge mit aktuellen Daten"""
-        watchlist = storage.load_watchlist_data()
-        updated_watchlist = []
-        
-        for item in watchlist:
-            try:
-                # Rufe Daten basierend auf dem Link ab
-                symbol = item.get("Symbol")
-                link = item.get("Link")
-                
-                # API-Daten abrufen
-                data = api.fetch_dexscreener_data(link, API_TIMEOUT)
-                
-                if data and "pairs" in data and data["pairs"]:
-                    pair_info = data["pairs"][0]
-                    
-                    # Market Cap aktualisieren
-                    market_cap = pair_info.get("marketCap", pair_info.get("mcap", pair_info.get("fdv", "N/A")))
-                    item["Aktuelles_MCAP"] = formatters.format_k(market_cap)
-                    
-                    # Berechne X-Factor, PL_Percent und PL_Dollar
-                    initial_mcap = formatters.parse_km(item.get("MCAP_at_Call", "0"))
-                    current_mcap = formatters.parse_km(item.get("Aktuelles_MCAP", "0"))
-                    
-                    if initial_mcap > 0 and current_mcap > 0:
-                        x_factor = current_mcap / initial_mcap
-                        pl_percent = (x_factor - 1) * 100
-                        
-                        # Fiktiver Invest-Wert für die Anzeige (10$)
-                        invest = 10.0
-                        pl_dollar = invest * x_factor - invest
-                        
-                        item["X_Factor"] = f"{x_factor:.1f}X"
-                        item["PL_Percent"] = f"{pl_percent:.0f}%"
-                        item["PL_Dollar"] = f"{pl_dollar:.2f}$"
-                        item["Invest"] = "10"  # Fester Wert für die Anzeige
-                    else:
-                        # Fallback bei ungültigen Werten
-                        item["X_Factor"] = "0.0X"
-                        item["PL_Percent"] = "0%"
-                        item["PL_Dollar"] = "0.00$"
-                        item["Invest"] = "10"
-            except Exception:
-                pass
-                
-            updated_watchlist.append(item)
+    def update_watchlist_items(self, updates):
+        """
+        Übernimmt berechnete Updates in die Watchlist-Einträge (nur geänderte).
+        
+        Args:
+            updates: Dictionary ID -> (Link, aktuelle Marktkapitalisierung) aus der RefreshEngine
+        """
+        changed = []
+        for item in storage.load_watchlist_data():
+            market_cap = refresh_engine.updated_market_cap(item, updates)
+            if market_cap and market_cap != item.current_mcap:
+                item.current_mcap = market_cap
+                changed.append(item)
             
-        # Speichern der aktualisierten Watchlist
-        storage.save_watchlist_data(updated_watchlist)
+        if not changed or not storage.update_watchlist_items(changed):
+            return
         
         # Aktualisiere die Watchlist-Treeview
         if hasattr(self.main_window, 'update_watchlist_tree'):
             self.main_window.update_watchlist_tree()
 
+    def schedule_ui_stats(self):
+        """Plant eine Aktualisierung der Statistik; mehrere Änderungen an Calls werden zusammengefasst"""
+        if self.stats_update_id is None:
+            self.stats_update_id = self.main_window.root.after_idle(self.update_ui_stats)
+
     def update_ui_stats(self):
         """Aktualisiert die statistischen Daten im UI basierend auf der neuen Logik"""
+        self.stats_update_id = None
         # Aktualisiere die Treeviews
         if hasattr(self.main_window, 'calls_tree'):
             self.main_window.calls_tree.update_tree()
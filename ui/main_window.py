@@ -29,6 +29,7 @@ class MainWindow:
             'discord_var': tk.StringVar(root),
             'live_update_active': tk.BooleanVar(root, value=True),
             'current_data': None,
+            'data_age_var': tk.StringVar(root),  # Alter der angezeigten Token-Daten
         }
         # Listen für Timeframe-Daten
         self.time_price_vars = []
@@ -234,7 +235,7 @@ class MainWindow:
 
         # Empfehlungs-Frame erstellen
         from ui.recommendation_frame import RecommendationFrame
-        recommendation_frame = RecommendationFrame(self.bottom_right, self.shared_vars, self)
+        self.recommendation_frame = RecommendationFrame(self.bottom_right, self.shared_vars, self)
         
         # Speichere die Container im Dictionary für späteren Zugriff
         self.main_containers = {
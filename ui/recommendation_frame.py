@@ -1,12 +1,19 @@
-# Empfehlungsframe ohne RugCheck-Verweise
+# Empfehlungsframe ohne RugCheck-Verweise, mit Live-Rangliste des Strategie-Scanners
+import queue
 import tkinter as tk
+from tkinter import ttk
 import ui.styles as styles
+from config import STRATEGY_POLL_INTERVAL
+from data.birdeye_api import extract_token_data_for_ui, get_api_keys
+from ui.tree_sync import TreeSync
 
 class RecommendationFrame:
     def __init__(self, parent, shared_vars, main_window=None):
         self.parent = parent
         self.shared_vars = shared_vars
         self.main_window = main_window
+        self.scanner = None
+        self.tree = None
         self.create_frame()
         
     def create_frame(self):
@@ -21,7 +28,7 @@ class RecommendationFrame:
         self.frame.pack(fill="both", expand=True)
         
         # Überschrift mit Typografie
-        title_label = tk.Label(
+        self.title_label = tk.Label(
             self.frame,
             text="",
             font=("Arial", 10),
@@ -29,15 +36,82 @@ class RecommendationFrame:
             fg="#888888"
         )
         # Typografie-Anwendung
-        styles.apply_typography(title_label, 'section_header')
-        title_label.pack(anchor="center", pady=(10,5))
+        styles.apply_typography(self.title_label, 'section_header')
+        self.title_label.pack(anchor="center", pady=(10,5))
         
         # Informations-Label
-        info_label = tk.Label(
+        self.info_label = tk.Label(
             self.frame,
             text="",
             font=("Arial", 10),
             bg="#ebebeb",
             fg="#888888"
         )
-        info_label.pack(anchor="center", expand=True)
\ No newline at end of file
+        self.info_label.pack(anchor="center", expand=True)
+
+    def create_ranking_tree(self):
+        """Erstellt die Tabelle für die Rangliste des Strategie-Scanners"""
+        self.tree = ttk.Treeview(
+            self.frame,
+            columns=("Symbol", "MCAP", "Score", "Trend"),
+            show="headings",
+            style="Treeview",
+            selectmode="none"
+        )
+        self.tree.heading("Symbol", text="Token")
+        self.tree.heading("MCAP", text="MCAP")
+        self.tree.heading("Score", text="Score")
+        self.tree.heading("Trend", text="Vol.")
+        self.tree.column("Symbol", width=60)
+        self.tree.column("MCAP", width=50, anchor="e")
+        self.tree.column("Score", width=45, anchor="e")
+        self.tree.column("Trend", width=30, anchor="center")
+        self.tree_sync = TreeSync(self.tree)
+
+    def start_scanner(self):
+        """
+        Startet den Strategie-Scanner (nur mit Birdeye-API-Key).
+
+        Der Scanner läuft in einem eigenen Thread und legt jede neue Rangliste
+        in einer Queue ab; der Tk-Thread holt sie über root.after ab.
+        """
+        if self.scanner is not None or not get_api_keys():
+            return
+        from data.strategy_scanner import StrategyScanner
+        self.rankings = queue.Queue()
+        self.scanner = StrategyScanner(on_update=self.rankings.put)
+        self.create_ranking_tree()
+        self.title_label.config(text="Second Bounce")
+        self.info_label.config(text="Scan läuft...")
+        self.scanner.start()
+        self.frame.after(STRATEGY_POLL_INTERVAL, self.poll_ranking)
+
+    def stop_scanner(self):
+        """Beendet den Strategie-Scanner"""
+        if self.scanner is not None:
+            self.scanner.stop()
+
+    def poll_ranking(self):
+        """Übernimmt die neueste Rangliste des Scanners in die Tabelle"""
+        ranking = None
+        try:
+            while True:
+                ranking = self.rankings.get_nowait()
+        except queue.Empty:
+            pass
+        if ranking is not None:
+            self.show_ranking(ranking)
+        if self.scanner.running:
+            self.frame.after(STRATEGY_POLL_INTERVAL, self.poll_ranking)
+
+    def show_ranking(self, ranking):
+        """Zeigt die Rangliste an (nur geänderte Zeilen werden angefasst)"""
+        if ranking and not self.tree.winfo_manager():
+            self.info_label.pack_forget()
+            self.tree.pack(fill="both", expand=True, padx=5, pady=(0, 5))
+        rows = []
+        for analysis in ranking:
+            symbol, mcap, score, _potential, volume_trend, _reason = extract_token_data_for_ui(analysis)
+            rows.append((analysis["token_address"], (symbol, mcap, score, volume_trend), ()))
+        self.tree_sync.sync(rows)
+        self.tree_sync.reorder([iid for iid, _values, _tags in rows])
\ No newline at end of file
@@ -84,6 +84,21 @@ def setup_styles():
         background=[('selected', '')],  # Leere Farbe für Auswahl
         foreground=[('selected', 'black')])  # Textfarbe bleibt schwarz
 
+    # Auswahlfarben für profitable/unprofitable Zeilen (Calls und Beobachtungsliste)
+    style.configure("profitable.Treeview", 
+                background="white",
+                fieldbackground="white",
+                font=("Arial", 9))
+    style.map('profitable.Treeview', 
+          background=[('selected', '#64c264')])  # Dunkleres Grün
+          
+    style.configure("unprofitable.Treeview", 
+                background="white",
+                fieldbackground="white",
+                font=("Arial", 9))
+    style.map('unprofitable.Treeview', 
+          background=[('selected', '#f48a8a')])  # Dunkleres Rot
+
 
 def create_data_row(parent, label_text, var, row, show_copy_button=True):
     """
@@ -13,7 +13,7 @@ class TokenFrame:
         self.original_button_bg = None  # Für den Watchlist-Button
         self.original_dex_bg = None     # Für den DexScreener-Button
         self.current_link = ""          # Für die Link-Überwachung
-        self.link_check_id = None       # Für after_cancel
+        self.status_check_id = None     # Geplante Prüfung des Watchlist-Status (after_idle)
         self.create_frame()
 
     def create_frame(self):
@@ -22,16 +22,31 @@ class TokenFrame:
         self.frame = tk.Frame(self.parent, bg="white", padx=20, pady=20)
         self.frame.pack(fill="both", expand=True)
         
+        # Kopfzeile mit Titel und Alter der Daten
+        header_frame = tk.Frame(self.frame, bg="white")
+        header_frame.pack(fill="x", pady=(0,10))
+        
         # Titel für Token-Daten
         title_label = tk.Label(
-            self.frame, 
+            header_frame, 
             text="Token-Daten", 
             bg="white", 
             anchor="w"
         )
         # Neue Typografie-Anwendung
         styles.apply_typography(title_label, 'section_header')
-        title_label.pack(anchor="w", pady=(0,10))
+        title_label.pack(side="left")
+        
+        # Alter der angezeigten Daten (z.B. "Stand: vor 12 s")
+        age_label = tk.Label(
+            header_frame,
+            textvariable=self.shared_vars['data_age_var'],
+            font=("Arial", 9),
+            bg="white",
+            fg="#888888",
+            anchor="e"
+        )
+        age_label.pack(side="right")
         
         # Container für die Datenzeilen
         data_container = tk.Frame(self.frame, bg="white")
@@ -81,7 +96,11 @@ class TokenFrame:
         self.original_button_bg = self.watchlist_button.cget("bg")
         self.original_dex_bg = self.dexscreener_button.cget("bg")
         
-        # Starte die Farbaktualisierung
+        # Farbe nur bei geändertem Token/Link oder geänderter Watchlist aktualisieren
+        self.shared_vars['token_symbol_var'].trace_add("write", lambda *args: self.schedule_watchlist_status())
+        self.shared_vars['entry_var'].trace_add("write", lambda *args: self.schedule_watchlist_status())
+        storage.events.subscribe("watchlist", self.schedule_watchlist_status)
+        self.frame.bind("<Destroy>", lambda event: storage.events.unsubscribe("watchlist", self.schedule_watchlist_status))
         self.check_watchlist_status()
 
     # Restliche Methoden bleiben unverändert
@@ -108,17 +127,15 @@ class TokenFrame:
                 return
             
             # Prüfe, ob der Coin bereits auf der Watchlist ist
-            watchlist_items = storage.load_watchlist_data()
-            already_on_watchlist = any(
-                item.get("Symbol") == symbol for item in watchlist_items
-            )
+            already_on_watchlist = bool(storage.find_watchlist_items(symbol=symbol))
             
             if already_on_watchlist:
                 # Keine Benachrichtigung, einfach nichts tun
                 return
             
             # Erstelle neuen Watchlist-Eintrag
-            watchlist_item = storage.create_new_watchlist_item(symbol, mcap, link)
+            market_cap = storage.current_market_cap(self.shared_vars.get('current_data'), mcap)
+            watchlist_item = storage.create_new_watchlist_item(symbol, market_cap, link)
             
             # Speichere den neuen Eintrag
             storage.save_new_watchlist_item(watchlist_item)
@@ -133,13 +150,15 @@ class TokenFrame:
         except Exception as e:
             messagebox.showerror("Fehler", f"Fehler beim Hinzufügen zur Beobachtungsliste: {e}")
     
+    def schedule_watchlist_status(self):
+        """Plant eine Prüfung des Watchlist-Status; mehrere Änderungen werden zusammengefasst"""
+        if self.status_check_id is None:
+            self.status_check_id = self.frame.after_idle(self.check_watchlist_status)
+    
     def check_watchlist_status(self):
         """Überprüft, ob der aktuelle Token auf der Watchlist ist und aktualisiert die Button-Farbe"""
+        self.status_check_id = None
         try:
-            # Breche vorherige Timer ab
-            if self.link_check_id:
-                self.frame.after_cancel(self.link_check_id)
-            
             # Hole aktuelle Daten
             symbol = self.shared_vars['token_symbol_var'].get()
             current_link = self.shared_vars['entry_var'].get()
@@ -147,10 +166,7 @@ class TokenFrame:
             # Wenn ein Symbol geladen ist
             if symbol and symbol != "N/A":
                 # Prüfe, ob auf Watchlist
-                watchlist_items = storage.load_watchlist_data()
-                on_watchlist = any(
-                    item.get("Symbol") == symbol for item in watchlist_items
-                )
+                on_watchlist = bool(storage.find_watchlist_items(symbol=symbol))
                 
                 # Aktualisiere Button-Farbe
                 if on_watchlist:
@@ -162,10 +178,5 @@ class TokenFrame:
             if current_link != self.current_link:
                 self.current_link = current_link
             
-            # Plane nächste Überprüfung
-            self.link_check_id = self.frame.after(500, self.check_watchlist_status)
-            
         except Exception as e:
-            print(f"Fehler bei Watchlist-Statusüberprüfung: {e}")
-            # Trotz Fehler weitermachen mit Timer
-            self.link_check_id = self.frame.after(500, self.check_watchlist_status)
\ No newline at end of file
+            print(f"Fehler bei Watchlist-Statusüberprüfung: {e}")
\ No newline at end of file
@@ -0,0 +1,64 @@
+# Differenzbasierte Aktualisierung von Treeviews
+from typing import Dict, Iterable, Sequence, Tuple
+
+class TreeSync:
+    """
+    Gleicht einen ttk.Treeview mit einer Liste von Zeilen ab.
+
+    Statt bei jeder Aktualisierung alle Zeilen zu löschen und neu einzufügen,
+    werden nur neue Zeilen eingefügt, verschwundene gelöscht und bei
+    bestehenden Zeilen nur geänderte Werte bzw. Tags gesetzt. Als Zeilen-ID
+    dient die ID des Calls (siehe data.models.Call), damit bleiben Auswahl
+    und Scrollposition erhalten.
+    """
+
+    def __init__(self, tree):
+        self.tree = tree
+        # Zuletzt gesetzter Stand je Zeile: ID -> (Werte, Tags)
+        self.rows: Dict[str, Tuple[tuple, tuple]] = {}
+
+    def sync(self, rows: Iterable[Tuple[str, Sequence, Sequence]]) -> None:
+        """
+        Übernimmt die Zeilen in den Treeview.
+
+        Args:
+            rows: (Zeilen-ID, Werte, Tags) je Zeile; neue Zeilen werden
+                  in dieser Reihenfolge am Ende angehängt
+        """
+        seen = set()
+        for iid, values, tags in rows:
+            values, tags = tuple(values), tuple(tags)
+            seen.add(iid)
+            cached = self.rows.get(iid)
+            if cached is None:
+                self.tree.insert("", "end", iid=iid, values=values, tags=tags)
+            elif cached[0] != values and cached[1] != tags:
+                self.tree.item(iid, values=values, tags=tags)
+            elif cached[0] != values:
+                self.tree.item(iid, values=values)
+            elif cached[1] != tags:
+                self.tree.item(iid, tags=tags)
+            self.rows[iid] = (values, tags)
+
+        removed = [iid for iid in self.rows if iid not in seen]
+        if removed:
+            self.tree.delete(*removed)
+            for iid in removed:
+                del self.rows[iid]
+
+    def reorder(self, iids: Sequence[str]) -> None:
+        """Ordnet die Zeilen neu an; verschoben wird nur, was nicht bereits an seiner Position steht."""
+        children = list(self.tree.get_children(""))
+        if children == list(iids):
+            return
+        for index, iid in enumerate(iids):
+            if children[index] != iid:
+                self.tree.move(iid, "", index)
+                children.remove(iid)
+                children.insert(index, iid)
+
+    def clear(self) -> None:
+        """Entfernt alle Zeilen."""
+        if self.rows:
+            self.tree.delete(*self.rows)
+            self.rows.clear()
\ No newline at end of file
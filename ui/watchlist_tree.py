@@ -4,6 +4,8 @@ from tkinter import ttk, messagebox, simpledialog
 import webbrowser
 import data.storage as storage
 import utils.formatters as formatters
+from data.models import SORT_KEYS, new_id
+from ui.tree_sync import TreeSync
 
 class WatchlistTreeView:
     def __init__(self, parent, main_window):
@@ -94,6 +96,12 @@ class WatchlistTreeView:
         
         # Sortierungsstatus initialisieren
         self.sort_status = {"column": None, "reverse": False}
+        
+        # Zuordnung Zeilen-ID -> angezeigter Eintrag (wird in update_tree befüllt)
+        self.row_items = {}
+        
+        # Abgleich der Zeilen bei Aktualisierungen
+        self.tree_sync = TreeSync(self.watchlist_tree)
     
     def edit_mcap_at_call(self):
         """Bearbeitet den MCAP at Safe Wert des ausgewählten Eintrags"""
@@ -104,12 +112,11 @@ class WatchlistTreeView:
             
         # Wenn mehrere ausgewählt sind, nur den ersten bearbeiten
         item = selected_items[0]
-        values = self.watchlist_tree.item(item, "values")
-        
-        # Datum, Symbol und MCAP_at_Call aus den Werten extrahieren
-        datum = values[0]
-        symbol = values[1]
-        current_mcap = values[2]
+        selected_entry = self.row_items.get(item)
+        if selected_entry is None:
+            return
+        symbol = selected_entry.symbol
+        current_mcap = formatters.format_k(selected_entry.mcap_at_call)
         
         # Dialog zur Eingabe des neuen MCAP-Wertes
         new_mcap = simpledialog.askstring(
@@ -131,44 +138,19 @@ class WatchlistTreeView:
             messagebox.showerror("Fehler", "Bitte gib einen gültigen MCAP-Wert ein (z.B. 500K, 1.2M)")
             return
             
-        # Formatiere den neuen Wert im K/M Format
+        # Formatiert für die Bestätigung, gespeichert wird der Rohwert
         formatted_mcap = formatters.format_k(parsed_value)
         
-        # Lade alle Watchlist-Einträge
-        watchlist_items = storage.load_watchlist_data()
-        
-        # Finde den entsprechenden Eintrag und aktualisiere den MCAP-Wert
-        item_found = False
-        for item in watchlist_items:
-            if item.get("Datum") == datum and item.get("Symbol") == symbol:
-                # MCAP-Wert aktualisieren
-                item["MCAP_at_Call"] = formatted_mcap
-                
-                # X-Factor, PL_Percent und PL_Dollar neu berechnen
-                initial_mcap = formatters.parse_km(formatted_mcap)
-                current_mcap = formatters.parse_km(item.get("Aktuelles_MCAP", "0"))
-                
-                if initial_mcap > 0 and current_mcap > 0:
-                    x_factor = current_mcap / initial_mcap
-                    pl_percent = (x_factor - 1) * 100
-                    
-                    # Fiktiver Invest-Wert für die Anzeige (10$)
-                    invest = 10.0
-                    pl_dollar = invest * x_factor - invest
-                    
-                    item["X_Factor"] = f"{x_factor:.1f}X"
-                    item["PL_Percent"] = f"{pl_percent:.0f}%"
-                    item["PL_Dollar"] = f"{pl_dollar:.2f}$"
-                
-                item_found = True
-                break
-                
-        if not item_found:
+        # Finde den entsprechenden Eintrag über seine ID (= Zeilen-ID)
+        entry = storage.get_watchlist_item(item)
+        if entry is None:
             messagebox.showerror("Fehler", f"Der Eintrag für {symbol} konnte nicht gefunden werden.")
             return
             
-        # Speichere die aktualisierten Watchlist-Einträge
-        storage.save_watchlist_data(watchlist_items)
+        # MCAP-Wert aktualisieren und speichern
+        # (X-Factor und P/L ergeben sich daraus im Modell)
+        entry.mcap_at_call = parsed_value
+        storage.update_watchlist_items([entry])
         
         # Aktualisiere die Anzeige
         self.update_tree()
@@ -181,55 +163,12 @@ class WatchlistTreeView:
         # Speichere die aktuelle Auswahl, bevor wir sortieren
         selected_items = self.watchlist_tree.selection()
         
-        # Liste aller Zeilen-IDs und ihre Werte in der Sortierspalte
-        data = []
-        for child in self.watchlist_tree.get_children(''):
-            values = self.watchlist_tree.item(child, 'values')
-            col_index = self.watchlist_tree["columns"].index(column)
-            data.append((child, values[col_index]))
-        
-        # Custom Sortierfunktion basierend auf dem Datentyp
-        def sort_by_value(item):
-            value = item[1]
-            if column in ["X_Factor"]:
-                # Entferne 'X' und konvertiere zu float
-                try:
-                    return float(value.rstrip("X"))
-                except ValueError:
-                    return 0
-            elif column in ["PL_Percent"]:
-                # Entfernt '%' und konvertiert zu float
-                try:
-                    return float(value.rstrip("%"))
-                except ValueError:
-                    return 0
-            elif column in ["PL_Dollar"]:
-                # Entfernt '$' und konvertiert zu float
-                try:
-                    return float(value.rstrip("$"))
-                except ValueError:
-                    return 0
-            elif column in ["MCAP_at_Call", "Aktuelles_MCAP"]:
-                # Konvertiere K/M Notation zu float
-                try:
-                    return formatters.parse_km(value)
-                except ValueError:
-                    return 0
-            elif column in ["Invest"]:
-                # Konvertiere direkt zu float
-                try:
-                    return float(value)
-                except ValueError:
-                    return 0
-            # Für Datum und Symbol: alphabetische Sortierung
-            return value
-        
-        # Sortiere die Daten
-        data.sort(key=sort_by_value, reverse=reverse)
+        # Sortiert wird nach den Rohwerten der Einträge, nicht nach den angezeigten Strings
+        sort_key = SORT_KEYS[column]
+        data = sorted(self.watchlist_tree.get_children(''), key=lambda child: sort_key(self.row_items[child]), reverse=reverse)
         
-        # Neu anordnen der Elemente im Treeview
-        for i, item in enumerate(data):
-            self.watchlist_tree.move(item[0], '', i)
+        # Neu anordnen der Elemente im Treeview (nur wenn sich die Reihenfolge geändert hat)
+        self.tree_sync.reorder(data)
         
         # Aktualisiere den Sortierungsstatus
         self.sort_status = {"column": column, "reverse": reverse}
@@ -300,16 +239,7 @@ class WatchlistTreeView:
         self.watchlist_tree.selection_set(item)
         
         # Bestimme, ob der Watchlist-Eintrag profitabel ist (basierend auf PL_Dollar wie bei Calls)
-        values = self.watchlist_tree.item(item, "values")
-        try:
-            pl_dollar_str = values[6]  # PL_Dollar ist an Position 6
-            if pl_dollar_str:
-                pl_dollar = float(pl_dollar_str.rstrip("$"))
-                is_profitable = pl_dollar >= 0
-            else:
-                is_profitable = False
-        except (ValueError, IndexError):
-            is_profitable = False
+        is_profitable = self.is_profitable(item)
         
         # Ändere die Hintergrundfarbe direkt ohne Tags
         if is_profitable:
@@ -340,16 +270,7 @@ class WatchlistTreeView:
             self.watchlist_tree.selection_set(item)
             
             # Bestimme, ob der Watchlist-Eintrag profitabel ist (basierend auf PL_Dollar wie bei Calls)
-            values = self.watchlist_tree.item(item, "values")
-            try:
-                pl_dollar_str = values[6]  # PL_Dollar ist an Position 6
-                if pl_dollar_str:
-                    pl_dollar = float(pl_dollar_str.rstrip("$"))
-                    is_profitable = pl_dollar >= 0
-                else:
-                    is_profitable = False
-            except (ValueError, IndexError):
-                is_profitable = False
+            is_profitable = self.is_profitable(item)
             
             # Ändere die Hintergrundfarbe direkt ohne Tags
             style = ttk.Style()
@@ -367,135 +288,45 @@ class WatchlistTreeView:
             # Zeige das Kontextmenü
             self.context_menu.post(event.x_root, event.y_root)
     
+    def is_profitable(self, item):
+        """True, wenn der Eintrag der Zeile nicht im Verlust ist"""
+        entry = self.row_items.get(item)
+        return entry is not None and entry.pl_dollar >= 0
+    
     def update_tree(self):
         """Aktualisiert den Treeview in der Beobachtungsliste mit den gespeicherten Watchlist-Einträgen."""
-        # Speichere die aktuelle Auswahl, bevor wir die Daten aktualisieren
-        selected_item_values = None
-        if self.watchlist_tree.selection():
-            item_id = self.watchlist_tree.selection()[0]
-            selected_item_values = self.watchlist_tree.item(item_id, "values")
-        
-        self.watchlist_tree.delete(*self.watchlist_tree.get_children())
-        
-        # Stil für aktive/inaktive Auswahl konfigurieren
-        style = ttk.Style()
-        style.configure("profitable.Treeview", 
-                    background="white",
-                    fieldbackground="white",
-                    font=("Arial", 9))
-        style.map('profitable.Treeview', 
-              background=[('selected', '#64c264')])  # Dunkleres Grün
-              
-        style.configure("unprofitable.Treeview", 
-                    background="white",
-                    fieldbackground="white",
-                    font=("Arial", 9))
-        style.map('unprofitable.Treeview', 
-              background=[('selected', '#f48a8a')])  # Dunkleres Rot
-        
-        # Dictionary zum Speichern der IDs nach Symbol und Datum für die Wiederherstellung der Auswahl
-        id_map = {}
-        
-        for watchlist_item in storage.load_watchlist_data():
-            # Versuche, die X-Factor und PL-Dollar Werte zu parsen
-            try:
-                x_factor_str = watchlist_item.get("X_Factor", "1.0X")
-                x_factor_val = float(x_factor_str.rstrip("X"))
-                
-                # WICHTIG: PL_Dollar aus dem gespeicherten Wert nehmen, nicht neu berechnen
-                # Dadurch wird die vorhandene Formatierung beibehalten
-                pl_dollar_str = watchlist_item.get("PL_Dollar", "0.00$")
-                pl_dollar_val = float(pl_dollar_str.rstrip("$"))
-                
-                # PL_Percent aus dem gespeicherten Wert verwenden
-                pl_percent_str = watchlist_item.get("PL_Percent", "0%")
-                
-                # Invest-Wert (fiktiv, für die Anzeige)
-                invest_str = watchlist_item.get("Invest", "10")
-            except (ValueError, TypeError):
-                # Bei Fehlern default-Werte verwenden
-                x_factor_val = 1.0
-                pl_dollar_val = 0.0
-                x_factor_str = "1.0X"
-                pl_percent_str = "0%"
-                pl_dollar_str = "0.00$"
-                invest_str = "10"
-            
-            # Zeilenfarbe basierend auf dem PL_Dollar-Wert (wie bei Calls)
-            row_tag = "row_green" if pl_dollar_val >= 0 else "row_red"
-            
-            # Symbol und Datum für die Identifikation des Watchlist-Eintrags
-            symbol = watchlist_item.get("Symbol", "")
-            datum = watchlist_item.get("Datum", "")
-            
-            # Einfügen der Werte in den Treeview
-            item_id = self.watchlist_tree.insert(
-                "",
-                "end",
-                values=(
-                    datum,
-                    symbol,
-                    watchlist_item.get("MCAP_at_Call", ""),
-                    watchlist_item.get("Aktuelles_MCAP", ""),
-                    x_factor_str,
-                    pl_percent_str,
-                    pl_dollar_str,
-                    invest_str
-                ),
-                tags=(row_tag,)
-            )
+        watchlist = storage.load_watchlist_data()
+        ids = [watchlist_item.id for watchlist_item in watchlist]
+        
+        rows = []
+        for item_id, watchlist_item in zip(ids, watchlist):
+            # Zeilenfarbe basierend auf dem P/L in Dollar (wie bei Calls)
+            row_tag = "row_green" if watchlist_item.pl_dollar >= 0 else "row_red"
             
-            # Speichere die ID für die spätere Wiederherstellung der Auswahl
-            id_map[(datum, symbol)] = item_id
+            # Formatierung erst bei der Anzeige
+            rows.append((item_id, formatters.call_row_values(watchlist_item), (row_tag,)))
+        
+        # Nur geänderte Zeilen anfassen - Auswahl und Scrollposition bleiben erhalten
+        self.row_items = dict(zip(ids, watchlist))
+        self.tree_sync.sync(rows)
+        
+        # Gemerkte Auswahl verwerfen, falls die Zeile nicht mehr existiert
+        if self.current_selected_item not in self.row_items:
+            self.current_selected_item = None
+            self.current_selected_tag = None
         
         # Standardmäßig nach $ P/L sortieren, absteigend
         self.sort_treeview("PL_Dollar", True)
-        
-        # Stelle die Auswahl wieder her, falls zuvor eine Auswahl vorhanden war
-        if selected_item_values:
-            # Versuche, das Element anhand von Datum und Symbol zu finden
-            datum = selected_item_values[0]
-            symbol = selected_item_values[1]
-            if (datum, symbol) in id_map:
-                item_id = id_map[(datum, symbol)]
-                self.watchlist_tree.selection_set(item_id)
-                self.current_selected_item = item_id
-                
-                # Bestimme die Profitabilität basierend auf PL_Dollar (wie bei Calls)
-                try:
-                    pl_dollar_str = selected_item_values[6]  # PL_Dollar ist an Position 6
-                    if pl_dollar_str:
-                        pl_dollar = float(pl_dollar_str.rstrip("$"))
-                        is_profitable = pl_dollar >= 0
-                    else:
-                        is_profitable = False
-                except (ValueError, IndexError):
-                    is_profitable = False
-                
-                self.current_selected_tag = "profitable" if is_profitable else "unprofitable"
-                
-                # Setze den Stil basierend auf der Profitabilität
-                if is_profitable:
-                    style.map('Treeview', background=[('selected', '#64c264')])  # Dunkleres Grün
-                else:
-                    style.map('Treeview', background=[('selected', '#f48a8a')])  # Dunkleres Rot
     
     def on_treeview_double_click(self, event):
         """Reagiert auf Doppelklick in der Treeview"""
         item = self.watchlist_tree.identify_row(event.y)
         if item:
-            # Hole alle Werte der ausgewählten Zeile
-            values = self.watchlist_tree.item(item, "values")
-            
-            # Suche nach dem Link für diesen Watchlist-Eintrag
-            watchlist_items = storage.load_watchlist_data()
-            matching_items = [item for item in watchlist_items if 
-                              item.get("Symbol") == values[1] and  # Symbol stimmt überein
-                              item.get("Datum") == values[0]]     # Datum stimmt überein
+            # Link des Eintrags dieser Zeile
+            entry = self.row_items.get(item)
             
-            if matching_items and len(matching_items) > 0:
-                item = matching_items[0]
-                link = item.get("Link")
+            if entry is not None:
+                link = entry.link
                 
                 if link:
                     # Setze den Link in die Entry-Variable
@@ -514,29 +345,8 @@ class WatchlistTreeView:
             messagebox.showinfo("Hinweis", "Bitte wähle zuerst mindestens einen Eintrag aus, den du löschen möchtest.")
             return
         
-        # Lade vorhandene Watchlist-Einträge
-        watchlist_items = storage.load_watchlist_data()
-        new_watchlist = []
-        
-        # Details für jeden ausgewählten Eintrag sammeln
-        to_delete = []
-        for item in selected_items:
-            values = self.watchlist_tree.item(item, "values")
-            # Speichere Datum, Symbol UND MCAP als eindeutige Identifikation
-            to_delete.append((values[0], values[1], values[2]))  # (Datum, Symbol, MCAP_at_Call)
-            
-        # Nur Einträge behalten, die nicht gelöscht werden sollen
-        for item in watchlist_items:
-            # Prüfe, ob dieser Eintrag gelöscht werden soll
-            current_item_id = (item.get("Datum", ""), item.get("Symbol", ""), item.get("MCAP_at_Call", ""))
-            if current_item_id in to_delete:
-                continue  # Diesen Eintrag nicht behalten
-            
-            # Ansonsten Eintrag behalten
-            new_watchlist.append(item)
-        
-        # Speichern und aktualisieren
-        storage.save_watchlist_data(new_watchlist)
+        # Die Zeilen-IDs sind die IDs der Einträge
+        storage.delete_watchlist_items(selected_items)
         
         # Setze die Auswahl zurück
         self.current_selected_item = None
@@ -557,34 +367,19 @@ class WatchlistTreeView:
             return
             
         item = selected_items[0]
-        values = self.watchlist_tree.item(item, "values")
-        
-        # Lade vorhandene Watchlist-Einträge
-        watchlist_items = storage.load_watchlist_data()
         
         # Finde den entsprechenden Watchlist-Eintrag
-        matching_items = [wi for wi in watchlist_items if 
-                          wi.get("Symbol") == values[1] and  # Symbol stimmt überein
-                          wi.get("Datum") == values[0]]     # Datum stimmt überein
+        watchlist_item = self.row_items.get(item)
         
-        if not matching_items:
+        if watchlist_item is None:
             messagebox.showerror("Fehler", "Der ausgewählte Eintrag konnte nicht gefunden werden.")
             return
-            
-        watchlist_item = matching_items[0]
-        
-        # Erstelle einen neuen Call
-        call_data = {
-            "Datum": watchlist_item.get("Datum"),
-            "Symbol": watchlist_item.get("Symbol"),
-            "MCAP_at_Call": watchlist_item.get("MCAP_at_Call"),
-            "Link": watchlist_item.get("Link"),
-            "Aktuelles_MCAP": watchlist_item.get("Aktuelles_MCAP"),  # Aktuelles MCAP übernehmen
-            "Invest": "10",  # Fester Investitionswert: 10$
-            "X_Factor": watchlist_item.get("X_Factor", "1.0X"),
-            "PL_Percent": watchlist_item.get("PL_Percent", "0%"),  # Werte aus Watchlist übernehmen
-            "PL_Dollar": watchlist_item.get("PL_Dollar", "0.00$")  # Werte aus Watchlist übernehmen
-        }
+        
+        # Erstelle einen neuen Call (Datum, MCAP und aktuelles MCAP aus der Watchlist übernehmen)
+        call_data = watchlist_item.copy()
+        call_data.id = new_id()   # Eigene ID für den Call
+        call_data.invest = 10.0  # Fester Investitionswert: 10$
+        call_data.closed = False
         
         # Speichere den neuen Call
         storage.save_new_call(call_data)
@@ -597,4 +392,4 @@ class WatchlistTreeView:
         self.delete_selected_watchlist_item()
         
         # Zeige Erfolgsmeldung
-        messagebox.showinfo("Erfolg", f"Call für {call_data['Symbol']} wurde erstellt.")
\ No newline at end of file
+        messagebox.showinfo("Erfolg", f"Call für {call_data.symbol} wurde erstellt.")
\ No newline at end of file
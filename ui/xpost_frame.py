@@ -13,7 +13,8 @@ class XPostFrame:
         self.original_button_bg = None  # Für die X-Button
         self.original_screenshot_bg = None  # Für Screenshot-Button
         self.original_call_bg = None  # Für Call-Button
-        self.link_check_id = None  # ID für after-Aufrufe
+        self.link_saved = None  # Ob der aktuelle Link in einem aktiven Call steht (None = noch nicht geprüft)
+        self.calls_check_id = None  # Geplante Prüfung nach geänderten Calls (after_idle)
         self.create_frame()
         
     def create_frame(self):
@@ -117,8 +118,11 @@ class XPostFrame:
         styles.apply_typography(self.call_recall_button, 'button_label')
         self.call_recall_button.grid(row=1, column=0, columnspan=2, sticky="ew")
         
-        # Starte die Überwachung auf Linkänderungen
-        self.check_link_change()
+        # Auf Linkänderungen und geänderte Calls reagieren statt zyklisch abzufragen
+        import data.storage as storage
+        self.shared_vars['entry_var'].trace_add("write", lambda *args: self.check_link_change())
+        storage.events.subscribe("calls", self.on_calls_changed)
+        self.frame.bind("<Destroy>", lambda event: storage.events.unsubscribe("calls", self.on_calls_changed))
 
     def recall_call(self):
         """
@@ -150,9 +154,6 @@ class XPostFrame:
             
             # Speichere den aktuellen Link, um später zu prüfen ob er sich geändert hat
             self.current_link = self.shared_vars['entry_var'].get()
-            
-            # Beginne die Überwachung auf Linkänderungen
-            self.check_link_change()
 
     def create_call(self):
         """
@@ -174,7 +175,8 @@ class XPostFrame:
                 return
             
             # Erstelle neuen Call
-            new_call = storage.create_new_call(symbol, mcap, liquidity, link)
+            market_cap = storage.current_market_cap(self.shared_vars.get('current_data'), mcap)
+            new_call = storage.create_new_call(symbol, market_cap, liquidity, link)
             
             # Speichere den neuen Call
             storage.save_new_call(new_call)
@@ -257,47 +259,51 @@ class XPostFrame:
             self.screenshot_button.config(state="normal")
 
     def check_link_change(self):
-        """Überprüft, ob sich der Link geändert hat und setzt ggf. die Button-Farben zurück"""
-        # Breche alle vorherigen Überprüfungen ab
-        if self.link_check_id:
-            self.parent.after_cancel(self.link_check_id)
-            self.link_check_id = None
-            
+        """Setzt bei geändertem Link die Button-Farben passend zum neuen Link (Trace auf entry_var)"""
         current_link = self.shared_vars['entry_var'].get()
         
         # Wenn sich der Link geändert hat
-        if current_link != self.current_link and hasattr(self, 'current_link') and self.current_link:
-            # Prüfe, ob der aktuelle Link bereits in gespeicherten Calls existiert
-            import data.storage as storage
-            calls = storage.load_call_data()
-            
-            # Prüfe, ob der Link in einem der aktiven Calls vorhanden ist
-            link_already_saved = any(
-                not call.get("abgeschlossen", False) and call.get("Link") == current_link 
-                for call in calls
-            )
-            
-            if link_already_saved:
-                # Wenn der Link bereits gespeichert ist, setze alle Buttons auf grün
-                self.btn_xpost.config(bg="#64c264")
-                self.screenshot_button.config(bg="#64c264")
-                self.call_button.config(bg="#64c264")
-            else:
-                # Wenn der Link nicht gespeichert ist, setze alle Buttons auf Standard zurück
-                if hasattr(self, 'original_button_bg') and self.original_button_bg:
-                    self.btn_xpost.config(bg=self.original_button_bg)
-                
-                if hasattr(self, 'original_screenshot_bg') and self.original_screenshot_bg:
-                    self.screenshot_button.config(bg=self.original_screenshot_bg)
-                
-                if hasattr(self, 'original_call_bg') and self.original_call_bg:
-                    self.call_button.config(bg=self.original_call_bg)
+        if current_link != self.current_link and self.current_link:
+            self.apply_link_saved(self.is_link_saved(current_link))
             
             # Aktualisiere den aktuellen Link
             self.current_link = current_link
-        
-        # Plane nächste Überprüfung (alle 500ms)
-        self.link_check_id = self.parent.after(500, self.check_link_change)
+
+    def on_calls_changed(self):
+        """Event-Handler für geänderte Calls; mehrere Änderungen werden zu einer Prüfung zusammengefasst"""
+        if self.calls_check_id is None:
+            self.calls_check_id = self.frame.after_idle(self.check_saved_link)
+
+    def check_saved_link(self):
+        """Passt die Button-Farben an, wenn der aktuelle Link neu gespeichert oder entfernt wurde"""
+        self.calls_check_id = None
+        saved = self.is_link_saved(self.shared_vars['entry_var'].get())
+        if saved != self.link_saved:
+            self.apply_link_saved(saved)
+
+    def is_link_saved(self, link):
+        """True, wenn der Link in einem der aktiven Calls vorhanden ist (Link-Index)"""
+        import data.storage as storage
+        return any(not call.closed for call in storage.find_calls(link=link))
+
+    def apply_link_saved(self, link_saved):
+        """Färbt die Buttons grün, wenn der Link gespeichert ist, sonst in ihre Standardfarbe"""
+        if link_saved:
+            # Wenn der Link bereits gespeichert ist, setze alle Buttons auf grün
+            self.btn_xpost.config(bg="#64c264")
+            self.screenshot_button.config(bg="#64c264")
+            self.call_button.config(bg="#64c264")
+        else:
+            # Wenn der Link nicht gespeichert ist, setze alle Buttons auf Standard zurück
+            if hasattr(self, 'original_button_bg') and self.original_button_bg:
+                self.btn_xpost.config(bg=self.original_button_bg)
+            
+            if hasattr(self, 'original_screenshot_bg') and self.original_screenshot_bg:
+                self.screenshot_button.config(bg=self.original_screenshot_bg)
+            
+            if hasattr(self, 'original_call_bg') and self.original_call_bg:
+                self.call_button.config(bg=self.original_call_bg)
+        self.link_saved = link_saved
 
 
     def update_xpost_container(self):
@@ -308,14 +314,7 @@ class XPostFrame:
         new_link = self.shared_vars['entry_var'].get()
         
         # Prüfe, ob der aktuelle Link bereits in gespeicherten Calls existiert
-        import data.storage as storage
-        calls = storage.load_call_data()
-        
-        # Prüfe, ob der Link in einem der aktiven Calls vorhanden ist
-        link_already_saved = any(
-            not call.get("abgeschlossen", False) and call.get("Link") == new_link 
-            for call in calls
-        )
+        link_already_saved = self.is_link_saved(new_link)
         
         # WICHTIG: Speichere die Button-Farben, falls noch nicht geschehen
         if not hasattr(self, 'original_button_bg') or not self.original_button_bg:
@@ -328,16 +327,7 @@ class XPostFrame:
             self.original_call_bg = self.call_button.cget("bg")
         
         # Setze die Farben der Buttons basierend darauf, ob der Link bereits gespeichert ist
-        if link_already_saved:
-            # Wenn der Link bereits gespeichert ist, setze alle Buttons auf grün
-            self.btn_xpost.config(bg="#64c264")
-            self.screenshot_button.config(bg="#64c264")
-            self.call_button.config(bg="#64c264")
-        else:
-            # Wenn der Link nicht gespeichert ist, setze alle Buttons auf Standard zurück
-            self.btn_xpost.config(bg=self.original_button_bg)
-            self.screenshot_button.config(bg=self.original_screenshot_bg)
-            self.call_button.config(bg=self.original_call_bg)
+        self.apply_link_saved(link_already_saved)
         
         # Aktualisiere den aktuellen Link
         self.current_link = new_link
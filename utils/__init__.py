@@ -2,4 +2,5 @@
 from . import formatters
 from . import clipboard
 from . import browser
-from . import screenshot
\ No newline at end of file
+from . import screenshot
+from . import events
\ No newline at end of file
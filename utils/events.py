@@ -0,0 +1,38 @@
+# Einfacher Event-Bus für Änderungsbenachrichtigungen
+import threading
+from typing import Any, Callable, Dict, List
+
+class EventBus:
+    """
+    Verteilt Ereignisse an alle Abonnenten eines Themas (z.B. "calls").
+
+    Callbacks werden synchron im Thread des Aufrufers von publish() ausgeführt.
+    Fehler in einem Callback werden ausgegeben und unterbrechen die übrigen nicht.
+    """
+
+    def __init__(self):
+        self._subscribers: Dict[str, List[Callable[..., Any]]] = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, topic: str, callback: Callable[..., Any]) -> Callable[..., Any]:
+        """Registriert einen Callback für ein Thema und gibt ihn zurück."""
+        with self._lock:
+            self._subscribers.setdefault(topic, []).append(callback)
+        return callback
+
+    def unsubscribe(self, topic: str, callback: Callable[..., Any]) -> None:
+        """Entfernt einen zuvor registrierten Callback."""
+        with self._lock:
+            callbacks = self._subscribers.get(topic, [])
+            if callback in callbacks:
+                callbacks.remove(callback)
+
+    def publish(self, topic: str, *args, **kwargs) -> None:
+        """Ruft alle Callbacks des Themas mit den übergebenen Argumenten auf."""
+        with self._lock:
+            callbacks = list(self._subscribers.get(topic, []))
+        for callback in callbacks:
+            try:
+                callback(*args, **kwargs)
+            except Exception as e:
+                print(f"Fehler im Event-Handler für '{topic}': {e}")
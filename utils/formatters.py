@@ -71,4 +71,41 @@ def format_url(url: str) -> str:
     if url.startswith("www."):
         url = url[4:]
         
-    return url
\ No newline at end of file
+    return url
+
+def format_x_factor(value: float) -> str:
+    """X-Faktor für die Anzeige, z.B. 2.5X."""
+    return f"{value:.1f}X"
+
+def format_pl_percent(value: float) -> str:
+    """Gewinn/Verlust in Prozent für die Anzeige, z.B. -62%."""
+    return f"{value:.0f}%"
+
+def format_dollar(value: float) -> str:
+    """Dollarbetrag für die Anzeige, z.B. -6.19$."""
+    return f"{value:.2f}$"
+
+def format_age(seconds: float) -> str:
+    """Alter von Daten für die Anzeige, z.B. 'vor 12 s', 'vor 3 min', 'vor 2 h'."""
+    seconds = max(0, int(seconds))
+    if seconds < 60:
+        return f"vor {seconds} s"
+    if seconds < 3600:
+        return f"vor {seconds // 60} min"
+    return f"vor {seconds // 3600} h"
+
+def call_row_values(call) -> tuple:
+    """
+    Formatiert einen Call (data.models.Call) für die Zeile einer Call-/Watchlist-Tabelle.
+    Reihenfolge: Datum, Symbol, MCAP at Call, Live MCAP, X-Factor, % P/L, $ P/L, Invest
+    """
+    return (
+        call.datum,
+        call.symbol,
+        format_k(call.mcap_at_call),
+        format_k(call.current_mcap),
+        format_x_factor(call.x_factor),
+        format_pl_percent(call.pl_percent),
+        format_dollar(call.pl_dollar),
+        f"{call.invest:g}"
+    )
\ No newline at end of file